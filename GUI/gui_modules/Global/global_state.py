@@ -13,6 +13,7 @@ from typing import Optional, Tuple, List
 from PyQt5.QtCore import pyqtSignal, QObject
 import GUI.gui_modules.Global.global_parameters as gp  # Access global variables via module name
 from api.design import Design
+from base import journal, snapshot
 
 class GlobalState(QObject):
     """Global state management class (singleton pattern), encapsulating all global data operations"""
@@ -30,6 +31,9 @@ class GlobalState(QObject):
     history_stack = []
     redo_stack = []
 
+    # Edit journals of the designs saved as binary snapshots
+    journals = {}
+
     def __init__(self):
         super().__init__()
 
@@ -91,6 +95,8 @@ class GlobalState(QObject):
 
         data = gp.global_designs.pop(old_name)
         gp.global_designs[new_name] = data
+        if old_name in self.journals:
+            self.journals[new_name] = self.journals.pop(old_name)
 
         if gp.current_design_name == old_name:
             gp.current_design_name = new_name
@@ -103,6 +109,7 @@ class GlobalState(QObject):
             raise KeyError(f"Design '{name}' does not exist")
 
         del gp.global_designs[name]
+        self.journals.pop(name, None)
         self.history_stack.append(('delete', name))
         self.design_removed.emit(name)
 
@@ -117,6 +124,10 @@ class GlobalState(QObject):
 
         old_path = gp.global_designs[design_name][1]
         gp.global_designs[design_name] = (updated_design, old_path)
+
+        # Persist the edit to the design journal (if the design is saved as a binary snapshot)
+        if design_name in self.journals:
+            self.journals[design_name].record(updated_design.options_tree, label="update")
         self.design_updated.emit(design_name)
 
     def update_design_path(self, design_name: str, new_path: str) -> None:
@@ -139,7 +150,8 @@ class GlobalState(QObject):
 
     def save_design(self, design_name: str, path: Optional[str] = None) -> None:
         """
-        Save design to specified path as a txt file (persist to filesystem)
+        Save design to specified path as a txt file, or as a binary snapshot with an append-only edit journal
+        if the path ends with ".edaq" (persist to filesystem)
         Args:
             design_name: design name
             path: optional path. If None, use current storage path
@@ -153,18 +165,32 @@ class GlobalState(QObject):
         if not final_path:
             raise ValueError("Must provide save path")
 
-        # Ensure the file has a .txt extension
         root, ext = os.path.splitext(final_path)
-        if ext.lower() != '.txt':
-            final_path = root + '.txt'
-
-        # Save design content to txt file
-        try:
-            with open(final_path, 'w') as file:
-                # Assuming design has __str__ method or adjust this to get the content
-                file.write(str(design))
-        except IOError as e:
-            raise IOError(f"Failed to save design to {final_path}: {e}")
+        if ext.lower() == snapshot.EXTENSION:
+            # Append the edits since the last save to the journal of the binary snapshot,
+            # the first save of a design writes the whole snapshot
+            try:
+                design_journal = self.journals.get(design_name)
+                if design_journal is None or design_journal.path != final_path:
+                    design_journal = journal.Journal(final_path)
+                    design_journal.compact(design.options_tree)
+                    self.journals[design_name] = design_journal
+                else:
+                    design_journal.record(design.options_tree, label="save")
+            except IOError as e:
+                raise IOError(f"Failed to save design to {final_path}: {e}")
+        else:
+            # Ensure the file has a .txt extension
+            if ext.lower() != '.txt':
+                final_path = root + '.txt'
+
+            # Save design content to txt file
+            try:
+                with open(final_path, 'w') as file:
+                    # Assuming design has __str__ method or adjust this to get the content
+                    file.write(str(design))
+            except IOError as e:
+                raise IOError(f"Failed to save design to {final_path}: {e}")
 
         # Update storage path if new path provided
         if path is not None:
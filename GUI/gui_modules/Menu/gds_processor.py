@@ -17,18 +17,14 @@ class GDSProcessor:
         import toolbox
         toolbox.generate_python_class_from_gds(path, "")
 
-        # Dynamically load component modules
-        components_module = importlib.import_module(f"library.{components_type}")
         new_component_module_name = toolbox.get_filename(path)
 
-        # Update component module list
-        components_module.module_name_list.append(new_component_module_name)
-
-        # Dynamically add component classes
+        # Dynamically add component classes (updates the component module list and the class registry)
+        import library
         new_component_class_name = toolbox.convert_to_camel_case(new_component_module_name)
         new_component_module = importlib.import_module(new_component_module_name)
         new_component_class = getattr(new_component_module, new_component_class_name)
-        setattr(components_module, new_component_class_name, new_component_class)
+        library.register_component(components_type, new_component_module_name, new_component_class)
 
         print(f"Component has been successfully added to the {components_type} category, "
               f"New component class name: {new_component_class_name}")
@@ -118,7 +118,7 @@ class MenuBarManager(QObject):
             self.parent,
             "Import Design Configuration",
             "",
-            "Configuration Files (*.txt);;All Files (*)"
+            "Configuration Files (*.txt);;Binary Snapshots (*.edaq);;All Files (*)"
         )
 
         if not path:
@@ -180,8 +180,12 @@ class MenuBarManager(QObject):
             design_instance, existing_path = metadata
 
             if existing_path:
-                # Use the design object's own export method
-                design_instance.export_options(existing_path)
+                # Binary snapshots only append the edits since the last save to their journal
+                if existing_path.lower().endswith(".edaq"):
+                    global_state.save_design(current_name, existing_path)
+                else:
+                    # Use the design object's own export method
+                    design_instance.export_options(existing_path)
                 QMessageBox.information(
                     self.parent,
                     "Save Successful",
@@ -220,18 +224,21 @@ class MenuBarManager(QObject):
                 self.parent,
                 "Save Design Configuration",
                 suggested_name,
-                "Configuration Files (*.txt);;All Files (*)"
+                "Configuration Files (*.txt);;Binary Snapshots (*.edaq);;All Files (*)"
             )
 
             if not path:
                 return
 
             # Ensure file extension
-            if not path.lower().endswith(".txt"):
+            if not path.lower().endswith((".txt", ".edaq")):
                 path += ".txt"
 
-            # Call the design object's export method
-            design_instance.export_options(path)
+            # Call the design object's export method (binary snapshots are saved with their edit journal)
+            if path.lower().endswith(".edaq"):
+                global_state.save_design(current_name, path)
+            else:
+                design_instance.export_options(path)
 
             # Update the path in the global state
             global_state.update_design_path(current_name, path)
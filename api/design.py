@@ -92,11 +92,46 @@ class Design(Base):
         super().__setattr__("tag", tag.Tag(options=options.tag))
         return
 
-    def draw_gds(self):
+    def batch_members(self):
+        """
+        Returns the component collections whose injections are deferred by `batch`.
+
+        Input:
+            None
+
+        Output:
+            members: list of CmpntsBase, all component collections of the GDS.
+        """
+        return self.gds.batch_members()
+
+    def rollback_options(self, saved):
+        """
+        Restores the topology, GDS and tag saved at the start of a failed batch.
+        The GDS is restored incrementally, so only the components edited inside the batch are rebuilt.
+
+        Input:
+            saved: OptionsTree, the frozen design parameters to restore.
+
+        Output:
+            None
+        """
+        super().__setattr__("topology", topology.Topology(options=saved.topology.cow()))
+        super().__setattr__("tag", tag.Tag(options=saved.tag.cow()))
+        self.gds.rollback_options(saved.gds)
+        return
+
+    def draw_gds(self, workers: int = None, hierarchical: bool = False, batch_booleans: bool = None,
+                 fidelity: str = None):
         """
         Draw GDS graphics.
+
+        Input:
+            workers: int, the number of worker processes drawing the components (default: see `CmpntsBase.draw_workers`).
+            hierarchical: bool, whether to keep the component cells referenced from the chip cells (see `Gds.draw_gds`).
+            batch_booleans: bool, whether to batch the component booleans by chip tile (see `CmpntsBase.draw_gds`).
+            fidelity: str, the fidelity of the curves, "preview" or "tapeout" (see `Gds.draw_gds`).
         """
-        self.gds.draw_gds()
+        self.gds.draw_gds(workers=workers, hierarchical=hierarchical, batch_booleans=batch_booleans, fidelity=fidelity)
 
     def calc_general_ops(self):
         """
@@ -3,12 +3,13 @@
 #######################################################################################################################
 
 from base.base import Base
+from base.lazy_import import lazy_import
 from addict import Dict
-import equ_circ.equ_circ_old
 import func_modules
 import copy
 import numpy as np
-import qucat
+
+equ_circ = lazy_import("equ_circ")  # qucat, sympy: imported on the first equivalent circuit operation
 
 class EquivalentCircuit(Base):
     def __init__(self, **init_ops):
@@ -5,12 +5,16 @@
 
 from addict import Dict
 from base.gds_base import GdsBase
+from base import draw_pool, ground_plane, options_tree, pin_index
+from base.fidelity import fidelity_mode
 import func_modules.cpls
 import func_modules.qubits
 import func_modules.qubits.primitives
-import components, copy, func_modules, gdspy, routing
+import components, copy, func_modules, gdspy, routing, weakref
 import toolbox
-import simulation as sim
+from base.lazy_import import lazy_import
+
+sim = lazy_import("simulation")  # Imported on the first simulation (win32com, IPython)
 
 class Gds(GdsBase):
     """
@@ -46,7 +50,7 @@ class Gds(GdsBase):
         for cmpnts_name in self.cmpnts_name_list:
             cmpnts_class_name = toolbox.convert_to_camel_case(cmpnts_name)
             cmpnts_class = getattr(components, cmpnts_class_name)
-            super().__setattr__(cmpnts_name, cmpnts_class())
+            setattr(self, cmpnts_name, cmpnts_class())
         # Initialize parameters
         options = func_modules.gds.generate_gds(**init_ops)
         self.inject_options(options)
@@ -65,6 +69,18 @@ class Gds(GdsBase):
         for cmpnts_name in self.cmpnts_name_list:
             getattr(self, cmpnts_name).clear()
 
+    cache_options_tree = True
+
+    def __setattr__(self, name, value):
+        """
+        Sets an attribute. Component collections are linked to this object so that their edits invalidate its options tree.
+        """
+        super().__setattr__(name, value)
+        if name in self.__dict__.get("cmpnts_name_list", ()):
+            value._options_parent = weakref.ref(self)
+            self.invalidate_options()
+        return
+
     def extract_options(self):
         """
         Extract option parameters from components.
@@ -75,63 +91,236 @@ class Gds(GdsBase):
         Output:
             options: Dict, containing option parameters for all components.
         """
-        options = Dict()
-        for cmpnts_name in self.cmpnts_name_list:
-            options[cmpnts_name] = getattr(self, cmpnts_name).options
-        return copy.deepcopy(options)
+        return self.options_tree.cow()  # Copy-on-write view of the cached parameter tree
+
+    def build_options_tree(self):
+        """
+        Collect the (already frozen) parameter trees of all component collections.
 
-    def inject_options(self, options):
+        Input:
+            None
+
+        Output:
+            options: dict, containing option parameters for all components.
+        """
+        return {cmpnts_name: getattr(self, cmpnts_name).options_tree for cmpnts_name in self.cmpnts_name_list}
+
+    def inject_options(self, options, incremental: bool = True):
         """
         Inject option parameters into components.
 
+        Note:
+            In incremental mode, each existing component collection only rebuilds the components whose options changed.
+
         Input:
             options: dict, containing option parameters for each component.
+            incremental: bool, whether to update the existing collections incrementally (default True).
 
         Output:
             None
         """
-        options = copy.deepcopy(options)
-        self.clear()
-        for cmpnts_name, cmpnts_ops in options.items():
-            cmpnts_class_name = toolbox.convert_to_camel_case(cmpnts_name)
-            cmpnts_class = getattr(components, cmpnts_class_name)
-            super().__setattr__(cmpnts_name, cmpnts_class(options=cmpnts_ops))
+        if not incremental:
+            self.clear()
+        for cmpnts_name in self.cmpnts_name_list:
+            if cmpnts_name not in options.keys():
+                getattr(self, cmpnts_name).clear()
+        for cmpnts_name, cmpnts_ops in options_tree.shared_items(options):
+            cmpnts = self.__dict__.get(cmpnts_name)
+            if incremental and cmpnts is not None:
+                cmpnts.inject_options(cmpnts_ops)
+            else:
+                cmpnts_class_name = toolbox.convert_to_camel_case(cmpnts_name)
+                cmpnts_class = getattr(components, cmpnts_class_name)
+                setattr(self, cmpnts_name, cmpnts_class(options=cmpnts_ops))
         return
 
-    def draw_gds(self):
+    def batch_members(self):
         """
-        Generate GDS layout based on component composition.
+        Returns the component collections whose injections are deferred by `batch`.
 
         Input:
             None
 
+        Output:
+            members: list of CmpntsBase, all component collections.
+        """
+        return [getattr(self, cmpnts_name) for cmpnts_name in self.cmpnts_name_list]
+
+    def rollback_options(self, saved):
+        """
+        Discards the deferred injections and restores the components saved at the start of a failed batch.
+
+        Input:
+            saved: OptionsTree, the frozen parameters to restore.
+
+        Output:
+            None
+        """
+        for cmpnts_name in self.cmpnts_name_list:
+            getattr(self, cmpnts_name).discard_pending_options()
+        self.inject_options(saved)
+        return
+
+    def pin_index(self, cmpnts_name):
+        """
+        Returns the pin coordinate index of a component collection.
+
+        Note:
+            The index is kept between calls and synchronized with the collection's options tree,
+            so after an incremental injection only the components that changed are indexed again.
+
+        Input:
+            cmpnts_name: str, the name of the component collection (e.g. "qubits").
+
+        Output:
+            index: PinIndex, mapping pin coordinates to (component name, pin kind, pin index).
+        """
+        indexes = self.__dict__.setdefault("_pin_indexes", {})
+        if cmpnts_name not in indexes:
+            indexes[cmpnts_name] = pin_index.PinIndex()
+        return indexes[cmpnts_name].sync(getattr(self, cmpnts_name).options_tree)
+
+    def find_pins(self, point, pin_kind=None):
+        """
+        Finds the pins of all components located at a coordinate.
+
+        Input:
+            point: tuple/list, the (x, y) coordinate.
+            pin_kind: str or tuple of str, only return pins of these kinds (e.g. "readout_pins", "start_pos").
+
+        Output:
+            hits: list of (cmpnts_name, cmpnt_name, pin_kind, pin_index).
+        """
+        hits = []
+        for cmpnts_name in self.cmpnts_name_list:
+            for cmpnt_name, kind, index in self.pin_index(cmpnts_name).lookup(point, pin_kind):
+                hits.append((cmpnts_name, cmpnt_name, kind, index))
+        return hits
+
+    def draw_gds(self, workers: int = None, hierarchical: bool = False, batch_booleans: bool = None,
+                 fidelity: str = None):
+        """
+        Generate GDS layout based on component composition.
+
+        Input:
+            workers: int, the number of worker processes drawing the components (default: see `CmpntsBase.draw_workers`).
+            hierarchical: bool, whether to keep the hierarchy of the layout: the chip cells reference one cell per
+                component shape (on the chip layer) instead of holding flattened copies of all polygons.
+            batch_booleans: bool, whether the collections batch the component booleans by chip tile
+                (default: see `CmpntsBase.batch_booleans`).
+            fidelity: str, the fidelity of the curves for this draw, "preview" (coarse) or "tapeout" (fine)
+                (default: see `fidelity.set_fidelity`).
+
         Output:
             None
         """
+        if fidelity is not None:
+            with fidelity_mode(fidelity):
+                return self.draw_gds(workers=workers, hierarchical=hierarchical, batch_booleans=batch_booleans)
         gdspy.library.use_current_library = False
         self.lib = gdspy.GdsLibrary()
         self.cell_Dict = Dict()
         # Draw GDS for each component
         for cmpnts_name in self.cmpnts_name_list:
             cmpnts = getattr(self, cmpnts_name)
-            cmpnts.draw_gds()
-        # Add each component's cell to the library
+            cmpnts.draw_gds(workers=workers, hierarchical=hierarchical, batch_booleans=batch_booleans)
+        # Add each component's cell to the library without copying.
+        # Ownership: the drawn cells of a collection are never modified after its `draw_gds`, a new draw replaces them
+        # with new cells, so the chip cells can share their polygons. The shared coordinate arrays are made read-only.
         for cmpnts_name in self.cmpnts_name_list:
             cmpnts = getattr(self, cmpnts_name)
-            cmpnts_cell_Dict = copy.deepcopy(cmpnts.cell_Dict)
-            for cell_name, cell in cmpnts_cell_Dict.items():
+            for cell_name, cell in cmpnts.cell_Dict.items():
                 if cell_name not in self.cell_Dict.keys():  # If the cell does not exist, create a new one
                     self.cell_Dict[cell_name] = self.lib.new_cell(cell_name)
+                toolbox.make_read_only(cell)
                 self.cell_Dict[cell_name].add(cell)
-        # Layer by chip name
+        # Layer by chip name (the collections already flatten their cells onto the chip layer;
+        # `flatten` copies the polygons, so it is only needed for cells that are not flat yet)
         for chip_name, cell in self.cell_Dict.items():
+            if hierarchical:
+                self.lib.add(cell)  # Adds the referenced component cells, already on the chip layer
+                continue
             layer_num = toolbox.custom_hash(chip_name)
-            self.cell_Dict[chip_name].flatten(single_layer=layer_num, single_datatype=0)
+            if not toolbox.is_flat_on_layer(cell, layer_num, 0):
+                self.cell_Dict[chip_name].flatten(single_layer=layer_num, single_datatype=0)
         # Create the overall cell
         module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
         self.cell = self.lib.new_cell(module_name)
         for chip_name, chip_cell in self.cell_Dict.items():
-            self.cell.add(chip_cell)
+            self.cell.add(gdspy.CellReference(chip_cell) if hierarchical else chip_cell)
+        if self.ground_plane_ops is not None:
+            self.draw_ground_plane(**self.ground_plane_ops)
+        return
+
+    # Parameters of `draw_ground_plane`, run by `draw_gds` when set (e.g. Dict(cheese_ops=Dict(pitch=40)))
+    ground_plane_ops = None
+
+    def draw_ground_plane(self, tile_size: float = 2000, workers: int = None, cheese_ops=None, datatype: int = 1):
+        """
+        Generate the ground plane of each chip (the chip rectangle minus the etched shapes of the components).
+
+        Note:
+            Requires a drawn layout (see `draw_gds`). Each chip is split into tiles which only subtract the shapes
+            overlapping them (see `base.ground_plane`); the tiles run in the process pool with several workers and are
+            stitched into the chip cell on the chip layer with the given datatype. The ground planes of a previous call
+            are replaced, not stacked.
+
+        Input:
+            tile_size: float, the side of the tiles.
+            workers: int, the number of worker processes (default: see `CmpntsBase.draw_workers`; 0 or less uses all
+                CPU cores).
+            cheese_ops: dict, cheesing (flux-trapping hole) parameters, see `ground_plane.default_cheese_ops`;
+                None for no holes.
+            datatype: int, the datatype of the ground plane.
+
+        Output:
+            ground_planes: dict, chip name -> gdspy.PolygonSet.
+        """
+        if workers is None:
+            workers = self.chips.draw_workers
+        if workers <= 0:
+            workers = draw_pool.default_workers()
+        chip_boxes = {}
+        for cmpnt_name in self.chips.cmpnt_name_list:
+            chip = getattr(self.chips, cmpnt_name)
+            if hasattr(chip, "start_pos") and hasattr(chip, "end_pos"):
+                chip_boxes[chip.name] = (tuple(chip.start_pos), tuple(chip.end_pos))
+            elif chip.name in self.chips.cell_Dict.keys():
+                chip_boxes[chip.name] = tuple(map(tuple, self.chips.cell_Dict[chip.name].get_bounding_box()))
+        previous = set(map(id, self.__dict__.get("_ground_planes", {}).values()))
+        for cell in list(self.cell_Dict.values()) + [self.cell]:
+            cell.polygons = [polygon_set for polygon_set in cell.polygons if id(polygon_set) not in previous]
+        ground_planes = {}
+        for chip_name, chip_box in chip_boxes.items():
+            if chip_name not in self.cell_Dict.keys():
+                continue
+            polygons = []
+            for cmpnts_name in self.cmpnts_name_list:
+                cmpnts = getattr(self, cmpnts_name)
+                if cmpnts is not self.chips and chip_name in cmpnts.cell_Dict.keys():
+                    polygons.extend(cmpnts.cell_Dict[chip_name].get_polygons())
+            polygons = ground_plane.ground_plane(chip_box, polygons, tile_size, workers, cheese_ops)
+            polygon_set = gdspy.PolygonSet(polygons, toolbox.custom_hash(chip_name), datatype)
+            toolbox.make_read_only_polygons(polygon_set)
+            self.cell_Dict[chip_name].add(polygon_set)
+            if not self.cell.references:  # Flat layout, the overall cell holds the elements of the chip cells
+                self.cell.add(polygon_set)
+            ground_planes[chip_name] = polygon_set
+        self.__dict__["_ground_planes"] = ground_planes
+        return ground_planes
+
+    def write_stream(self, stream):
+        """
+        Draw the components collection by collection and write them to a GDS stream (see `GdsBase.stream_gds`).
+
+        Input:
+            stream: GdsStream, the GDS file being written.
+
+        Output:
+            None
+        """
+        for cmpnts_name in self.cmpnts_name_list:
+            getattr(self, cmpnts_name).write_stream(stream)
         return
 
     def calc_general_ops(self):
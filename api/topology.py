@@ -3,15 +3,19 @@
 #########################
 
 
-import networkx as nx
-import matplotlib.pyplot as plt
 from addict import Dict
 from base.base import Base
-import equ_circ, copy
+from base.lazy_import import lazy_import
+import copy
 import func_modules
 import func_modules.topo
 import func_modules.topo.primitives
 
+# Plotting and equivalent circuits are imported on first use
+nx = lazy_import("networkx")
+plt = lazy_import("matplotlib.pyplot")
+equ_circ = lazy_import("equ_circ")
+
 class Topology(Base):
     """
     Defines and operates on the topology of a quantum chip, including nodes, edges, and visualization features.
@@ -3,7 +3,8 @@
 ####################################
 
 from addict import Dict
-import copy, gdspy
+from base import journal, options_tree, snapshot
+import contextlib, copy, gdspy
 import toolbox
 
 class Base():
@@ -57,16 +58,26 @@ class Base():
         toolbox.show_options(list(options.keys()))  # Display the list of parameter names
         return
 
-    def export_options(self, path):
+    def export_options(self, path, binary: bool = None):
         """
         Exports the current object's parameters to a specified path.
 
+        Note:
+            The binary format (see `base.snapshot`) is much faster to write and read than the text format, and its
+            component collections are decoded lazily when loaded.
+
         Input:
             path: str, the path to export the file.
+            binary: bool, whether to write a binary snapshot (default: if the path ends with ".edaq").
 
         Output:
             None (parameters are saved to the specified path).
         """
+        if binary is None:
+            binary = path.lower().endswith(snapshot.EXTENSION)
+        if binary:
+            snapshot.save(self.options_tree, path)  # Frozen snapshot, saved without copying
+            return
         options = self.extract_options()  # Extract all parameters of the current object
         toolbox.export_options(data=options, path=path)  # Call the utility class to save parameters to a file
         return
@@ -76,11 +87,16 @@ class Base():
         Imports parameters from a specified path and injects them into the current object.
 
         Input:
-            path: str, the path to the parameter file.
+            path: str, the path to the parameter file (text or binary snapshot, detected from the content).
+                  The edit journal of a binary snapshot, if any, is replayed over it.
 
         Output:
             options: dict, the imported parameters.
         """
+        if snapshot.is_snapshot(path):
+            options = journal.load(path)
+            self.inject_options(options.cow())
+            return options.cow()
         options = toolbox.import_options(path)  # Import parameters from the path
         self.inject_options(options)  # Inject the imported parameters into the current object
         return copy.deepcopy(options)  # Return the imported parameters (deep copy)
@@ -90,11 +106,153 @@ class Base():
         """
         Property method that returns a snapshot of the current object's parameters.
 
+        Note:
+            The snapshot is a copy-on-write view of `options_tree`, so it can be modified freely without affecting the object,
+            while only the parts that are actually accessed get copied.
+
         Input:
             None
 
         Output:
-            options: dict, the current object's parameters (deep copy).
+            options: OptionsTree (addict Dict), an editable snapshot of the current object's parameters.
         """
-        options = self.extract_options()  # Extract all parameters of the current object
-        return copy.deepcopy(options)  # Return a deep copy of the parameters
\ No newline at end of file
+        return self.options_tree.cow()
+
+    @property
+    def options_tree(self):
+        """
+        Property method that returns the immutable, structurally-shared tree of the current object's parameters.
+
+        Note:
+            Subclasses that set `cache_options_tree = True` keep the tree until `invalidate_options` is called,
+            so repeated reads are O(1).
+
+        Input:
+            None
+
+        Output:
+            tree: OptionsTree, a frozen snapshot of the current object's parameters.
+        """
+        tree = self.__dict__.get("_options_tree")
+        if tree is None:
+            tree = options_tree.freeze(self.build_options_tree())
+            if self.cache_options_tree:
+                self.__dict__["_options_tree"] = tree
+        return tree
+
+    cache_options_tree = False
+
+    def content_hash(self):
+        """
+        Returns a stable hash of the current object's parameters, to check cheaply whether anything changed.
+
+        Note:
+            The hash is computed Merkle-style over `options_tree` (see `options_tree.content_hash`): the hashes of
+            unchanged components are reused, so after editing one component only the hashes along its path
+            (component, collection, GDS, design) are computed again.
+
+        Input:
+            None
+
+        Output:
+            hash: str, a hexadecimal digest.
+        """
+        return options_tree.content_hash(self.options_tree)
+
+    def build_options_tree(self):
+        """
+        Collects the parameters used to build `options_tree`. Subclasses may return already frozen subtrees to share them.
+
+        Input:
+            None
+
+        Output:
+            options: dict, the current object's parameters.
+        """
+        return self.extract_options()
+
+    def invalidate_options(self):
+        """
+        Drops the cached options tree of the current object and of the objects that contain it.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        self.__dict__.pop("_options_tree", None)
+        parent = self.__dict__.get("_options_parent")
+        if parent is not None and parent() is not None:
+            parent().invalidate_options()
+        return
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Context manager grouping several edits into one transaction.
+
+        Note:
+            Inside the block, parameter injections into component collections are only recorded; the components are
+            constructed (and their general parameters calculated) once, when the block exits. Reading parameters inside
+            the block only constructs the components whose parameters are read (see `CmpntsBase.pending_tree`); the
+            component objects themselves (e.g. `design.gds.qubits.q0`) are replaced when the block exits.
+            If an exception is raised, the object is restored to its state before the block.
+
+            Example:
+                with design.batch():
+                    design.gds.qubits.change_option("width", 400)
+                    design.gds.coupling_lines.change_option("gap", 5)
+
+        Input:
+            None
+
+        Output:
+            self: the current object.
+        """
+        saved = self.options_tree  # O(1) snapshot used for rollback
+        members = self.batch_members()
+        for member in members:
+            member.begin_batch()
+        try:
+            yield self
+        except BaseException:
+            for member in members:
+                member.end_batch()
+            self.rollback_options(saved)
+            raise
+        for member in members:
+            member.end_batch()
+        try:
+            for member in members:
+                if not member.in_batch():
+                    member.apply_pending_options()
+        except BaseException:
+            self.rollback_options(saved)
+            raise
+        return
+
+    def batch_members(self):
+        """
+        Returns the component collections whose injections are deferred by `batch`.
+
+        Input:
+            None
+
+        Output:
+            members: list of CmpntsBase, empty by default.
+        """
+        return []
+
+    def rollback_options(self, saved):
+        """
+        Restores the parameters saved at the start of a failed `batch`.
+
+        Input:
+            saved: OptionsTree, the frozen parameters to restore.
+
+        Output:
+            None
+        """
+        self.inject_options(saved.cow())
+        return
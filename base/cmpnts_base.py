@@ -3,11 +3,53 @@
 ############################
 
 from addict import Dict
-import copy, gdspy, library
+import copy, gdspy, library, math, weakref
 from base.gds_base import GdsBase
+from base import draw_pool, fidelity, gds_backend, options_tree, transform
 import toolbox
 
 
+class _PendingComponent():
+    """
+    Loader of a component whose construction is deferred by a batch (see `CmpntsBase.pending_tree`).
+    The component is constructed when its parameters are first read, and reused when the batch is applied.
+    """
+
+    __slots__ = ("cmpnts", "name", "ops", "cmpnt", "deferred")
+
+    def __init__(self, cmpnts, name, ops):
+        self.cmpnts = cmpnts
+        self.name = name
+        self.ops = ops  # Recorded (frozen) parameters
+        self.cmpnt = None  # Component instance, once constructed
+        self.deferred = options_tree.Deferred(self)
+        return
+
+    def __call__(self):
+        if self.cmpnt is None:
+            self.cmpnt = self.cmpnts.create_component(self.name, self.ops)
+        return self.cmpnt.options_tree
+
+    def matches(self, cmpnt_ops):
+        """
+        Checks whether the parameters are the recorded ones, or those of the constructed component.
+        """
+        if self.cmpnts.same_options(self.ops, cmpnt_ops):
+            return True
+        return self.cmpnt is not None and self.cmpnts.same_options(self.cmpnt.options_tree, cmpnt_ops)
+
+
+def _recorded_options(value):
+    """
+    Returns the recorded parameters of a component whose construction is still deferred, otherwise its parameters.
+    """
+    if type(value) is options_tree.Deferred:
+        if isinstance(value.loader, _PendingComponent):
+            return value.loader.ops
+        return value.resolve()
+    return value
+
+
 class CmpntsBase(GdsBase):
     """
     The CmpntsBase class, a base class for components, includes common methods for all components.
@@ -30,9 +72,150 @@ class CmpntsBase(GdsBase):
         Output:
             None
         """
-        for cmpnt_name in self.cmpnt_name_list:
-            delattr(self, cmpnt_name)  # Delete component attributes
+        store = self.columnar_store
+        if store is not None:
+            store.clear()  # Delete stored component parameters
+            self.__dict__["_views"].clear()
+        else:
+            for cmpnt_name in self.cmpnt_name_list:
+                delattr(self, cmpnt_name)  # Delete component attributes
         self.cmpnt_name_list.clear()  # Clear the component name list
+        self.discard_pending_options()  # Drop injections deferred by a batch
+        self.invalidate_options()
+
+    cache_options_tree = True
+
+    def __getattr__(self, name):
+        """
+        Materializes a component of the columnar store on first access (only called for missing attributes).
+        """
+        store = self.__dict__.get("_columnar_store")
+        if store is None or name not in store:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+        views = self.__dict__["_views"]
+        if name not in views:
+            views[name] = self.create_component(name, store.get_row(name))
+            self.__dict__["_view_trees"][name] = views[name].options_tree
+        return views[name]
+
+    @property
+    def columnar_store(self):
+        """
+        Property method that returns the columnar store of the collection, or None when components are stored as objects.
+
+        Input:
+            None
+
+        Output:
+            store: ColumnarStore or None.
+        """
+        return self.__dict__.get("_columnar_store")
+
+    def use_columnar_storage(self, enabled: bool = True):
+        """
+        Switches the collection between one object per component and the columnar (struct-of-arrays) store.
+
+        Note:
+            With the columnar store, components are kept as parameter columns and only materialized as library objects
+            when they are accessed (e.g. `qubits.q0`) or drawn. Materialized components are released again by
+            `release_views` (called automatically after `draw_gds`); edits made to them are written back to the store.
+            This saves memory for collections with many components, at the cost of constructing a component again
+            each time it is materialized.
+
+        Input:
+            enabled: bool, True to use the columnar store, False to go back to component objects.
+
+        Output:
+            None
+        """
+        from components.columnar_store import ColumnarStore
+        self.apply_pending_options()
+        store = self.columnar_store
+        if enabled and store is None:
+            store = ColumnarStore()
+            for cmpnt_name in self.cmpnt_name_list:
+                store.set_row(cmpnt_name, self.__dict__.pop(cmpnt_name).options_tree)
+            self.__dict__["_columnar_store"] = store
+            self.__dict__["_views"] = {}
+            self.__dict__["_view_trees"] = {}
+        elif not enabled and store is not None:
+            for cmpnt_name in self.cmpnt_name_list:
+                super().__setattr__(cmpnt_name, getattr(self, cmpnt_name))
+            for key in ["_columnar_store", "_views", "_view_trees"]:
+                self.__dict__.pop(key)
+        self.invalidate_options()
+        return
+
+    def release_views(self):
+        """
+        Writes back the edits of the materialized components of the columnar store and releases them.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        if self.columnar_store is None:
+            return
+        self.options_tree  # Write back edited components
+        self.__dict__["_views"].clear()
+        self.__dict__["_view_trees"].clear()
+        return
+
+    @property
+    def options_tree(self):
+        """
+        Property method that returns the frozen parameter tree of all components.
+        Inside a batch, the tree of the deferred injections is returned (see `pending_tree`); after the batch, the
+        deferred injections are applied first.
+
+        Input:
+            None
+
+        Output:
+            tree: OptionsTree, a frozen snapshot of the parameters of all components.
+        """
+        if self.in_batch() and "_pending_options" in self.__dict__:
+            tree = self.__dict__.get("_options_tree")
+            if tree is None:
+                tree = self.__dict__["_options_tree"] = self.pending_tree()
+            return tree
+        self.apply_pending_options()
+        return super().options_tree
+
+    def pending_tree(self):
+        """
+        Returns the parameters of the components recorded during a batch, without constructing them.
+
+        Note:
+            Unchanged components share the tree of the live component. The others are placeholders
+            (`options_tree.Deferred`) that construct the component, and so calculate its general parameters, when its
+            parameters are first read; `apply_pending_options` then installs that instance instead of building it
+            again. Reading the parameters of a few components inside a batch only constructs those components.
+
+        Input:
+            None
+
+        Output:
+            tree: OptionsTree, a frozen tree of the recorded parameters.
+        """
+        pending, incremental = self.__dict__["_pending_options"]
+        live = self.build_options_tree() if incremental else {}
+        staged = self.__dict__.setdefault("_staged", {})
+        tree = {}
+        for cmpnt_name, cmpnt_ops in dict.items(pending):
+            live_ops = live.get(cmpnt_name)
+            if type(cmpnt_ops) is options_tree.Deferred:
+                tree[cmpnt_name] = cmpnt_ops  # Recorded from an earlier read, still deferred
+            elif live_ops is not None and self.same_options(live_ops, cmpnt_ops):
+                tree[cmpnt_name] = live_ops
+            else:
+                loader = staged.get(cmpnt_name)
+                if loader is None or not loader.matches(cmpnt_ops):
+                    loader = staged[cmpnt_name] = _PendingComponent(self, cmpnt_name, cmpnt_ops)
+                tree[cmpnt_name] = loader.deferred
+        return options_tree.freeze(tree)
 
     def extract_options(self):
         """
@@ -44,18 +227,45 @@ class CmpntsBase(GdsBase):
         Output:
             options: Dict, a dictionary containing parameters of all components.
         """
-        options = Dict()
-        for cmpnt_name in self.cmpnt_name_list:
-            cmpnt_inst = getattr(self, cmpnt_name)  # Get component instance
-            options[cmpnt_name] = copy.deepcopy(getattr(cmpnt_inst, "options"))  # Deep copy parameters
-        return copy.deepcopy(options)
+        return self.options_tree.cow()  # Copy-on-write view of the cached parameter tree
+
+    def build_options_tree(self):
+        """
+        Collects the (already frozen) parameter trees of all components, so they are shared instead of copied.
+
+        Input:
+            None
 
-    def inject_options(self, options):
+        Output:
+            options: dict, a dictionary containing parameters of all components.
+        """
+        store = self.columnar_store
+        if store is None:
+            return {cmpnt_name: getattr(self, cmpnt_name).options_tree for cmpnt_name in self.cmpnt_name_list}
+        views, view_trees = self.__dict__["_views"], self.__dict__["_view_trees"]
+        options = {}
+        for cmpnt_name in self.cmpnt_name_list:
+            if cmpnt_name in views:
+                tree = views[cmpnt_name].options_tree
+                if view_trees.get(cmpnt_name) is not tree:
+                    store.set_row(cmpnt_name, tree)  # The materialized component was edited
+                    view_trees[cmpnt_name] = tree
+                options[cmpnt_name] = tree
+            else:
+                options[cmpnt_name] = store.get_row(cmpnt_name)
+        return options
+
+    def inject_options(self, options, incremental: bool = True):
         """
         Injects component parameters into component instances.
 
+        Note:
+            In incremental mode, the incoming parameters are compared with the live components and only the components
+            whose parameters changed are constructed again; components missing from `options` are deleted.
+
         Input:
             options: dict, a dictionary containing component parameters.
+            incremental: bool, whether to keep unchanged components (default True). If False, all components are rebuilt.
 
         Output:
             None
@@ -63,73 +273,464 @@ class CmpntsBase(GdsBase):
         Exception:
             ValueError: Throws an exception when the component type is empty or not defined in the library.
         """
-        options = copy.deepcopy(options)
-        self.clear()  # Clear existing components
-        for cmpnt_name, cmpnt_ops in options.items():
-            cmpnt_type = cmpnt_ops.type
+        if self.in_batch():
+            # Inside a batch only the latest parameters are kept; components are built when the batch exits
+            pending = self.__dict__.get("_pending_options")
+            if pending is not None:
+                incremental = incremental and pending[1]
+            self.__dict__["_pending_options"] = (options_tree.freeze(options), incremental)
+            self.invalidate_options()
+            return
+        if not incremental:
+            self.clear()  # Clear existing components
+        if self.columnar_store is not None:
+            self.inject_columnar(options)
+            return
+        old_cmpnts = {cmpnt_name: getattr(self, cmpnt_name) for cmpnt_name in self.cmpnt_name_list}
+        new_name_list = []
+        for cmpnt_name, cmpnt_ops in options_tree.shared_items(options):
+            cmpnt_inst = old_cmpnts.pop(cmpnt_name, None)
+            if cmpnt_inst is None or not self.same_options(cmpnt_inst.options_tree, cmpnt_ops):
+                cmpnt_inst = self.build_component(cmpnt_name, cmpnt_ops)
+                super().__setattr__(cmpnt_name, cmpnt_inst)
+            new_name_list.append(cmpnt_name)
+
+        # Delete components that no longer exist
+        for cmpnt_name in old_cmpnts.keys():
+            if cmpnt_name not in new_name_list:
+                delattr(self, cmpnt_name)
+        self.cmpnt_name_list[:] = new_name_list
+        self.invalidate_options()
+
+    def batch_members(self):
+        """
+        Returns the collections whose injections are deferred by `batch`: the current collection itself.
+
+        Input:
+            None
+
+        Output:
+            members: list, containing the current collection.
+        """
+        return [self]
 
-            ### Error checking ###
-            if cmpnt_type == Dict():
-                raise ValueError(f"{cmpnt_name}'s type is empty!")  # Exception for empty type
+    def begin_batch(self):
+        """
+        Enters a (possibly nested) batch, from now on injections are deferred.
 
-            module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
-            module_name_list = getattr(getattr(library, module_name), "module_name_list")
-            class_name_list = [toolbox.convert_to_camel_case(i) for i in module_name_list]
-            if cmpnt_type not in class_name_list:
-                raise ValueError(f"{cmpnt_type} not in {class_name_list}")  # Exception for undefined type
+        Input:
+            None
 
-            ### Inject component instances ###
-            super().__setattr__(cmpnt_name, getattr(getattr(library, module_name), cmpnt_type)(options=cmpnt_ops))
-            self.cmpnt_name_list.append(cmpnt_name)
+        Output:
+            None
+        """
+        self.__dict__["_batch_depth"] = self.__dict__.get("_batch_depth", 0) + 1
+        return
 
-    def draw_gds(self):
+    def end_batch(self):
         """
-        Draws the GDS layout of the components.
+        Leaves one level of batch. Deferred injections are applied by `apply_pending_options`.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        self.__dict__["_batch_depth"] = self.__dict__.get("_batch_depth", 0) - 1
+        return
+
+    def in_batch(self):
+        """
+        Checks whether injections into this collection are currently deferred.
+
+        Input:
+            None
+
+        Output:
+            in_batch: bool, True inside a batch.
+        """
+        return self.__dict__.get("_batch_depth", 0) > 0
+
+    def apply_pending_options(self):
+        """
+        Constructs the components from the parameters recorded during a batch, in a single injection.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        pending = self.__dict__.pop("_pending_options", None)
+        if pending is None:
+            return
+        depth = self.__dict__.get("_batch_depth", 0)
+        self.__dict__["_batch_depth"] = 0  # Inject for real, even when still inside a batch
+        try:
+            self.inject_options(pending[0], incremental=pending[1])
+        finally:
+            self.__dict__["_batch_depth"] = depth
+            self.__dict__.pop("_staged", None)
+        return
+
+    def discard_pending_options(self):
+        """
+        Drops the injections deferred by a batch, and the components constructed while reading them.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        self.__dict__.pop("_pending_options", None)
+        self.__dict__.pop("_staged", None)
+        self.invalidate_options()
+        return
+
+    def rollback_options(self, saved):
+        """
+        Discards the deferred injections and restores the components saved at the start of a failed batch.
+
+        Input:
+            saved: OptionsTree, the frozen parameters to restore.
+
+        Output:
+            None
+        """
+        self.discard_pending_options()
+        self.inject_options(saved)
+        return
+
+    def inject_columnar(self, options):
+        """
+        Incrementally injects component parameters into the columnar store.
+
+        Note:
+            Changed components are constructed once so that their general parameters are calculated,
+            then only their parameters are stored.
 
         Input:
+            options: dict, a dictionary containing component parameters.
+
+        Output:
             None
+        """
+        store = self.columnar_store
+        self.release_views()
+        new_name_list = []
+        for cmpnt_name, cmpnt_ops in options_tree.shared_items(options):
+            if cmpnt_name not in store or not self.same_options(store.get_row(cmpnt_name), cmpnt_ops):
+                store.set_row(cmpnt_name, self.build_component(cmpnt_name, cmpnt_ops).options_tree)
+            new_name_list.append(cmpnt_name)
+
+        # Delete components that no longer exist
+        new_names = set(new_name_list)
+        for cmpnt_name in store.names():
+            if cmpnt_name not in new_names:
+                store.remove_row(cmpnt_name)
+        self.cmpnt_name_list[:] = new_name_list
+        self.invalidate_options()
+        return
+
+    def same_options(self, tree, cmpnt_ops):
+        """
+        Checks whether a live component already has exactly the given parameters.
+
+        Input:
+            tree: OptionsTree, the frozen parameters of the live component.
+            cmpnt_ops: dict, the incoming component parameters.
+
+        Output:
+            same: bool, True if the component does not need to be rebuilt.
+        """
+        if cmpnt_ops is tree:
+            return True
+        if not isinstance(cmpnt_ops, dict) or len(cmpnt_ops) != len(tree):
+            return False
+        return options_tree.freeze(cmpnt_ops) == tree
+
+    def build_component(self, cmpnt_name, cmpnt_ops):
+        """
+        Returns the component constructed for these parameters when they were read inside a batch, or creates it.
+
+        Input:
+            cmpnt_name: str, the name of the component.
+            cmpnt_ops: dict, the component parameters.
+
+        Output:
+            cmpnt_inst: LibraryBase, the component instance.
+        """
+        loader = self.__dict__.get("_staged", {}).get(cmpnt_name)
+        if loader is not None and loader.cmpnt is not None and loader.matches(cmpnt_ops):
+            return loader.cmpnt
+        return self.create_component(cmpnt_name, cmpnt_ops)
+
+    def create_component(self, cmpnt_name, cmpnt_ops):
+        """
+        Creates a component instance from its parameters.
+
+        Input:
+            cmpnt_name: str, the name of the component.
+            cmpnt_ops: dict, the component parameters.
+
+        Output:
+            cmpnt_inst: LibraryBase, the new component instance.
+
+        Exception:
+            ValueError: Throws an exception when the component type is empty or not defined in the library.
+        """
+        if not isinstance(cmpnt_ops, Dict):
+            cmpnt_ops = Dict(cmpnt_ops)
+        cmpnt_type = cmpnt_ops.type
+
+        ### Error checking ###
+        if cmpnt_type == Dict():
+            raise ValueError(f"{cmpnt_name}'s type is empty!")  # Exception for empty type
+
+        cmpnt_class = library.get_component_class(self.__class__.__name__, cmpnt_type)
+        if cmpnt_class is None:
+            class_name_list = list(library.component_classes(self.__class__.__name__).keys())
+            raise ValueError(f"{cmpnt_type} not in {class_name_list}")  # Exception for undefined type
+
+        ### Create component instance ###
+        cmpnt_inst = cmpnt_class(options=cmpnt_ops)
+        cmpnt_inst._options_parent = weakref.ref(self)  # Component edits invalidate the options tree of this collection
+        return cmpnt_inst
+
+    # Default number of worker processes used by `draw_gds` (1 draws in the current process)
+    draw_workers = 1
+    # Whether `draw_gds` batches the extract/subtract booleans of the components by chip tile, and the tile side
+    batch_booleans = False
+    boolean_tile_size = 10000
+
+    def draw_gds(self, workers: int = None, hierarchical: bool = False, batch_booleans: bool = None):
+        """
+        Draws the GDS layout of the components.
+
+        Note:
+            With several workers, the components to draw are split into chunks drawn by a process pool; the parent
+            only assembles the returned polygons, which are identical to the ones of the serial path.
+
+            In hierarchical mode the chip cells are not flattened: each component shape is stored once as a cell on
+            the layer of its chip and the chip cells reference it (see `draw_hierarchy`).
+
+            With batched booleans, the components computing `extract_minus_subtract` return its operands instead, and
+            the chip assembly computes one boolean per chip tile (see `gds_backend.batched_difference`). The metal is
+            the same, only split into different polygons. Not used in hierarchical mode.
+
+            The curves are drawn with the selected fidelity (see `fidelity.set_fidelity`); the drawings are cached
+            per fidelity and geometry backend, so switching back to a fidelity reuses its drawings, and the drawings
+            of another backend are never reused.
+
+        Input:
+            workers: int, the number of worker processes (default `draw_workers`; 0 or less uses all CPU cores).
+            hierarchical: bool, whether to keep the component cells referenced from the chip cells.
+            batch_booleans: bool, whether to batch the component booleans by chip tile (default `batch_booleans`).
 
         Output:
             None
         """
+        self.apply_pending_options()
+        if workers is None:
+            workers = self.draw_workers
+        if workers <= 0:
+            workers = draw_pool.default_workers()
+        if batch_booleans is None:
+            batch_booleans = self.batch_booleans
+        batch_booleans = batch_booleans and not hierarchical
         gdspy.library.use_current_library = False
         self.lib = gdspy.GdsLibrary()
         self.cell_Dict = Dict()
 
-        # Generate libs for each component
-        for cmpnt_name in self.cmpnt_name_list:
-            cmpnt = getattr(self, cmpnt_name)
-            cmpnt.draw_gds()
-
-        # Traverse components and add component cells by chip
-        for cmpnt_name in self.cmpnt_name_list:
-            cmpnt = getattr(self, cmpnt_name)
-            chip_name = cmpnt.chip
-            if chip_name is None or chip_name == Dict():
-                chip_name = "None"
-            if chip_name not in self.cell_Dict.keys():
-                self.cell_Dict[chip_name] = self.lib.new_cell(chip_name)
-            self.cell_Dict[chip_name].add(cmpnt.cell)
-
-            # Special handling for qubit's jj_chip
-            if hasattr(cmpnt, "jj_cell"):
-                jj_chip_name = cmpnt.jj_chip
-                if jj_chip_name is None or jj_chip_name == Dict():
-                    jj_chip_name = "None"
-                if jj_chip_name not in self.cell_Dict.keys():
-                    self.cell_Dict[jj_chip_name] = self.lib.new_cell(jj_chip_name)
-                self.cell_Dict[jj_chip_name].add(cmpnt.jj_cell)
-
-        # Layer by chip
-        for chip_name, cell in self.cell_Dict.items():
-            layer_num = toolbox.custom_hash(chip_name)
-            self.cell_Dict[chip_name].flatten(single_layer=layer_num, single_datatype=0)
+        # Draw the components whose parameters changed since the previous draw; the flattened shapes of the other
+        # components are reused. Components of the same shape share one drawing.
+        fidelity_caches = self.__dict__.setdefault("_fidelity_caches", {})  # (Tolerance, backend) -> caches
+        if self.__dict__.get("_drawn_batched", False) != batch_booleans:
+            for caches in fidelity_caches.values():
+                caches["_drawn"].clear()  # Drawn with the other boolean mode
+            self.__dict__["_drawn_batched"] = batch_booleans
+        caches = fidelity_caches.setdefault((fidelity.tolerance(), gds_backend.get_backend()), {})
+        for cache_name in ("_drawn", "_cell_cache", "_layered_cells", "_tile_caches"):
+            self.__dict__[cache_name] = caches.setdefault(cache_name, {})
+        drawn = self.__dict__["_drawn"]  # Component name -> (options tree, shape key, pieces, deferred)
+        cell_cache = self.__dict__["_cell_cache"]
+        cmpnt_trees = options_tree.shared_items(self.options_tree)
+        dirty = []
+        for cmpnt_name, tree in cmpnt_trees:
+            entry = drawn.get(cmpnt_name)
+            if entry is None or not (entry[0] is tree or entry[0] == tree):
+                dirty.append((cmpnt_name, tree))
+        results = [None] * len(dirty)
+        if workers > 1 and len(dirty) > 1:
+            results = draw_pool.draw_components(self.__class__.__name__, [tree for _, tree in dirty], workers,
+                                                defer_booleans=batch_booleans)
+        for (cmpnt_name, tree), result in zip(dirty, results):
+            if result is None:
+                result = getattr(self, cmpnt_name).draw_pieces(cell_cache, defer_booleans=batch_booleans)
+            drawn[cmpnt_name] = (tree,) + result
+        names = set(name for name, _ in cmpnt_trees)
+        for cmpnt_name in list(drawn.keys()):
+            if cmpnt_name not in names:
+                del drawn[cmpnt_name]  # Deleted component
+        shape_keys = set(entry[1] for entry in drawn.values())
+        for key in list(cell_cache.keys()):
+            if key not in shape_keys:
+                del cell_cache[key]  # Shape no longer used
+
+        # Assemble the chip cells from the flattened shapes of the components
+        if hierarchical:
+            self.draw_hierarchy(cmpnt_trees)
+        else:
+            for cmpnt_name, _ in cmpnt_trees:
+                for chip_name, (polygons, paths, labels) in drawn[cmpnt_name][2]:
+                    if chip_name not in self.cell_Dict.keys():
+                        self.cell_Dict[chip_name] = self.lib.new_cell(chip_name)
+                    chip_cell = self.cell_Dict[chip_name]
+                    chip_cell.polygons.extend(polygons)
+                    chip_cell.paths.extend(paths)
+                    chip_cell.labels.extend(labels)
+            if batch_booleans:
+                self.add_batched_booleans([drawn[cmpnt_name][3] for cmpnt_name, _ in cmpnt_trees])
 
         # Create the overall cell
         module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
         self.cell = self.lib.new_cell(module_name)
         for chip_name, chip_cell in self.cell_Dict.items():
-            self.cell.add(chip_cell)
+            self.cell.add(gdspy.CellReference(chip_cell) if hierarchical else chip_cell)
+        self.release_views()  # The component cells have been flattened into the chip cells
+
+    def draw_hierarchy(self, cmpnt_trees):
+        """
+        Assembles chip cells referencing one cell per component shape, instead of flattened copies.
+
+        Note:
+            Components of the same shape (see `LibraryBase.shape_key`) share one master cell per chip layer, placed
+            with a CellReference; the other components get a cell of their own holding their flattened shapes. The
+            layer of the chip is assigned in the referenced cells, so the chip cells only hold references. The master
+            cells are kept for the following draws.
+
+        Input:
+            cmpnt_trees: list of (component name, options tree), the components drawn by `draw_gds`.
+
+        Output:
+            None
+        """
+        drawn = self.__dict__["_drawn"]
+        cell_cache = self.__dict__["_cell_cache"]
+        layered_cells = self.__dict__.setdefault("_layered_cells", {})  # (shape key, chip name) -> master cell
+        module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
+        for cmpnt_name, tree in cmpnt_trees:
+            key, pieces = drawn[cmpnt_name][1:3]
+            for chip_name, (polygons, paths, labels) in pieces:
+                if chip_name not in self.cell_Dict.keys():
+                    self.cell_Dict[chip_name] = self.lib.new_cell(chip_name)
+                if key is not None and len(pieces) == 1:
+                    cmpnt_class = library.get_component_class(self.__class__.__name__, tree.get("type"))
+                    if cmpnt_class is None:
+                        cmpnt_class = type(getattr(self, cmpnt_name))
+                    if (key, chip_name) not in layered_cells:
+                        if key not in cell_cache:  # Drawn by a worker process
+                            cell_cache[key] = cmpnt_class.draw_master(tree, key)
+                        layered_cells[(key, chip_name)] = self.layered_cell(f"{module_name}_{key}_{chip_name}",
+                                                                            cell_cache[key], chip_name)
+                    origin, rotation = cmpnt_class.instance_placement(tree)
+                    reference = gdspy.CellReference(layered_cells[(key, chip_name)], origin=origin, rotation=rotation)
+                else:
+                    cell = gdspy.Cell(f"{module_name}_{cmpnt_name}_{chip_name}", exclude_from_current=True)
+                    cell.polygons.extend(polygons)
+                    cell.paths.extend(paths)
+                    cell.labels.extend(labels)
+                    reference = gdspy.CellReference(cell)
+                self.cell_Dict[chip_name].add(reference)
+        for key_chip in list(layered_cells.keys()):
+            if key_chip[0] not in cell_cache:
+                del layered_cells[key_chip]  # Shape no longer used
+        for chip_cell in self.cell_Dict.values():
+            self.lib.add(chip_cell)  # Adds the referenced cells
+        return
+
+    def write_stream(self, stream):
+        """
+        Draws the components one at a time and writes their shapes to a GDS stream.
+
+        Note:
+            Each component is drawn by a detached copy built from its parameters, which is dropped once its shapes are
+            written, so no drawing is kept by the collection. Components of the same shape share one drawing.
+
+        Input:
+            stream: GdsStream, the GDS file being written.
+
+        Output:
+            None
+        """
+        self.apply_pending_options()
+        cell_cache = {}
+        module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
+        for cmpnt_name, tree in options_tree.shared_items(self.options_tree):
+            cmpnt_class = library.get_component_class(self.__class__.__name__, tree.get("type"))
+            cmpnt = cmpnt_class(options=tree.cow()) if cmpnt_class is not None else getattr(self, cmpnt_name)
+            key, pieces, _ = cmpnt.draw_pieces(cell_cache)
+            if stream.hierarchical and key is not None and len(pieces) == 1:
+                chip_name = pieces[0][0]
+                master_name = f"{module_name}_{key}_{chip_name}"
+                if not stream.has_cell(master_name):
+                    stream.write_cell(self.layered_cell(master_name, cell_cache[key], chip_name))
+                origin, rotation = cmpnt.instance_placement(tree)
+                stream.add_reference(chip_name, master_name, origin, rotation)
+                continue
+            for chip_name, shapes in pieces:
+                stream.add_shapes(chip_name, shapes, f"{module_name}_{cmpnt_name}_{chip_name}")
+        return
+
+    def add_batched_booleans(self, deferred):
+        """
+        Computes the deferred booleans of the components by chip tile and adds the results to the chip cells.
+
+        Input:
+            deferred: list of (chip name, extract polygons, subtract polygons) or None, the deferred booleans.
+
+        Output:
+            None
+        """
+        pairs_by_chip = {}
+        for entry in deferred:
+            if entry is not None:
+                pairs_by_chip.setdefault(entry[0], []).append(entry[1:])
+        tile_caches = self.__dict__.setdefault("_tile_caches", {})  # Chip name -> results of the previous draw by tile
+        for chip_name in list(tile_caches.keys()):
+            if chip_name not in pairs_by_chip:
+                del tile_caches[chip_name]
+        for chip_name, pairs in pairs_by_chip.items():
+            if chip_name not in self.cell_Dict.keys():
+                self.cell_Dict[chip_name] = self.lib.new_cell(chip_name)
+            polygon_sets = gds_backend.batched_difference(pairs, self.boolean_tile_size, toolbox.custom_hash(chip_name),
+                                                          0, cache=tile_caches.setdefault(chip_name, {}))
+            for polygon_set in polygon_sets:
+                toolbox.make_read_only_polygons(polygon_set)
+            self.cell_Dict[chip_name].polygons.extend(polygon_sets)
+        return
+
+    @staticmethod
+    def layered_cell(name, cell, chip_name):
+        """
+        Returns a copy of a cell with its shapes flattened onto the layer of a chip.
+
+        Input:
+            name: str, the name of the new cell.
+            cell: gdspy.Cell, the cell to copy.
+            chip_name: str, the chip name.
+
+        Output:
+            layered_cell: gdspy.Cell.
+        """
+        layered_cell = gdspy.Cell(name, exclude_from_current=True)
+        polygons, paths, labels = toolbox.flatten_shapes(cell, toolbox.custom_hash(chip_name), 0)
+        layered_cell.polygons.extend(polygons)
+        layered_cell.paths.extend(paths)
+        layered_cell.labels.extend(labels)
+        return layered_cell
 
     def calc_general_ops(self):
         """
@@ -141,6 +742,7 @@ class CmpntsBase(GdsBase):
         Output:
             None
         """
+        self.apply_pending_options()
         for cmpnt_name in self.cmpnt_name_list:
             getattr(self, cmpnt_name).calc_general_ops()
 
@@ -156,13 +758,66 @@ class CmpntsBase(GdsBase):
         Output:
             None
         """
+        self.transform_components(pos_name, transform.matrix(offset=(dx, dy)))
+
+    def rotate(self, pos_name, angle: float, center=(0, 0)):
+        """
+        Rotates components around a center: their positions turn around it, and each component turns by the same angle.
+
+        Input:
+            pos_name: str, the name of the position parameter to rotate.
+            angle: float, the rotation angle in degrees (counterclockwise).
+            center: tuple, the center of the rotation.
+
+        Output:
+            None
+
+        Exception:
+            ValueError: Throws an exception when a component cannot turn around its position parameter.
+        """
+        self.apply_pending_options()
         for cmpnt_name in self.cmpnt_name_list:
-            cmpnt_ops = copy.deepcopy(getattr(self, cmpnt_name).options)
-            pos = copy.deepcopy(cmpnt_ops[pos_name])
-            pos = list(pos)
-            pos = (pos[0] + dx, pos[1] + dy)
-            cmpnt_ops[pos_name] = copy.deepcopy(pos)
-            getattr(self, cmpnt_name).inject_options(cmpnt_ops)
+            cmpnt = getattr(self, cmpnt_name)
+            if cmpnt.instance_position != pos_name or cmpnt.instance_rotation is None:
+                raise ValueError("{} ({}) cannot rotate around {}".format(cmpnt_name, cmpnt.__class__.__name__, pos_name))
+        self.transform_components(pos_name, transform.matrix(math.radians(angle), center), angle)
+
+    def transform_components(self, pos_name, affine, angle: float = 0):
+        """
+        Applies an affine transform to the positions of all components at once.
+
+        Note:
+            Components whose geometry follows `pos_name` (see `LibraryBase.instance_position`) and whose pins and
+            outline are already calculated keep them, transformed in bulk with the positions, instead of recalculating
+            them.
+
+        Input:
+            pos_name: str, the name of the position parameter to transform.
+            affine: array (3, 3), the transform, see `transform.matrix`.
+            angle: float, the rotation of the transform in degrees, added to the rotation parameter of each component.
+
+        Output:
+            None
+        """
+        self.apply_pending_options()
+        cmpnts = [getattr(self, cmpnt_name) for cmpnt_name in self.cmpnt_name_list]
+        if not cmpnts:
+            return
+        positions = transform.apply(affine, [tuple(cmpnt.options[pos_name]) for cmpnt in cmpnts]).tolist()
+        carried = [cmpnt for cmpnt in cmpnts if cmpnt.instance_position == pos_name and cmpnt.has_derived()]
+        derived = transform.transform_nested([[getattr(cmpnt, name) for name in cmpnt.derived_options]
+                                              for cmpnt in carried], affine)
+        derived = {id(cmpnt): dict(zip(cmpnt.derived_options, values)) for cmpnt, values in zip(carried, derived)}
+        for cmpnt, pos in zip(cmpnts, positions):
+            cmpnt_ops = copy.deepcopy(cmpnt.options)
+            cmpnt_ops[pos_name] = tuple(pos)
+            if angle:
+                rotation_name, scale = cmpnt.instance_rotation
+                cmpnt_ops[rotation_name] = cmpnt_ops[rotation_name] + angle / scale
+            cmpnt.inject_options(cmpnt_ops)
+            if id(cmpnt) in derived:
+                cmpnt.set_derived(derived[id(cmpnt)])
+        return
 
     def change_option(self, op_name, op_value):
         """
@@ -175,11 +830,14 @@ class CmpntsBase(GdsBase):
         Output:
             None
         """
+        if self.in_batch():
+            self.change_options({op_name: op_value})
+            return
+        self.apply_pending_options()
         for cmpnt_name in self.cmpnt_name_list:
             cmpnt_ops = copy.deepcopy(getattr(self, cmpnt_name).options)
             cmpnt_ops[op_name] = copy.deepcopy(op_value)
-            getattr(self, cmpnt_name).inject_options(cmpnt_ops)
-            self.calc_general_ops()  # Recalculate common parameters
+            getattr(self, cmpnt_name).inject_options(cmpnt_ops)  # Common parameters are recalculated by the injection
 
     def change_options(self, new_options):
         """
@@ -192,12 +850,22 @@ class CmpntsBase(GdsBase):
             None
         """
         new_options = copy.deepcopy(new_options)
+        if self.in_batch():
+            # Recorded with the other deferred injections, the components are not constructed
+            ops = {}
+            for cmpnt_name, cmpnt_ops in dict.items(self.options_tree):
+                cmpnt_ops = options_tree.thaw(_recorded_options(cmpnt_ops))
+                for op_name, op_value in new_options.items():
+                    cmpnt_ops[op_name] = copy.deepcopy(op_value)
+                ops[cmpnt_name] = cmpnt_ops
+            self.inject_options(ops)
+            return
+        self.apply_pending_options()
         for cmpnt_name in self.cmpnt_name_list:
             cmpnt_ops = copy.deepcopy(getattr(self, cmpnt_name).options)
             for op_name, op_value in new_options.items():
                 cmpnt_ops[op_name] = copy.deepcopy(op_value)
-            getattr(self, cmpnt_name).inject_options(cmpnt_ops)
-            self.calc_general_ops()  # Recalculate common parameters
+            getattr(self, cmpnt_name).inject_options(cmpnt_ops)  # Common parameters are recalculated by the injection
 
     def add(self, options):
         """
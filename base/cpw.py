@@ -0,0 +1,333 @@
+##############################################################
+# Coplanar waveguide geometry computed from one centerline
+##############################################################
+
+import math
+import gdspy
+import numpy as np
+from base import fidelity
+
+# Turn names of gdspy.Path.turn -> angle
+_TURNS = {"l": 0.5 * math.pi, "r": -0.5 * math.pi, "ll": math.pi, "rr": -math.pi}
+
+
+class Centerline():
+    """
+    Centerline of a CPW made of straight segments and circular arcs, built like a gdspy.Path (`segment`, `turn`).
+
+    The pieces are kept analytically, so the conductor and gap outlines are derived from the same centerline by
+    offsetting it along its normals; the arcs are sampled with NumPy, with the number of vertices `gdspy.Path.turn`
+    uses for the same width and tolerance.
+    """
+
+    def __init__(self, start, heading: float = 0):
+        """
+        Starts a centerline.
+
+        Input:
+            start: tuple, the starting point.
+            heading: float, the initial direction in radians (0 is +x).
+
+        Output:
+            None
+        """
+        self.position = np.array(start, dtype=float)
+        self.heading = heading
+        self.pieces = []  # ("segment", start, end, heading) or ("arc", center, radius, initial angle, final angle)
+        self.corners = None  # (points, bend radius) of a path drawn with gdspy.FlexPath instead, see `polyline`
+        return
+
+    def segment(self, length: float):
+        """
+        Adds a straight segment in the current direction.
+
+        Input:
+            length: float, the length of the segment.
+
+        Output:
+            self
+        """
+        end = self.position + length * np.array((math.cos(self.heading), math.sin(self.heading)))
+        self.pieces.append(("segment", self.position, end, self.heading))
+        self.position = end
+        return self
+
+    def turn(self, radius: float, angle):
+        """
+        Adds a circular arc tangent to the current direction.
+
+        Input:
+            radius: float, the radius of the arc.
+            angle: float or str, the turning angle in radians (positive turns left) or "l", "r", "ll", "rr".
+
+        Output:
+            self
+        """
+        angle = _TURNS.get(angle, angle)
+        side = math.copysign(1, angle)
+        initial_angle = self.heading - side * 0.5 * math.pi  # Direction from the center to the current position
+        center = self.position - radius * np.array((math.cos(initial_angle), math.sin(initial_angle)))
+        final_angle = initial_angle + angle
+        self.pieces.append(("arc", center, radius, initial_angle, final_angle))
+        self.position = center + radius * np.array((math.cos(final_angle), math.sin(final_angle)))
+        self.heading += angle
+        return self
+
+    def rotate(self, angle: float, center=(0, 0)):
+        """
+        Rotates the centerline.
+
+        Input:
+            angle: float, the rotation angle in radians.
+            center: tuple, the rotation center.
+
+        Output:
+            self
+        """
+        center = np.array(center, dtype=float)
+        cos, sin = math.cos(angle), math.sin(angle)
+        matrix = np.array(((cos, -sin), (sin, cos)))
+        rotate_point = lambda point: center + matrix @ (point - center)
+        pieces = []
+        for piece in self.pieces:
+            if piece[0] == "segment":
+                pieces.append(("segment", rotate_point(piece[1]), rotate_point(piece[2]), piece[3] + angle))
+            else:
+                pieces.append(("arc", rotate_point(piece[1]), piece[2], piece[3] + angle, piece[4] + angle))
+        self.pieces = pieces
+        if self.corners is not None:
+            self.corners = ([rotate_point(np.asarray(point)) for point in self.corners[0]], self.corners[1])
+        self.position = rotate_point(self.position)
+        self.heading += angle
+        return self
+
+    def samples(self, width: float = 0, tolerance: float = None):
+        """
+        Samples the centerline with the unit normals pointing to its left.
+
+        Input:
+            width: float, the width of the widest outline drawn from the samples (sets the number of arc vertices).
+            tolerance: float, the maximal distance between an arc and its vertices (default: see `fidelity`).
+
+        Output:
+            points: array (N, 2), the centerline vertices.
+            normals: array (N, 2), the left normals at the vertices.
+        """
+        if tolerance is None:
+            tolerance = fidelity.tolerance()
+        points = []
+        normals = []
+        for piece in self.pieces:
+            if piece[0] == "segment":
+                _, start, end, heading = piece
+                normal = (-math.sin(heading), math.cos(heading))
+                points.append((start, end))
+                normals.append((normal, normal))
+                continue
+            _, center, radius, initial_angle, final_angle = piece
+            outer = radius + 0.5 * width
+            # Same number of vertices as gdspy.Path.turn
+            count = max(3, 1 + int(0.5 * abs(final_angle - initial_angle) / math.acos(1 - tolerance / outer) + 0.5))
+            angles = np.linspace(initial_angle, final_angle, count)
+            radial = np.column_stack((np.cos(angles), np.sin(angles)))
+            points.append(center + radius * radial)
+            # The center is on the left of a left turn
+            normals.append(-math.copysign(1, final_angle - initial_angle) * radial)
+        if not points:
+            return np.zeros((0, 2)), np.zeros((0, 2))
+        points = np.concatenate([np.asarray(p, dtype=float).reshape(-1, 2) for p in points])
+        normals = np.concatenate([np.asarray(n, dtype=float).reshape(-1, 2) for n in normals])
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = np.hypot(*(points[1:] - points[:-1]).T) > 1e-9  # Junctions of the pieces appear twice
+        return points[keep], normals[keep]
+
+    def strip_polygons(self, width: float, tolerance: float = None, max_points: int = 199):
+        """
+        Returns the strip of a given width centered on the centerline (e.g. a conductor).
+
+        Input:
+            width: float, the width of the strip.
+            tolerance: float, the maximal distance between an arc and its vertices (default: see `fidelity`).
+            max_points: int, the maximal number of vertices of the polygons.
+
+        Output:
+            polygons: list of arrays (M, 2), the vertices of the strip, split along the centerline.
+        """
+        if self.corners is not None:
+            return self.flexpath(width, tolerance, max_points).polygons
+        return self.band_polygons(((-0.5 * width, 0.5 * width),), width, tolerance, max_points)
+
+    def gap_polygons(self, width: float, gap: float, tolerance: float = None, max_points: int = 199):
+        """
+        Returns the gaps of a CPW along the centerline: the strip of width `width + 2 * gap` minus the conductor.
+
+        Note:
+            Both gaps are offsets of the same samples of the centerline, so they are computed directly instead of with
+            a boolean between the two strips.
+
+        Input:
+            width: float, the width of the conductor.
+            gap: float, the width of each gap.
+            tolerance: float, the maximal distance between an arc and its vertices (default: see `fidelity`).
+            max_points: int, the maximal number of vertices of the polygons.
+
+        Output:
+            polygons: list of arrays (M, 2), the vertices of the gaps, split along the centerline.
+        """
+        if self.corners is not None:
+            return gdspy.boolean(self.flexpath(width + 2 * gap, tolerance, max_points),
+                                 self.flexpath(width, tolerance, max_points), "not", max_points=max_points).polygons
+        half = 0.5 * width
+        return self.band_polygons(((half, half + gap), (-half - gap, -half)), width + 2 * gap, tolerance, max_points)
+
+    def flexpath(self, width: float, tolerance: float = None, max_points: int = 199):
+        """
+        Draws the path of a centerline built by `polyline` whose bends do not fit in its segments.
+
+        Input:
+            width: float, the width of the path.
+            tolerance: float, the maximal distance between an arc and its vertices (default: see `fidelity`).
+            max_points: int, the maximal number of vertices of the polygons.
+
+        Output:
+            polygon_set: gdspy.PolygonSet.
+        """
+        if tolerance is None:
+            tolerance = fidelity.tolerance()
+        points, bend_radius = self.corners
+        return gdspy.FlexPath(points, width, corners="circular bend", bend_radius=bend_radius, tolerance=tolerance,
+                              max_points=max_points).to_polygonset()
+
+    def band_polygons(self, bands, width: float, tolerance: float = None, max_points: int = 199):
+        """
+        Returns bands parallel to the centerline, between two offsets (positive to the left).
+
+        Input:
+            bands: list of (offset, offset), the offsets bounding each band.
+            width: float, the total width covered by the bands (sets the number of arc vertices).
+            tolerance: float, the maximal distance between an arc and its vertices (default: see `fidelity`).
+            max_points: int, the maximal number of vertices of the polygons.
+
+        Output:
+            polygons: list of arrays (M, 2), the vertices of the bands, split along the centerline into polygons of
+                at most `max_points` vertices.
+        """
+        points, normals = self.samples(width, tolerance)
+        step = max(1, max_points // 2 - 1)  # Centerline intervals per polygon
+        polygons = []
+        for offset0, offset1 in bands:
+            side0 = points + offset0 * normals
+            side1 = points + offset1 * normals
+            for first in range(0, max(1, len(points) - 1), step):
+                last = min(first + step, len(points) - 1) + 1
+                polygons.append(np.concatenate((side1[first:last], side0[first:last][::-1])))
+        return polygons
+
+
+def polyline(points, bend_radius: float = 0):
+    """
+    Builds the centerline of a path through points, with circular bends at its corners.
+
+    Note:
+        The bends are the arcs of `gdspy.FlexPath(..., corners="circular bend")`: tangent to both segments of the
+        corner, each segment shortened by `bend_radius * tan(angle / 2)`. Paths with corners need a positive radius.
+        When a segment is shorter than the bends at its ends (e.g. a short jog or a U-turn), the offsets would fold
+        back on themselves, so the outlines of that path are drawn with gdspy.FlexPath instead (see `flexpath`).
+
+    Input:
+        points: list of tuple, the vertices of the path.
+        bend_radius: float, the radius of the bends.
+
+    Output:
+        centerline: Centerline.
+    """
+    points = np.asarray(points, dtype=float)
+    vectors = points[1:] - points[:-1]
+    lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+    headings = np.arctan2(vectors[:, 1], vectors[:, 0])
+    turns = (np.diff(headings) + math.pi) % (2 * math.pi) - math.pi
+    turns[np.abs(turns) < 1e-12] = 0
+    cuts = np.zeros(len(lengths) + 1)  # Length taken by the bends at the vertices
+    if bend_radius > 0:
+        with np.errstate(over="ignore"):
+            cuts[1:-1] = bend_radius * np.tan(0.5 * np.abs(turns))
+    centerline = Centerline(points[0], headings[0])
+    if not np.all(lengths - cuts[:-1] - cuts[1:] >= -1e-9):
+        centerline.corners = ([tuple(point) for point in points.tolist()], bend_radius)
+        centerline.position = points[-1]
+        centerline.heading = float(headings[-1])
+        return centerline
+    for i, heading in enumerate(headings.tolist()):
+        centerline.heading = heading
+        centerline.segment(lengths[i] - cuts[i] - cuts[i + 1])
+        if i < len(turns) and turns[i] != 0 and bend_radius > 0:
+            centerline.turn(bend_radius, turns[i])
+        elif i < len(turns):
+            centerline.position = points[i + 1]
+    return centerline
+
+
+def taper_gap_polygons(start, end, width0: float, gap0: float, width1: float, gap1: float):
+    """
+    Returns the gaps of a straight CPW taper, whose conductor and gaps change linearly from one end to the other.
+
+    Input:
+        start: tuple, the start of the centerline.
+        end: tuple, the end of the centerline.
+        width0, gap0: float, the conductor and gap widths at the start.
+        width1, gap1: float, the conductor and gap widths at the end.
+
+    Output:
+        polygons: list of arrays (4, 2), the two gaps.
+    """
+    start = np.asarray(start, dtype=float)
+    end = np.asarray(end, dtype=float)
+    vector = end - start
+    normal = np.array((-vector[1], vector[0])) / math.hypot(*vector)
+    return [np.array((start + side * 0.5 * width0 * normal, start + side * (0.5 * width0 + gap0) * normal,
+                      end + side * (0.5 * width1 + gap1) * normal, end + side * 0.5 * width1 * normal))
+            for side in (1, -1)]
+
+
+def meander(start_pos, distance: float, length: float, start_straight: float, start_r: float, r: float,
+            space: float, coupling_length: float):
+    """
+    Builds the centerline of a readout resonator meander along +x, before its rotation.
+
+    Note:
+        The line starts with a straight segment and a U-turn of radius `start_r`, folds back and forth with U-turns
+        of radius `r` until it reaches the distance to cover, then ends with a straight segment perpendicular to the
+        folds and a coupling segment. The folds share the length left by the other pieces.
+
+    Input:
+        start_pos: tuple, the starting point.
+        distance: float, the distance covered by the meander (perpendicular to the folds).
+        length: float, the total length of the line.
+        start_straight: float, the length of the starting segment.
+        start_r: float, the radius of the first U-turn.
+        r: float, the radius of the other turns.
+        space: float, the spacing left before the coupling segment.
+        coupling_length: float, the length of the coupling segment.
+
+    Output:
+        centerline: Centerline.
+    """
+    num = round((distance - start_r * 2 - space) // (r * 2))
+    if num <= 0:
+        raise ValueError("Parameter error: The distance between the qubit and the transmission line is too short.")
+    last_straight = distance - num * r * 2 - start_r * 2 - space
+    segment = round((length - start_straight - start_r * math.pi - num * math.pi * r) / (num + 1))
+    last_segment = length - segment * num - start_straight - start_r * math.pi - num * math.pi * r
+
+    centerline = Centerline(start_pos)
+    centerline.segment(start_straight)
+    centerline.turn(start_r, "rr")
+    centerline.segment(segment)
+    for i in range(num - 1):
+        centerline.turn(r, "ll" if i % 2 == 0 else "rr")
+        centerline.segment(last_segment if i == num - 2 else segment)
+    centerline.turn(r, "l" if (num - 1) % 2 == 0 else "r")
+    centerline.segment(last_straight)
+    centerline.turn(r, "l" if (num - 1) % 2 == 0 else "r")
+    centerline.segment(coupling_length)
+    return centerline
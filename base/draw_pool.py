@@ -0,0 +1,119 @@
+##############################################################
+# Process pool drawing the geometry of components in parallel
+##############################################################
+
+from concurrent.futures import ProcessPoolExecutor
+import math, os
+from base import fidelity, gds_backend
+import toolbox
+
+_executors = {}  # (number of workers, geometry backend) -> ProcessPoolExecutor, kept for the following draws
+
+
+def draw_components(cmpnts_class_name, trees, workers: int, chunk_size: int = None, defer_booleans: bool = False):
+    """
+    Draws components in worker processes.
+
+    Note:
+        Each task draws a chunk of components from their parameters and returns the flattened polygon arrays, which
+        are exactly the ones the serial path would produce (see `LibraryBase.draw_pieces`). Components whose class is
+        unknown to the workers (e.g. registered after the pool started) are returned as None and must be drawn by the
+        caller.
+
+    Input:
+        cmpnts_class_name: str, the class name of the component collection (used to look up the component classes).
+        trees: list of OptionsTree, the frozen parameters of the components.
+        workers: int, the number of worker processes.
+        chunk_size: int, the number of components per task (default: about 4 tasks per worker).
+        defer_booleans: bool, whether the components return the operands of their final boolean (see
+            `LibraryBase.draw_pieces`).
+
+    Output:
+        results: list of (shape key, pieces, deferred) or None, in the order of `trees`.
+    """
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(trees) / (4 * workers)))
+    chunks = [trees[i:i + chunk_size] for i in range(0, len(trees), chunk_size)]
+    results = []
+    backend = gds_backend.get_backend()
+    for chunk_results in executor(workers, backend).map(draw_chunk, [cmpnts_class_name] * len(chunks), chunks,
+                                                        [defer_booleans] * len(chunks),
+                                                        [fidelity.get_fidelity()] * len(chunks),
+                                                        [backend] * len(chunks)):
+        for result in chunk_results:
+            if result is not None:
+                for _, shapes in result[1]:
+                    for polygon_set in shapes[0]:
+                        toolbox.make_read_only_polygons(polygon_set)  # Flags are not pickled
+            results.append(result)
+    return results
+
+
+def draw_chunk(cmpnts_class_name, trees, defer_booleans: bool = False, fidelity_name: str = None,
+               backend: str = None):
+    """
+    Draws a chunk of components (runs in a worker process).
+
+    Input:
+        cmpnts_class_name: str, the class name of the component collection.
+        trees: list of OptionsTree, the frozen parameters of the components.
+        defer_booleans: bool, whether the components return the operands of their final boolean.
+        fidelity_name: str, the fidelity of the curves selected in the parent process (None keeps the current one).
+        backend: str, the geometry backend selected in the parent process (None keeps the current one).
+
+    Output:
+        results: list of (shape key, pieces, deferred) or None.
+    """
+    import library
+    if fidelity_name is not None and fidelity.get_fidelity() != fidelity_name:
+        fidelity.set_fidelity(fidelity_name)
+    if backend is not None and gds_backend.get_backend() != backend:
+        gds_backend.set_backend(backend)
+    cell_cache = {}  # Components of the same shape in the chunk share one drawing
+    results = []
+    for tree in trees:
+        cmpnt_class = library.get_component_class(cmpnts_class_name, tree.get("type"))
+        if cmpnt_class is None:
+            results.append(None)
+            continue
+        cmpnt = cmpnt_class(options=tree.cow())
+        results.append(cmpnt.draw_pieces(cell_cache, defer_booleans=defer_booleans))
+    return results
+
+
+def executor(workers: int, backend: str = None):
+    """
+    Returns the process pool with the given number of workers, starting it on first use.
+
+    Note:
+        A pool is kept per geometry backend, so the workers started before `gds_backend.set_backend` are not reused
+        with the new backend. The tasks also pass the backend, for the workers that do not inherit the state of the
+        parent process (spawn start method).
+
+    Input:
+        workers: int, the number of worker processes.
+        backend: str, the geometry backend of the tasks (default: see `gds_backend.get_backend`).
+
+    Output:
+        executor: ProcessPoolExecutor.
+    """
+    if backend is None:
+        backend = gds_backend.get_backend()
+    if (workers, backend) not in _executors:
+        _executors[(workers, backend)] = ProcessPoolExecutor(max_workers=workers)
+    return _executors[(workers, backend)]
+
+
+def default_workers():
+    """
+    Returns the number of CPU cores available to the process.
+
+    Input:
+        None
+
+    Output:
+        workers: int.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
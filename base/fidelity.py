@@ -0,0 +1,83 @@
+##############################################################
+# Fidelity of the curved geometry (preview or tapeout)
+##############################################################
+
+import contextlib, os
+
+# Fidelity name -> tolerance of the curves (maximal distance between an arc and its polygonal approximation)
+FIDELITIES = {
+    "tapeout": 0.01,  # Fine arcs for fabrication (the gdspy default)
+    "preview": 1.0  # About 10 times fewer vertices per arc, for interactive previews, SVG and GUI rendering
+}
+
+_fidelity = os.environ.get("EDA_Q_FIDELITY", "tapeout")
+
+
+def set_fidelity(name: str):
+    """
+    Selects the fidelity of the curved geometry drawn by the components.
+
+    Note:
+        The components draw their arcs (circular bends of FlexPath, Path.turn, Round) with the tolerance of the
+        selected fidelity. The number of vertices of an arc grows as the inverse square root of the tolerance, so the
+        "preview" fidelity draws about 10 times fewer vertices than "tapeout". The collections redraw their components
+        when the fidelity changes. The default fidelity can also be set with the environment variable
+        `EDA_Q_FIDELITY`.
+
+    Input:
+        name: str, "tapeout" or "preview".
+
+    Output:
+        None
+    """
+    global _fidelity
+    if name not in FIDELITIES:
+        raise ValueError(f"Unknown fidelity {name}, expected one of {tuple(FIDELITIES.keys())}.")
+    _fidelity = name
+    return
+
+
+def get_fidelity():
+    """
+    Returns the name of the selected fidelity.
+
+    Input:
+        None
+
+    Output:
+        name: str.
+    """
+    return _fidelity
+
+
+def tolerance():
+    """
+    Returns the curve tolerance of the selected fidelity.
+
+    Input:
+        None
+
+    Output:
+        tolerance: float.
+    """
+    return FIDELITIES[_fidelity]
+
+
+@contextlib.contextmanager
+def fidelity_mode(name: str = None):
+    """
+    Selects a fidelity for the duration of a with block, then restores the previous one.
+
+    Input:
+        name: str, the fidelity name, None to keep the current one.
+
+    Output:
+        None
+    """
+    previous = _fidelity
+    if name is not None:
+        set_fidelity(name)
+    try:
+        yield
+    finally:
+        set_fidelity(previous)
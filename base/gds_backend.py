@@ -0,0 +1,293 @@
+##############################################################
+# Geometry backend selection (gdspy or gdstk)
+##############################################################
+
+import math, os
+import gdspy
+import numpy as np
+
+BACKENDS = ("gdspy", "gdstk")
+
+_backend = os.environ.get("EDA_Q_GDS_BACKEND", "gdspy")
+
+
+def set_backend(name: str):
+    """
+    Selects the library running the geometry operations and the file output.
+
+    Note:
+        The components are always described with gdspy objects. With the "gdstk" backend, the boolean operations of
+        the components are computed by gdstk, which is faster for boolean-heavy components, and the GDS/SVG files are
+        written by gdstk. The resulting geometry is equivalent; the split of polygons with holes may differ.
+        The default backend can also be set with the environment variable `EDA_Q_GDS_BACKEND`.
+
+    Input:
+        name: str, "gdspy" or "gdstk".
+
+    Output:
+        None
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown GDS backend {name}, expected one of {BACKENDS}.")
+    if name == "gdstk":
+        import gdstk  # Fail early if it is not installed
+    _backend = name
+    return
+
+
+def get_backend():
+    """
+    Returns the name of the selected backend.
+
+    Input:
+        None
+
+    Output:
+        name: str.
+    """
+    return _backend
+
+
+def boolean(operand1, operand2, operation, precision=0.001, max_points=199, layer=0, datatype=0):
+    """
+    Boolean operation between polygons, with the interface and result type of `gdspy.boolean`.
+
+    Input:
+        operand1: PolygonSet, FlexPath, RobustPath, CellReference, CellArray, Cell or iterable of those or of point arrays.
+        operand2: same types as `operand1`, or None.
+        operation: str, "or", "and", "xor" or "not" (difference operand1 - operand2).
+        precision: float, the precision for rounding the vertex coordinates.
+        max_points: int, the maximal number of vertices of the resulting polygons (no fracture if 4 or less).
+        layer: int, the layer of the result.
+        datatype: int, the datatype of the result.
+
+    Output:
+        result: gdspy.PolygonSet, or None if the result is empty.
+    """
+    if _backend == "gdspy":
+        return gdspy.boolean(operand1, operand2, operation, precision=precision, max_points=max_points, layer=layer,
+                             datatype=datatype)
+    import gdstk
+    poly1 = polygons_of(operand1)
+    poly2 = polygons_of(operand2)
+    if len(poly2) == 0:
+        if len(poly1) == 0:
+            return None
+        if operation in ("not", "xor"):
+            return gdspy.PolygonSet(poly1, layer, datatype).fracture(max_points, precision)
+        poly2.append(poly1.pop())
+    result = gdstk.boolean(_as_lists(poly1), _as_lists(poly2), operation, precision, layer, datatype)
+    if len(result) == 0:
+        return None
+    polygon_set = gdspy.PolygonSet([polygon.points for polygon in result], layer, datatype)
+    if max_points > 4 and any(len(points) > max_points for points in polygon_set.polygons):
+        polygon_set.fracture(max_points, precision)
+    return polygon_set
+
+
+def batched_difference(pairs, tile_size: float, layer=0, datatype=0, cache=None):
+    """
+    Computes the union of the differences `extract - subtract` of many components with one boolean per tile.
+
+    Note:
+        The components are binned into square tiles by the center of their extracted shapes. In a tile, the union of
+        the extracted shapes minus the union of the subtracted shapes equals the union of the per-component differences
+        as long as no subtracted shape of a component reaches the extracted shapes of another one; components whose
+        bounding boxes do not guarantee this get a boolean of their own. The result has the same area as the
+        per-component booleans, only the split into polygons differs.
+
+    Input:
+        pairs: list of (extract, subtract) point array lists, one per component.
+        tile_size: float, the side of the tiles.
+        layer: int, the layer of the result.
+        datatype: int, the datatype of the result.
+        cache: dict, the results of the previous call by tile, reused for tiles whose pairs are the same objects.
+
+    Output:
+        polygon_sets: list of gdspy.PolygonSet.
+    """
+    pairs = [pair for pair in pairs if len(pair[0]) > 0]
+    if not pairs:
+        if cache is not None:
+            cache.clear()
+        return []
+    extract_boxes = np.array([_bounding_box(extract) for extract, _ in pairs])
+    subtract_boxes = np.array([_bounding_box(subtract) for _, subtract in pairs])
+    centers = (extract_boxes[:, :2] + extract_boxes[:, 2:]) / 2
+    tiles = {}
+    for i, tile_key in enumerate(map(tuple, np.floor(centers / tile_size).astype(int).tolist())):
+        tiles.setdefault(tile_key, []).append(i)
+    results = []
+    new_cache = {}
+    for tile_key, members in tiles.items():
+        ids = tuple(id(pairs[i]) for i in members)
+        entry = cache.get(tile_key) if cache is not None else None
+        if entry is None or entry[0] != ids:
+            entry = (ids, [pairs[i] for i in members], _tile_difference([pairs[i] for i in members],
+                                                                         extract_boxes[members],
+                                                                         subtract_boxes[members], layer, datatype))
+        new_cache[tile_key] = entry  # Keeps the pairs alive, so their ids stay valid
+        results.extend(entry[2])
+    if cache is not None:
+        cache.clear()
+        cache.update(new_cache)
+    return results
+
+
+def _tile_difference(pairs, extract_boxes, subtract_boxes, layer, datatype):
+    # Subtracted shapes overlapping the extracted shapes of another component of the tile (bounding boxes)
+    overlap = ((subtract_boxes[:, None, 0] < extract_boxes[None, :, 2]) &
+               (extract_boxes[None, :, 0] < subtract_boxes[:, None, 2]) &
+               (subtract_boxes[:, None, 1] < extract_boxes[None, :, 3]) &
+               (extract_boxes[None, :, 1] < subtract_boxes[:, None, 3]))
+    np.fill_diagonal(overlap, False)
+    conflicts = overlap.any(axis=0) | overlap.any(axis=1)
+    groups = [[pair] for pair, conflict in zip(pairs, conflicts) if conflict]
+    batch = [pair for pair, conflict in zip(pairs, conflicts) if not conflict]
+    if batch:
+        groups.append(batch)
+    results = []
+    for group in groups:
+        extract = [points for pair in group for points in pair[0]]
+        subtract = [points for pair in group for points in pair[1]]
+        result = boolean(extract, subtract, "not", layer=layer, datatype=datatype)
+        if result is not None:
+            results.append(result)
+    return results
+
+
+def _bounding_box(polygons):
+    if not polygons:
+        return (np.inf, np.inf, -np.inf, -np.inf)
+    points = np.concatenate([np.asarray(points, dtype=float).reshape(-1, 2) for points in polygons])
+    return (*points.min(axis=0), *points.max(axis=0))
+
+
+def write_gds(lib, path):
+    """
+    Writes a gdspy library to a GDS file with the selected backend.
+
+    Input:
+        lib: gdspy.GdsLibrary, the library to write.
+        path: str, the path of the GDS file.
+
+    Output:
+        None
+    """
+    if _backend == "gdspy":
+        lib.write_gds(outfile=path)
+        return
+    to_gdstk_library(lib).write_gds(path)
+    return
+
+
+def write_svg(cell, path, scaling):
+    """
+    Writes a gdspy cell to an SVG image with the selected backend.
+
+    Input:
+        cell: gdspy.Cell, the cell to draw.
+        path: str, the path of the SVG file.
+        scaling: float, the scaling factor from layout units to pixels.
+
+    Output:
+        None
+    """
+    if _backend == "gdspy":
+        cell.write_svg(path, scaling=scaling)
+        return
+    cells = {}
+    _to_gdstk_cell(cell, cells).write_svg(path, scaling=scaling)
+    return
+
+
+def to_gdstk_library(lib):
+    """
+    Converts a gdspy library to a gdstk library. Shared cells are converted once and stay shared.
+
+    Input:
+        lib: gdspy.GdsLibrary.
+
+    Output:
+        gdstk_lib: gdstk.Library.
+    """
+    import gdstk
+    gdstk_lib = gdstk.Library(name=lib.name, unit=lib.unit, precision=lib.precision)
+    cells = {}
+    for cell in lib.cells.values():
+        _to_gdstk_cell(cell, cells)
+    for gdstk_cell in cells.values():
+        gdstk_lib.add(gdstk_cell)
+    return gdstk_lib
+
+
+def _to_gdstk_cell(cell, cells):
+    import gdstk
+    if cell.name in cells:
+        return cells[cell.name]
+    gdstk_cell = gdstk.Cell(cell.name)
+    cells[cell.name] = gdstk_cell
+    polygons = []
+    for polygon_set in cell.polygons:
+        polygons.extend(_to_gdstk_polygons(polygon_set))
+    for path in cell.paths:
+        polygons.extend(_to_gdstk_polygons(path.to_polygonset()))
+    gdstk_cell.add(*polygons)
+    for label in cell.labels:
+        gdstk_cell.add(gdstk.Label(label.text, label.position, anchor=_ANCHORS.get(label.anchor, "o"),
+                                   rotation=math.radians(label.rotation or 0), magnification=label.magnification or 1,
+                                   x_reflection=label.x_reflection, layer=label.layer, texttype=label.texttype))
+    for reference in cell.references:
+        ref_cell = reference.ref_cell
+        ref_cell = _to_gdstk_cell(ref_cell, cells) if isinstance(ref_cell, gdspy.Cell) else ref_cell
+        repetition = {}
+        if isinstance(reference, gdspy.CellArray):
+            repetition = {"columns": reference.columns, "rows": reference.rows, "spacing": reference.spacing}
+        gdstk_cell.add(gdstk.Reference(ref_cell, reference.origin, rotation=math.radians(reference.rotation or 0),
+                                       magnification=reference.magnification or 1,
+                                       x_reflection=reference.x_reflection, **repetition))
+    return gdstk_cell
+
+
+def _to_gdstk_polygons(polygon_set):
+    import gdstk
+    # gdstk reads NumPy arrays point by point, nested lists are parsed faster
+    return [gdstk.Polygon(points.tolist(), layer, datatype)
+            for points, layer, datatype in zip(polygon_set.polygons, polygon_set.layers, polygon_set.datatypes)]
+
+
+def polygons_of(operand):
+    """
+    Lists the point arrays of a boolean operand, like `gdspy.boolean` does.
+
+    Input:
+        operand: PolygonSet, FlexPath, RobustPath, CellReference, CellArray, Cell or iterable of those or of point arrays.
+
+    Output:
+        polygons: list of point arrays.
+    """
+    if operand is None:
+        return []
+    if isinstance(operand, gdspy.PolygonSet):
+        return list(operand.polygons)
+    if isinstance(operand, (gdspy.FlexPath, gdspy.RobustPath, gdspy.CellReference, gdspy.CellArray)):
+        return operand.get_polygons()
+    polygons = []
+    for item in operand:
+        if isinstance(item, gdspy.PolygonSet):
+            polygons.extend(item.polygons)
+        elif isinstance(item, (gdspy.FlexPath, gdspy.RobustPath, gdspy.CellReference, gdspy.CellArray)):
+            polygons.extend(item.get_polygons())
+        else:
+            polygons.append(item)
+    return polygons
+
+
+def _as_lists(polygons):
+    # gdstk reads NumPy arrays point by point, nested lists are parsed faster
+    return [points.tolist() if isinstance(points, np.ndarray) else points for points in polygons]
+
+
+# gdspy label anchors (numbers) -> gdstk anchors
+_ANCHORS = {0: "nw", 1: "n", 2: "ne", 4: "w", 5: "o", 6: "e", 8: "sw", 9: "s", 10: "se"}
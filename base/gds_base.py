@@ -1,6 +1,8 @@
 from addict import Dict
 import copy, gdspy
 from base.base import Base
+from base import gds_backend, gds_stream
+from base.fidelity import fidelity_mode
 import toolbox
 
 class GdsBase(Base):
@@ -20,20 +22,22 @@ class GdsBase(Base):
         gdspy.LayoutViewer(library=self.lib)
         return
 
-    def save_svg(self, width: int = 500, path: str = None):
+    def save_svg(self, width: int = 500, path: str = None, fidelity: str = "preview"):
         """
         Save the GDS layout corresponding to the lib as an SVG image.
 
         Input:
             width: The width of the image, from the leftmost coordinate to the rightmost coordinate of all components.
             path: The path to save the SVG image.
+            fidelity: The fidelity of the curves, "preview" (coarse, default) or "tapeout" (see `fidelity.set_fidelity`).
 
         Output:
             None
 
         Dependent on the lib, subclasses using this method must include a method for generating the lib.
         """
-        self.draw_gds()
+        with fidelity_mode(fidelity):
+            self.draw_gds()
         # Default path
         if path is None:
             path = "./svg/{}.svg".format(self.__class__.__name__)
@@ -44,13 +48,16 @@ class GdsBase(Base):
 
         return
 
-    def show_svg(self, width: int = 500, path: str = None):
+    def show_svg(self, width: int = 500, path: str = None, fidelity: str = "preview"):
         """
         Display the GDS layout corresponding to the lib as an SVG image.
 
+        The curves are drawn with the given fidelity, "preview" (coarse, default) or "tapeout".
+
         Dependent on the lib, subclasses using this method must include a method for generating the lib.
         """
-        self.draw_gds()
+        with fidelity_mode(fidelity):
+            self.draw_gds()
 
         # Default path
         if path is None:
@@ -68,17 +75,54 @@ class GdsBase(Base):
 
         return
 
-    def save_gds(self, path: str = "./gds.gds"):
+    def save_gds(self, path: str = "./gds.gds", hierarchical: bool = False, stream: bool = False):
         """
         Save the GDS layout to a GDS file.
 
         Input:
             path: The path to save the GDS file.
+            hierarchical: Whether to write a hierarchical library (component shapes stored once and referenced from
+                the chip cells) instead of flattened chip cells. Only supported by layouts made of collections.
+            stream: Whether to draw and write the components one at a time with bounded memory (see `stream_gds`)
+                instead of building the whole library first.
 
         Output:
             The path where the GDS file is saved.
         """
-        self.draw_gds()
+        if stream:
+            toolbox.jg_and_create_path(path)
+            return self.stream_gds(path, hierarchical=hierarchical)
+        if hierarchical:
+            self.draw_gds(hierarchical=True)
+        else:
+            self.draw_gds()
         toolbox.jg_and_create_path(path)
-        self.lib.write_gds(outfile=path)
-        return path
\ No newline at end of file
+        gds_backend.write_gds(self.lib, path)
+        return path
+
+    def stream_gds(self, path: str = "./gds.gds", hierarchical: bool = False):
+        """
+        Draw the GDS layout and write it to a GDS file component by component.
+
+        Note:
+            The geometry of each component is written as soon as it is drawn and then dropped, so the peak memory is
+            proportional to the largest component rather than the whole layout; `self.lib` is not built. The top
+            cell references the chip cells instead of holding a copy of their elements.
+
+            Subclasses using this method must include a `write_stream` method. If drawing fails, the file at `path`
+            is left as it was.
+
+        Input:
+            path: The path to save the GDS file.
+            hierarchical: Whether to write one cell per component shape, referenced from the chip cells.
+
+        Output:
+            The path where the GDS file is saved.
+        """
+        stream = gds_stream.GdsStream(path, hierarchical=hierarchical)
+        try:
+            self.write_stream(stream)
+            stream.close(toolbox.convert_to_snake_case(self.__class__.__name__))
+        finally:
+            stream.discard()  # Leaves no truncated file if drawing failed
+        return path
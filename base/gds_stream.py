@@ -0,0 +1,181 @@
+##############################################################
+# Streaming GDS writer with bounded memory
+##############################################################
+
+import io, os, shutil, tempfile
+import gdspy
+
+_ENDSTR_SIZE = 4  # Size of the record closing a cell
+
+
+class GdsStream():
+    """
+    Writes a GDS library incrementally, one component at a time.
+
+    The shapes of each component are written as soon as they are drawn and can be dropped afterwards, so the memory
+    used is proportional to the largest component instead of the whole layout. In flat mode the elements of each chip
+    cell are spooled to a temporary file and copied into the chip cell when the stream is closed. In hierarchical mode
+    each component shape is written as a cell of its own and the chip cells only hold references to these cells.
+    The library is written to a temporary file, which replaces the GDS file only when the stream is closed; `discard`
+    drops an unfinished stream.
+    """
+
+    def __init__(self, path, hierarchical: bool = False, unit: float = 1.0e-6, precision: float = 1.0e-9):
+        """
+        Opens a GDS file for writing.
+
+        Input:
+            path: str, the path of the GDS file.
+            hierarchical: bool, whether to write one cell per component shape, referenced from the chip cells.
+            unit: float, the unit of the coordinates (in meters).
+            precision: float, the precision of the coordinates (in meters).
+
+        Output:
+            None
+        """
+        self.path = path
+        self.temp_path = path + ".tmp"
+        self.hierarchical = hierarchical
+        self.multiplier = unit / precision
+        self.file = open(self.temp_path, "wb")
+        self.writer = gdspy.GdsWriter(self.file, unit=unit, precision=precision)
+        self.spools = {}  # Chip name -> temporary file with the GDS records of the chip cell elements
+        self.cell_names = set()  # Names of the cells already written
+        return
+
+    def add_shapes(self, chip_name, shapes, cell_name):
+        """
+        Adds the shapes of a component to a chip cell.
+
+        Input:
+            chip_name: str, the chip name.
+            shapes: tuple of (polygons, paths, labels), the shapes flattened onto the chip layer.
+            cell_name: str, the name of the component cell (only used in hierarchical mode).
+
+        Output:
+            None
+        """
+        if self.hierarchical:
+            cell = gdspy.Cell(cell_name, exclude_from_current=True)
+            for elements in shapes:
+                cell.add(elements)
+            self.write_cell(cell)
+            self.add_reference(chip_name, cell_name)
+            return
+        spool = self.spool(chip_name)
+        for elements in shapes:
+            for element in elements:
+                element.to_gds(spool, self.multiplier)
+        return
+
+    def add_reference(self, chip_name, cell_name, origin=(0, 0), rotation=None):
+        """
+        Adds a reference to a written cell to a chip cell.
+
+        Input:
+            chip_name: str, the chip name.
+            cell_name: str, the name of the referenced cell.
+            origin: tuple, the position of the reference.
+            rotation: float, the rotation of the reference in degrees.
+
+        Output:
+            None
+        """
+        reference = gdspy.CellReference(_placeholder(cell_name), origin=origin, rotation=rotation or None)
+        reference.to_gds(self.spool(chip_name), self.multiplier)
+        return
+
+    def write_cell(self, cell):
+        """
+        Writes a cell to the file.
+
+        Input:
+            cell: gdspy.Cell, the cell (its references must be written separately).
+
+        Output:
+            None
+        """
+        self.writer.write_cell(cell)
+        self.cell_names.add(cell.name)
+        return
+
+    def has_cell(self, cell_name):
+        """
+        Checks whether a cell has already been written.
+
+        Input:
+            cell_name: str, the cell name.
+
+        Output:
+            result: bool.
+        """
+        return cell_name in self.cell_names
+
+    def spool(self, chip_name):
+        """
+        Returns the temporary file collecting the elements of a chip cell.
+
+        Input:
+            chip_name: str, the chip name.
+
+        Output:
+            spool: file.
+        """
+        if chip_name not in self.spools:
+            self.spools[chip_name] = tempfile.TemporaryFile()
+        return self.spools[chip_name]
+
+    def close(self, top_name):
+        """
+        Writes the chip cells and a top cell referencing them (if there are chip cells), then closes the file and moves
+        it to its path.
+
+        Input:
+            top_name: str, the name of the top cell.
+
+        Output:
+            None
+        """
+        top_cell = gdspy.Cell(top_name, exclude_from_current=True)
+        for chip_name, spool in self.spools.items():
+            record = io.BytesIO()
+            gdspy.Cell(chip_name, exclude_from_current=True).to_gds(record, self.multiplier)
+            record = record.getvalue()
+            self.file.write(record[:-_ENDSTR_SIZE])
+            spool.seek(0)
+            shutil.copyfileobj(spool, self.file)
+            self.file.write(record[-_ENDSTR_SIZE:])
+            spool.close()
+            top_cell.add(gdspy.CellReference(_placeholder(chip_name)))
+        self.spools.clear()
+        if top_cell.references:
+            self.write_cell(top_cell)
+        self.writer.close()
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+        return
+
+    def discard(self):
+        """
+        Closes an unfinished stream and deletes its temporary files; the GDS file is left as it was. Does nothing
+        after `close`.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        for spool in self.spools.values():
+            spool.close()
+        self.spools.clear()
+        if not self.file.closed:
+            self.file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+        return
+
+
+def _placeholder(cell_name):
+    # Empty cell standing for a cell written separately (references only store the name)
+    return gdspy.Cell(cell_name, exclude_from_current=True)
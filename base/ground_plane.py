@@ -0,0 +1,130 @@
+##############################################################
+# Tiled ground-plane generation with optional cheesing
+##############################################################
+
+from addict import Dict
+import math
+import numpy as np
+from base import draw_pool, gds_backend
+
+# Default cheesing (flux-trapping holes) parameters
+default_cheese_ops = Dict(
+    size=10,  # Side of the square holes
+    pitch=50,  # Distance between the hole centers
+    clearance=20,  # Minimal distance between a hole and the etched shapes
+    margin=100  # Minimal distance between a hole and the chip edge
+)
+
+
+def ground_plane(chip_box, polygons, tile_size: float = 2000, workers: int = 1, cheese_ops=None):
+    """
+    Computes the ground plane of a chip: the chip rectangle minus the etched shapes, tile by tile.
+
+    Note:
+        The etched shapes are binned by their bounding boxes into the tiles they overlap, so each tile only subtracts
+        the shapes reaching it; the tile results are adjacent and together cover the chip. With several workers the
+        tiles are computed by the process pool of `draw_pool`. Cheesing holes are laid out on a grid aligned with the
+        chip and kept where they clear all etched shapes of the tile, using bounding boxes.
+
+    Input:
+        chip_box: tuple, ((x_min, y_min), (x_max, y_max)) the chip rectangle.
+        polygons: list of point arrays, the etched shapes of the chip.
+        tile_size: float, the side of the tiles.
+        workers: int, the number of worker processes (1 computes the tiles in the current process).
+        cheese_ops: dict, the cheesing parameters (see `default_cheese_ops`), None for no cheesing.
+
+    Output:
+        polygons: list of point arrays, the ground plane.
+    """
+    (x_min, y_min), (x_max, y_max) = chip_box
+    if cheese_ops is not None:
+        cheese_ops = Dict(default_cheese_ops, **cheese_ops)
+        tile_size = max(1, round(tile_size / cheese_ops.pitch)) * cheese_ops.pitch  # Holes do not cross tiles
+    polygons = [np.asarray(points, dtype=float) for points in polygons if len(points) > 2]
+    boxes = np.array([(*points.min(axis=0), *points.max(axis=0)) for points in polygons]).reshape(-1, 4)
+
+    # Spatial index: tile -> indices of the shapes overlapping it (or too close to its holes)
+    reach = 0 if cheese_ops is None else cheese_ops.size + cheese_ops.clearance
+    columns = max(1, math.ceil((x_max - x_min) / tile_size))
+    rows = max(1, math.ceil((y_max - y_min) / tile_size))
+    first = np.floor((boxes[:, :2] - reach - (x_min, y_min)) / tile_size).astype(int)
+    last = np.floor((boxes[:, 2:] + reach - (x_min, y_min)) / tile_size).astype(int)
+    first = np.clip(first, 0, (columns - 1, rows - 1))
+    last = np.clip(last, 0, (columns - 1, rows - 1))
+    index = {}
+    for i, (i0, j0, i1, j1) in enumerate(np.hstack((first, last)).tolist()):
+        for column in range(i0, i1 + 1):
+            for row in range(j0, j1 + 1):
+                index.setdefault((column, row), []).append(i)
+
+    tasks = []
+    for column in range(columns):
+        for row in range(rows):
+            tile = (x_min + column * tile_size, y_min + row * tile_size,
+                    min(x_min + (column + 1) * tile_size, x_max), min(y_min + (row + 1) * tile_size, y_max))
+            members = index.get((column, row), [])
+            tasks.append((tile, [polygons[i] for i in members], boxes[members], chip_box, cheese_ops,
+                          gds_backend.get_backend()))
+    if workers > 1 and len(tasks) > 1:
+        results = draw_pool.executor(workers, gds_backend.get_backend()).map(
+            tile_ground_plane, tasks, chunksize=max(1, len(tasks) // (4 * workers)))
+    else:
+        results = map(tile_ground_plane, tasks)
+    return [points for result in results for points in result]
+
+
+def tile_ground_plane(task):
+    """
+    Computes the ground plane of one tile (runs in a worker process with several workers).
+
+    Input:
+        task: tuple, (tile rectangle (x0, y0, x1, y1), etched shapes, their bounding boxes, chip box, cheesing
+            parameters, geometry backend).
+
+    Output:
+        polygons: list of point arrays.
+    """
+    (x0, y0, x1, y1), polygons, boxes, chip_box, cheese_ops, backend = task
+    if gds_backend.get_backend() != backend:
+        gds_backend.set_backend(backend)
+    tile = [np.array([(x0, y0), (x1, y0), (x1, y1), (x0, y1)])]
+    subtract = list(polygons)
+    if cheese_ops is not None:
+        subtract.extend(cheese_holes((x0, y0, x1, y1), boxes, chip_box, cheese_ops))
+    result = gds_backend.boolean(tile, subtract, "not")
+    if result is None:
+        return []
+    return result.polygons
+
+
+def cheese_holes(tile, boxes, chip_box, cheese_ops):
+    """
+    Lays out the cheesing holes of a tile.
+
+    Input:
+        tile: tuple, (x0, y0, x1, y1) the tile rectangle.
+        boxes: array (N, 4), the bounding boxes (x_min, y_min, x_max, y_max) of the etched shapes of the tile.
+        chip_box: tuple, ((x_min, y_min), (x_max, y_max)) the chip rectangle.
+        cheese_ops: dict, the cheesing parameters (see `default_cheese_ops`).
+
+    Output:
+        holes: array (M, 4, 2), the corners of the holes.
+    """
+    x0, y0, x1, y1 = tile
+    (chip_x0, chip_y0), (chip_x1, chip_y1) = chip_box
+    size, pitch, clearance, margin = cheese_ops.size, cheese_ops.pitch, cheese_ops.clearance, cheese_ops.margin
+    # Hole centers in the middle of the pitch cells of the chip grid
+    xs = chip_x0 + pitch * (np.arange(math.floor((x0 - chip_x0) / pitch), math.ceil((x1 - chip_x0) / pitch)) + 0.5)
+    ys = chip_y0 + pitch * (np.arange(math.floor((y0 - chip_y0) / pitch), math.ceil((y1 - chip_y0) / pitch)) + 0.5)
+    centers = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2)
+    half = size / 2
+    keep = ((centers[:, 0] - half >= max(x0, chip_x0 + margin)) & (centers[:, 0] + half <= min(x1, chip_x1 - margin)) &
+            (centers[:, 1] - half >= max(y0, chip_y0 + margin)) & (centers[:, 1] + half <= min(y1, chip_y1 - margin)))
+    centers = centers[keep]
+    if len(boxes) and len(centers):
+        reach = half + clearance
+        blocked = ((centers[:, None, 0] + reach > boxes[None, :, 0]) & (centers[:, None, 0] - reach < boxes[None, :, 2]) &
+                   (centers[:, None, 1] + reach > boxes[None, :, 1]) & (centers[:, None, 1] - reach < boxes[None, :, 3]))
+        centers = centers[~blocked.any(axis=1)]
+    corners = np.array([(-half, -half), (half, -half), (half, half), (-half, half)])
+    return centers[:, None, :] + corners[None, :, :]
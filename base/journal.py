@@ -0,0 +1,241 @@
+##############################################################
+# Append-only edit journal on top of binary snapshots
+##############################################################
+
+from base import options_tree, snapshot
+import os, struct, uuid, zlib
+
+# Journal file identification
+MAGIC = b"EDAQJRNL"
+JOURNAL_VERSION = 1
+JOURNAL_SUFFIX = ".journal"
+
+_RECORD_HEAD = struct.Struct("<II")  # Payload size, CRC32 of the payload
+
+
+class Journal():
+    """
+    Persists the edits of a design as an append-only journal next to its binary snapshot.
+
+    Each `record` call appends the option-level differences (added, changed and deleted parameters) between the last
+    persisted options and the current ones, so a save costs O(edit size): unchanged subtrees of frozen options trees
+    are shared and skipped by identity. Reopening replays the journal over the snapshot; a record that was only
+    partially written (e.g. during a crash) is ignored. `compact` folds the journal back into a fresh snapshot.
+    """
+
+    def __init__(self, path, compact_records: int = 200, sync: bool = True):
+        """
+        Initializes a journal for a snapshot file.
+
+        Input:
+            path: str, the path of the snapshot file (the journal is stored at `path + ".journal"`).
+            compact_records: int, the number of records after which the journal is compacted automatically.
+            sync: bool, whether to flush every record to the disk before returning.
+
+        Output:
+            None
+        """
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.compact_records = compact_records
+        self.sync = sync
+        self.tree = None  # Last persisted options
+        self.generation = None
+        self.records = 0
+        self.end = 0  # End of the last valid record in the journal file
+        return
+
+    def open(self):
+        """
+        Loads the snapshot and replays the journal over it.
+
+        Input:
+            None
+
+        Output:
+            options: OptionsTree, the frozen persisted options.
+        """
+        header = snapshot.read_header(self.path)
+        tree = header.tree
+        self.generation = header.get("generation")
+        self.records = 0
+        self.end = 0
+        for record, end in _read_records(self.journal_path):
+            if self.end == 0:
+                if record.get("generation") != self.generation or self.generation is None:
+                    break  # Journal of an older snapshot, already folded into this one
+            else:
+                tree = apply(tree, record.ops)
+                self.records += 1
+            self.end = end
+        self.tree = tree
+        return tree
+
+    def record(self, options, label: str = None):
+        """
+        Appends the edits made since the last persisted options.
+
+        Input:
+            options: dict, the current options (frozen OptionsTree objects are compared without copying).
+            label: str, an optional description of the edit (e.g. "routing").
+
+        Output:
+            count: int, the number of recorded changes.
+        """
+        if self.tree is None:
+            self.compact(options)
+            return 0
+        options = options_tree.freeze(options)
+        ops = diff(self.tree, options)
+        if not ops:
+            return 0
+        self._append({"label": label, "ops": ops})
+        self.tree = options
+        self.records += 1
+        if self.records >= self.compact_records or self.end > max(1 << 20, os.path.getsize(self.path)):
+            self.compact()
+        return len(ops)
+
+    def compact(self, options=None):
+        """
+        Writes the persisted options (or the given ones) to a fresh snapshot and starts an empty journal.
+
+        Note:
+            The new snapshot replaces the old one before the journal is reset; a journal left over from a crash in
+            between belongs to the old snapshot generation and is ignored when reopening.
+
+        Input:
+            options: dict, the options to write (default: the last persisted options).
+
+        Output:
+            None
+        """
+        if options is not None:
+            self.tree = options_tree.freeze(options)
+        self.generation = uuid.uuid4().hex
+        _replace(self.path, lambda path: snapshot.save(self.tree, path, generation=self.generation), self.sync)
+        _replace(self.journal_path, self._write_start, self.sync)
+        self.records = 0
+        self.end = os.path.getsize(self.journal_path)
+        return
+
+    def _write_start(self, path):
+        with open(path, "wb") as file:
+            file.write(MAGIC + struct.pack("<I", JOURNAL_VERSION))
+            file.write(_pack_record({"generation": self.generation}))
+        return
+
+    def _append(self, record):
+        if self.end == 0:  # No journal of the current snapshot yet
+            _replace(self.journal_path, self._write_start, self.sync)
+            self.end = os.path.getsize(self.journal_path)
+        with open(self.journal_path, "r+b") as file:
+            file.seek(self.end)
+            file.write(_pack_record(record))
+            file.truncate()  # Drops a partially written record left by a crash
+            self.end = file.tell()
+            if self.sync:
+                file.flush()
+                os.fsync(file.fileno())
+        return
+
+
+def load(path):
+    """
+    Loads a binary snapshot, replaying its edit journal if there is one.
+
+    Input:
+        path: str, the path of the snapshot file.
+
+    Output:
+        options: OptionsTree, the frozen persisted options.
+    """
+    return Journal(path).open()
+
+
+def diff(old, new, path=()):
+    """
+    Lists the changes between two options trees. Subtrees shared by both trees are skipped without being visited.
+
+    Input:
+        old: dict, the previous options.
+        new: dict, the current options.
+        path: tuple, the path of the compared trees (used in recursion).
+
+    Output:
+        ops: list of ["add" | "change", path, value] and ["delete", path] entries.
+    """
+    ops = []
+    old_items = dict(options_tree.shared_items(old))
+    new_items = options_tree.shared_items(new)
+    for key in old_items:
+        if key not in new:
+            ops.append(["delete", list(path + (key,))])
+    for key, value in new_items:
+        if key not in old_items:
+            ops.append(["add", list(path + (key,)), value])
+            continue
+        old_value = old_items[key]
+        if old_value is value:
+            continue
+        if isinstance(old_value, dict) and isinstance(value, dict):
+            ops.extend(diff(old_value, value, path + (key,)))
+        elif type(old_value) is not type(value) or old_value != value:
+            ops.append(["change", list(path + (key,)), value])
+    return ops
+
+
+def apply(tree, ops):
+    """
+    Applies changes listed by `diff` to an options tree.
+
+    Input:
+        tree: OptionsTree, the options to change.
+        ops: list, the changes.
+
+    Output:
+        tree: OptionsTree, the new frozen tree (unchanged subtrees are shared with the input).
+    """
+    tree = options_tree.freeze(tree)
+    for op in ops:
+        if op[0] == "delete":
+            tree = tree.delete_in(op[1])
+        else:
+            tree = tree.set_in(op[1], op[2])
+    return tree
+
+
+def _pack_record(record):
+    payload = snapshot.encode_value(record)
+    return _RECORD_HEAD.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _read_records(path):
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as file:
+        data = file.read()
+    start = len(MAGIC) + 4
+    if data[:len(MAGIC)] != MAGIC or len(data) < start:
+        return
+    if struct.unpack_from("<I", data, len(MAGIC))[0] != JOURNAL_VERSION:
+        raise ValueError(f"Unsupported journal version in {path}.")
+    while start + _RECORD_HEAD.size <= len(data):
+        size, crc = _RECORD_HEAD.unpack_from(data, start)
+        end = start + _RECORD_HEAD.size + size
+        payload = data[start + _RECORD_HEAD.size:end]
+        if end > len(data) or zlib.crc32(payload) != crc:
+            return  # Incomplete record, written during a crash
+        yield snapshot.decode_value(payload), end
+        start = end
+    return
+
+
+def _replace(path, write, sync):
+    temp_path = path + ".tmp"
+    write(temp_path)
+    if sync:
+        with open(temp_path, "rb+") as file:
+            os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    return
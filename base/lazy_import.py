@@ -0,0 +1,66 @@
+##############################################################
+# Lazy imports of the modules with heavy dependencies
+##############################################################
+
+import importlib, sys, types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stands in for a module until one of its attributes is used, then imports it.
+
+    Note:
+        Simulation (win32com), equivalent circuits (qucat, sympy), qiskit topology generation and plotting
+        (matplotlib, networkx) are only needed by a few methods, so importing them eagerly made every `Design()`
+        pay for them, and fail on machines without the optional packages. The import, and its ImportError, now
+        happens on the first use.
+    """
+
+    def __init__(self, name: str):
+        """
+        Creates the placeholder of a module, without importing it.
+
+        Input:
+            name: str, the absolute name of the module.
+
+        Output:
+            None
+        """
+        super().__init__(name)
+        return
+
+    def _load(self):
+        """
+        Imports the module, once.
+
+        Input:
+            None
+
+        Output:
+            module: module.
+        """
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)  # Later attribute lookups no longer go through __getattr__
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str):
+    """
+    Returns a module, imported on the first use of one of its attributes.
+
+    Input:
+        name: str, the absolute name of the module (e.g. "matplotlib.pyplot").
+
+    Output:
+        module: the module if it is already imported, otherwise a LazyModule.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
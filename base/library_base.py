@@ -1,12 +1,45 @@
 from base.gds_base import GdsBase
+from base import gds_backend, options_tree
 from addict import Dict
-import copy
+import copy, functools, gdspy, math
+import toolbox
 
 class LibraryBase(GdsBase):
     """
     LibraryBase serves as the base class for each component, providing common methods including parameter extraction, injection, and modification.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        """
+        Makes the `calc_general_ops` of each component class drop the cached options tree when it returns, because it
+        may update parameters in place (e.g. `self.readout_pins.append(...)`), which `__setattr__` does not see.
+        Parameters are editable while `calc_general_ops` runs and frozen again when it returns.
+        """
+        super().__init_subclass__(**kwargs)
+        calc = cls.__dict__.get("calc_general_ops")
+        if calc is None or getattr(calc, "invalidates_options", False):
+            return
+
+        @functools.wraps(calc)
+        def calc_general_ops(self, *args, **kwargs):
+            if self.__dict__.get("_editable", False):
+                return calc(self, *args, **kwargs)  # Called by the calc_general_ops of a subclass
+            self.__dict__["_editable"] = True
+            try:
+                for name in self.op_name_list:
+                    value = self.__dict__.get(name)
+                    if isinstance(value, (options_tree.FrozenList, options_tree.OptionsTree)):
+                        self.__dict__[name] = options_tree.thaw(value)
+                return calc(self, *args, **kwargs)
+            finally:
+                self.__dict__["_editable"] = False
+                self.freeze_options()
+                self.invalidate_options()
+
+        calc_general_ops.invalidates_options = True
+        cls.calc_general_ops = calc_general_ops
+        return
+
     def __init__(self, options=Dict()):
         """
         Initializes the LibraryBase object.
@@ -32,16 +65,307 @@ class LibraryBase(GdsBase):
         """
         # Set default parameters
         for op_name, op in self.default_options.items():
-            super().__setattr__(op_name, op)
+            super().__setattr__(op_name, options_tree.freeze(op))
 
-        # Save the list of parameter names
-        self.op_name_list = list(self.__dict__.keys())
+        # Save the list of parameter names (private bookkeeping attributes are not parameters)
+        self.op_name_list = [op_name for op_name in self.__dict__.keys() if not op_name.startswith("_")]
 
-        # Inject parameters and calculate common parameters
+        # Inject parameters and calculate common parameters (lazily for classes declaring `derived_options`)
         self.inject_options(Dict(options))
-        self.calc_general_ops()  # Calculate common parameters
         return
 
+    cache_options_tree = True
+
+    # Parameters computed by `calc_general_ops` from the other parameters (e.g. pins and outline).
+    # Classes listing them here compute them lazily: writing any other parameter marks the component dirty,
+    # and `calc_general_ops` runs on the first read of a derived parameter. The other classes run `calc_general_ops`
+    # on each injection.
+    derived_options = ()
+
+    # Classes whose geometry depends on their position only through a translation (and optionally a rotation around it)
+    # name that parameter here; `draw_instance` then draws each distinct shape once and places it with a CellReference.
+    instance_position = None  # e.g. "gds_pos"
+    instance_rotation = None  # (parameter name, degrees per unit), e.g. ("rotation", 1) or ("rotate", 180 / math.pi)
+    instance_ignored = ("name", "chip", "topo_pos")  # Parameters that do not change the drawn shape
+
+    def __setattr__(self, name, value):
+        """
+        Sets an attribute and drops the cached options tree when the attribute is a parameter.
+        Parameter values are frozen (lists become FrozenList, dictionaries frozen OptionsTree) outside
+        `calc_general_ops`, so changing them in place raises TypeError instead of leaving `options` stale;
+        assign a new value instead.
+        """
+        if name in self.derived_options and not self.__dict__.get("_calculating", False):
+            self.ensure_calculated()  # An explicit value must not be overwritten by a pending calculation
+        is_option = name in self.__dict__.get("op_name_list", ())
+        if is_option and not self.__dict__.get("_editable", False):
+            value = options_tree.freeze(value)
+        super().__setattr__(name, value)
+        if is_option:
+            if name not in self.derived_options and not self.__dict__.get("_calculating", False):
+                self.mark_dirty()
+            self.invalidate_options()
+        return
+
+    def __getattr__(self, name):
+        """
+        Computes the derived parameters of a dirty component on first read (only called for missing attributes).
+        """
+        stale = self.__dict__.get("_stale_derived")
+        if stale is None or name not in stale:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+        if self.__dict__.get("_calculating", False):
+            return stale[name]  # Previous value, read by `calc_general_ops` itself
+        self.ensure_calculated()
+        return self.__dict__[name]
+
+    def mark_dirty(self):
+        """
+        Marks the derived parameters as outdated, they are recomputed on their next read.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        if not self.derived_options or self.__dict__.get("_stale_derived") is not None:
+            return
+        stale = {}
+        for name in self.derived_options:
+            if name in self.__dict__:
+                stale[name] = self.__dict__.pop(name)
+        self.__dict__["_stale_derived"] = stale
+        return
+
+    def ensure_calculated(self):
+        """
+        Runs `calc_general_ops` if the component is dirty.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        stale = self.__dict__.get("_stale_derived")
+        if stale is None:
+            return
+        self.__dict__["_calculating"] = True
+        try:
+            self.calc_general_ops()
+        finally:
+            self.__dict__["_calculating"] = False
+        for name, value in stale.items():
+            if name not in self.__dict__:
+                super().__setattr__(name, value)  # Not recomputed, keep the previous value
+        self.__dict__.pop("_stale_derived", None)
+        self.invalidate_options()
+        return
+
+    def freeze_options(self):
+        """
+        Replaces the parameter values by read-only ones (see `options_tree.freeze`), which are shared with
+        `options_tree` instead of being copied into it.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        for name in self.op_name_list:
+            if name in self.__dict__:
+                self.__dict__[name] = options_tree.freeze(self.__dict__[name])
+        return
+
+    def has_derived(self):
+        """
+        Returns whether the derived parameters are calculated and up to date.
+
+        Input:
+            None
+
+        Output:
+            calculated: bool, False if the class declares no derived parameters or if they are pending.
+        """
+        return (bool(self.derived_options) and "_stale_derived" not in self.__dict__
+                and all(name in self.__dict__ for name in self.derived_options))
+
+    def set_derived(self, values):
+        """
+        Sets the derived parameters to values computed elsewhere (e.g. transformed together with the component),
+        replacing a pending calculation.
+
+        Input:
+            values: dict, a value for each derived parameter.
+
+        Output:
+            None
+        """
+        self.__dict__.pop("_stale_derived", None)
+        for name in self.derived_options:
+            super().__setattr__(name, options_tree.freeze(values[name]))
+        self.invalidate_options()
+        return
+
+    def shape_key(self):
+        """
+        Returns a key of the position-independent parameters of the component: components with the same key have the
+        same shape and only differ by their placement.
+
+        Input:
+            None
+
+        Output:
+            key: str, or None if the class does not declare `instance_position`.
+        """
+        if self.instance_position is None:
+            return None
+        ignored = set(self.instance_ignored) | set(self.derived_options) | {self.instance_position}
+        if self.instance_rotation is not None:
+            ignored.add(self.instance_rotation[0])
+        shape_ops = {k: v for k, v in options_tree.shared_items(self.options_tree) if k not in ignored}
+        return self.__class__.__name__ + "_" + options_tree.content_hash(shape_ops)
+
+    def draw_instance(self, cell_cache=None):
+        """
+        Draws the component, reusing the drawing of an identical shape from the cache.
+
+        Note:
+            The shape is drawn once at the origin (without rotation) into a master cell; `self.cell` then only holds a
+            CellReference placing the master at the component position. Classes without `instance_position`
+            (or a call without cache) are drawn with `draw_gds` as usual.
+
+        Input:
+            cell_cache: dict, shape key -> master cell, shared by the components of a collection.
+
+        Output:
+            key: str, the shape key of the component (None if it was drawn with `draw_gds`).
+        """
+        key = self.shape_key() if cell_cache is not None else None
+        if key is None:
+            self.draw_gds()
+            return None
+        master = cell_cache.get(key)
+        if master is None:
+            master = self.draw_master(self.options_tree, key)
+            cell_cache[key] = master
+        origin, rotation = self.instance_placement(self.options_tree)
+        gdspy.library.use_current_library = False
+        self.lib = gdspy.GdsLibrary()
+        self.cell = self.lib.new_cell(self.name + "_cell")
+        self.cell.add(gdspy.CellReference(master, origin=origin, rotation=rotation))
+        return key
+
+    @classmethod
+    def draw_master(cls, options, key):
+        """
+        Draws the shape of a component at the origin, without rotation.
+
+        Input:
+            options: dict, the component parameters.
+            key: str, the shape key of the component (used as the component name of the prototype).
+
+        Output:
+            master: gdspy.Cell, the cell of the prototype.
+        """
+        options = options_tree.freeze(options).cow()
+        options[cls.instance_position] = (0, 0)
+        if cls.instance_rotation is not None:
+            options[cls.instance_rotation[0]] = 0
+        options.name = key
+        prototype = cls(options)
+        prototype.draw_gds()
+        return prototype.cell
+
+    @classmethod
+    def instance_placement(cls, options):
+        """
+        Returns the placement of the master cell of a component (see `draw_master`).
+
+        Input:
+            options: dict, the component parameters.
+
+        Output:
+            origin: tuple, the position of the component.
+            rotation: float, the rotation of the component in degrees.
+        """
+        rotation = 0
+        if cls.instance_rotation is not None:
+            name, scale = cls.instance_rotation
+            rotation = options[name] * scale
+        return tuple(options[cls.instance_position]), rotation
+
+    def draw_pieces(self, cell_cache=None, defer_booleans: bool = False):
+        """
+        Draws the component and flattens its cells onto the layers of their chips.
+
+        Input:
+            cell_cache: dict, the master cells of the component shapes (see `draw_instance`).
+            defer_booleans: bool, whether to return the operands of `extract_minus_subtract` instead of computing it
+                (components drawn from a cached shape always compute it, once per shape).
+
+        Output:
+            key: str, the shape key of the component (None if it is not instanced).
+            pieces: list of (chip name, (polygons, paths, labels)), the read-only flattened shapes.
+            deferred: (chip name, extract polygons, subtract polygons) of the deferred boolean, or None.
+        """
+        self.__dict__["_defer_booleans"] = defer_booleans
+        try:
+            key = self.draw_instance(cell_cache)
+        finally:
+            self.__dict__.pop("_defer_booleans", None)
+        cells = [(self.chip, self.cell)]
+        if hasattr(self, "jj_cell"):  # Special handling for qubit's jj_chip
+            cells.append((self.jj_chip, self.jj_cell))
+        pieces = []
+        for chip_name, cell in cells:
+            if chip_name is None or chip_name == Dict():
+                chip_name = "None"
+            layer_num = toolbox.custom_hash(chip_name)
+            pieces.append((chip_name, toolbox.flatten_shapes(cell, layer_num, 0)))
+        deferred = self.__dict__.pop("_deferred_boolean", None)
+        if deferred is not None:
+            deferred = (pieces[0][0],) + deferred
+        return key, pieces, deferred
+
+    def write_stream(self, stream):
+        """
+        Draws the component and writes the cells of its library to a GDS stream (see `GdsBase.stream_gds`), as
+        `save_gds` writes them.
+
+        Input:
+            stream: GdsStream, the GDS file being written.
+
+        Output:
+            None
+        """
+        self.draw_gds()
+        for cell in self.lib.cells.values():
+            stream.write_cell(cell)
+        return
+
+    def extract_minus_subtract(self):
+        """
+        Returns the shape drawn by the component: the polygons of `cell_extract` minus the ones of `cell_subtract`.
+
+        Note:
+            When the drawing is requested with deferred booleans (see `draw_pieces`), the operands are kept for one
+            boolean per chip tile in the collection (see `CmpntsBase.batch_booleans`) and an empty list is returned.
+
+        Input:
+            None
+
+        Output:
+            shape: gdspy.PolygonSet, an empty list if the boolean is deferred, or None if the result is empty.
+        """
+        if self.__dict__.get("_defer_booleans"):
+            self.__dict__["_deferred_boolean"] = (gds_backend.polygons_of(self.cell_extract),
+                                                  gds_backend.polygons_of(self.cell_subtract))
+            return []
+        return gds_backend.boolean(self.cell_extract, self.cell_subtract, "not")
+
     def extract_options(self):
         """
         Extracts all parameters of the current object.
@@ -52,12 +376,20 @@ class LibraryBase(GdsBase):
         Output:
             options: dict, a dictionary containing all current parameters.
         """
-        options = Dict()
+        return self.options_tree.cow()  # Copy-on-write view of the cached parameter tree
+
+    def build_options_tree(self):
+        """
+        Collects the current parameter attributes for `options_tree`.
+
+        Input:
+            None
+
+        Output:
+            options: dict, a dictionary containing all current parameters.
+        """
         # Iterate over the list of parameter names and extract corresponding attributes
-        for op_name in self.op_name_list:
-            op = getattr(self, op_name)
-            options[op_name] = copy.deepcopy(op)  # Deep copy parameter values
-        return copy.deepcopy(options)  # Return a deep copy of the parameter dictionary
+        return {op_name: getattr(self, op_name) for op_name in self.op_name_list}
 
     def inject_options(self, options):
         """
@@ -71,7 +403,12 @@ class LibraryBase(GdsBase):
         """
         for k, v in options.items():
             if k in self.op_name_list:  # If the parameter name is in the defined parameter list
-                super().__setattr__(k, copy.deepcopy(v))  # Set parameter value
+                super().__setattr__(k, options_tree.freeze(v))  # Set a read-only copy of the parameter value
+        self.__dict__.pop("_stale_derived", None)  # Injected values replace the previous derived ones
+        self.mark_dirty()
+        self.invalidate_options()
+        if not self.derived_options:
+            self.calc_general_ops()  # Classes without lazy derived parameters recalculate them right away
         return
 
     def change_option(self, op_name, op_value):
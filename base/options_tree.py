@@ -0,0 +1,401 @@
+##############################################################
+# Copy-on-write options tree shared by all option snapshots
+##############################################################
+
+from addict import Dict
+import copy, hashlib, numbers
+
+
+class FrozenList(list):
+    """
+    Read-only list used for list values stored inside a frozen OptionsTree.
+    It still compares, iterates and prints like a normal list, but any in-place modification raises TypeError.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("This list belongs to a frozen options snapshot and cannot be modified.")
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+class Deferred():
+    """
+    Placeholder for an options subtree that is only decoded when it is first read (see `base.snapshot`).
+    Options trees resolve it transparently on access, so it never appears to users of the tree.
+    """
+
+    __slots__ = ("loader", "value", "loaded")
+
+    def __init__(self, loader):
+        self.loader = loader  # Callable returning the frozen subtree
+        self.value = None
+        self.loaded = False
+        return
+
+    def resolve(self):
+        """
+        Decodes the subtree on the first call and returns it.
+
+        Input:
+            None
+
+        Output:
+            value: the frozen subtree.
+        """
+        if not self.loaded:
+            self.value = freeze(self.loader())
+            self.loaded = True
+            self.loader = None
+        return self.value
+
+    def __eq__(self, other):
+        if isinstance(other, Deferred):
+            other = other.resolve()
+        return self.resolve() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.resolve())
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (freeze, (self.resolve(),))
+
+
+class OptionsTree(Dict):
+    """
+    Copy-on-write options dictionary, compatible with addict.Dict.
+
+    A frozen OptionsTree is an immutable snapshot. Frozen trees share their unchanged subtrees with each other,
+    so taking a snapshot costs O(1) and changing one value only copies the nodes on the path to that value.
+
+    A mutable view of a frozen tree (see `cow`) behaves like a normal addict.Dict. Its children stay shared with the
+    snapshot until they are first accessed; at that moment only the accessed child is copied into the view.
+    """
+
+    def cow(self):
+        """
+        Returns a mutable copy-on-write view of this tree.
+
+        Input:
+            None
+
+        Output:
+            view: OptionsTree, a mutable tree whose children are shared with this tree until accessed.
+        """
+        view = OptionsTree()
+        dict.update(view, self)
+        return view
+
+    def is_frozen(self):
+        """
+        Checks whether this node is an immutable snapshot.
+
+        Input:
+            None
+
+        Output:
+            frozen: bool, True if the node cannot be modified.
+        """
+        return self.__dict__.get("_cow_frozen", False)
+
+    def set_in(self, path, value):
+        """
+        Returns a new frozen tree in which the value at `path` is replaced, copying only the nodes along the path.
+
+        Input:
+            path: list/tuple of keys, or a single key.
+            value: any type, the new value.
+
+        Output:
+            tree: OptionsTree, the new frozen tree.
+        """
+        path = _as_path(path)
+        node = dict.copy(freeze(self))
+        if len(path) == 1:
+            node[path[0]] = freeze(value)
+        else:
+            child = node.get(path[0])
+            if type(child) is Deferred:
+                child = child.resolve()
+            if not isinstance(child, OptionsTree):
+                child = freeze(Dict())
+            node[path[0]] = child.set_in(path[1:], value)
+        return _frozen_node(node)
+
+    def delete_in(self, path):
+        """
+        Returns a new frozen tree without the value at `path`, copying only the nodes along the path.
+
+        Input:
+            path: list/tuple of keys, or a single key.
+
+        Output:
+            tree: OptionsTree, the new frozen tree.
+        """
+        path = _as_path(path)
+        node = dict.copy(freeze(self))
+        if len(path) == 1:
+            node.pop(path[0], None)
+        elif path[0] in node:
+            child = node[path[0]]
+            if type(child) is Deferred:
+                child = child.resolve()
+            if isinstance(child, OptionsTree):
+                node[path[0]] = child.delete_in(path[1:])
+        return _frozen_node(node)
+
+    ### Mutation guards ###
+
+    def _check_mutable(self):
+        if self.is_frozen():
+            raise TypeError("Options snapshots are read-only, use `.cow()` or `.options` to get an editable copy.")
+
+    def __setitem__(self, name, value):
+        self._check_mutable()
+        super().__setitem__(name, value)
+
+    def __delitem__(self, name):
+        self._check_mutable()
+        super().__delitem__(name)
+
+    def clear(self):
+        self._check_mutable()
+        super().clear()
+
+    def popitem(self):
+        self._check_mutable()
+        key, value = super().popitem()
+        return key, _thaw(value)
+
+    def pop(self, key, *default):
+        self._check_mutable()
+        if key in self:
+            return _thaw(super().pop(key))
+        return super().pop(key, *default)
+
+    def update(self, *args, **kwargs):
+        self._check_mutable()
+        super().update(*args, **kwargs)
+
+    ### Lazy copying on read ###
+
+    def __getitem__(self, name):
+        value = super().__getitem__(name)
+        if type(value) is Deferred:
+            value = _resolve(self, name, value)
+        if self.is_frozen() or not _is_shared(value):
+            return value
+        value = _thaw(value)
+        dict.__setitem__(self, name, value)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def items(self):
+        return [(key, self[key]) for key in list(self.keys())]
+
+    def values(self):
+        return [self[key] for key in list(self.keys())]
+
+    ### Copying ###
+
+    def __copy__(self):
+        if self.is_frozen():
+            return self
+        other = OptionsTree()
+        dict.update(other, self)
+        return other
+
+    def __deepcopy__(self, memo):
+        if self.is_frozen():
+            return self
+        other = OptionsTree()
+        memo[id(self)] = other
+        for key, value in dict.items(self):
+            dict.__setitem__(other, key, value if _is_shared(value) else copy.deepcopy(value, memo))
+        return other
+
+    def __reduce__(self):
+        return (_restore, (dict(self), self.is_frozen()))
+
+
+_ATOMIC_TYPES = {str, int, float, bool, complex, type(None)}
+
+
+def freeze(data):
+    """
+    Converts options data into an immutable snapshot. Subtrees that are already frozen are reused as they are,
+    so freezing a copy-on-write view only costs as much as the parts that were actually modified.
+
+    Input:
+        data: any type, usually a Dict of options.
+
+    Output:
+        frozen: the frozen counterpart of `data` (OptionsTree for dictionaries, FrozenList for lists).
+    """
+    if type(data) in _ATOMIC_TYPES or type(data) is Deferred:
+        return data
+    if isinstance(data, OptionsTree) and data.is_frozen():
+        return data
+    if isinstance(data, dict):
+        return _frozen_node({key: freeze(value) for key, value in dict.items(data)})
+    if isinstance(data, FrozenList):
+        return data
+    if isinstance(data, list):
+        return FrozenList([freeze(item) for item in data])
+    if isinstance(data, tuple):
+        if all(type(item) in _ATOMIC_TYPES for item in data):
+            return data
+        return tuple(freeze(item) for item in data)
+    return copy.deepcopy(data)
+
+
+def thaw(data):
+    """
+    Returns an independent, editable copy of options data. Frozen trees become copy-on-write views.
+
+    Input:
+        data: any type.
+
+    Output:
+        data: an editable copy of the input.
+    """
+    if _is_shared(data):
+        return _thaw(data)
+    return copy.deepcopy(data)
+
+
+def shared_items(data):
+    """
+    Iterates over the (key, value) pairs of options data without copying shared subtrees.
+    The values may be frozen and must be treated as read-only.
+
+    Input:
+        data: dict, usually an OptionsTree.
+
+    Output:
+        items: list of (key, value) pairs.
+    """
+    return [(key, _resolve(data, key, value) if type(value) is Deferred else value) for key, value in dict.items(data)]
+
+
+def content_hash(data):
+    """
+    Computes a stable content hash of options data (the same on every run and platform).
+
+    Note:
+        The hash is built Merkle-style: the hash of a dictionary combines the hashes of its keys and values, and does
+        not depend on the order of the keys. Hashes of frozen nodes are kept with the node, so after a change only the
+        nodes on the path to the changed value are hashed again; the shared subtrees reuse their hashes.
+
+    Input:
+        data: any type, usually an OptionsTree.
+
+    Output:
+        hash: str, a hexadecimal digest of 32 characters.
+    """
+    return _digest(data).hex()
+
+
+def _digest(data):
+    if type(data) is Deferred:
+        data = data.resolve()
+    cached = isinstance(data, (OptionsTree, FrozenList)) and (isinstance(data, FrozenList) or data.is_frozen())
+    if cached and "_content_digest" in data.__dict__:
+        return data.__dict__["_content_digest"]
+    if isinstance(data, dict):
+        entries = sorted(_digest(key) + _digest(value) for key, value in shared_items(data))
+        digest = _hash(b"d", b"".join(entries))
+    elif isinstance(data, (list, tuple)):
+        digest = _hash(b"l" if isinstance(data, list) else b"t", b"".join(_digest(item) for item in data))
+    elif data is None or isinstance(data, (bool, str)):
+        digest = _hash(type(data).__name__.encode(), str(data).encode())
+    elif isinstance(data, numbers.Integral):
+        digest = _hash(b"int", str(int(data)).encode())
+    elif isinstance(data, numbers.Real):
+        digest = _hash(b"float", repr(float(data)).encode())
+    elif hasattr(data, "tobytes") and hasattr(data, "shape"):
+        digest = _hash(b"array", f"{data.dtype}{data.shape}".encode() + data.tobytes())  # NumPy arrays
+    else:
+        digest = _hash(type(data).__name__.encode(), repr(data).encode())
+    if cached:
+        data.__dict__["_content_digest"] = digest
+    return digest
+
+
+def _hash(tag, payload):
+    return hashlib.blake2b(tag + b":" + payload, digest_size=16).digest()
+
+
+def _resolve(node, key, value):
+    value = value.resolve()
+    dict.__setitem__(node, key, value)  # Replaces the placeholder by the equal decoded subtree, even in frozen nodes
+    return value
+
+
+def _thaw(value):
+    if type(value) is Deferred:
+        value = value.resolve()
+    if isinstance(value, OptionsTree):
+        return value.cow()
+    if isinstance(value, FrozenList):
+        return [_thaw(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_thaw(item) for item in value)
+    return value
+
+
+def _is_shared(value):
+    if type(value) is Deferred:
+        return True
+    if isinstance(value, OptionsTree):
+        return value.is_frozen()
+    if isinstance(value, FrozenList):
+        return True
+    if isinstance(value, tuple):
+        return any(_is_shared(item) for item in value)
+    return False
+
+
+def _frozen_node(items):
+    node = OptionsTree()
+    dict.update(node, items)
+    node.__dict__["_cow_frozen"] = True
+    return node
+
+
+def _restore(items, frozen):
+    if frozen:
+        return _frozen_node(items)
+    node = OptionsTree()
+    dict.update(node, items)
+    return node
+
+
+def _as_path(path):
+    if isinstance(path, (list, tuple)):
+        return list(path)
+    return [path]
@@ -0,0 +1,210 @@
+##############################################################
+# Spatial index from pin coordinates to components
+##############################################################
+
+from base import options_tree
+import math, numbers
+
+# Parameters holding pin coordinates
+PIN_KINDS = ("readout_pins", "control_pins", "coupling_pins", "start_pos", "end_pos", "pos")
+
+
+class PinIndex():
+    """
+    Maps pin coordinates (quantized by a tolerance) to (component name, pin kind, pin index).
+
+    Replaces linear scans such as `start_pos in q_ops.readout_pins` over all components with O(1) lookups.
+    The index can be synchronized incrementally with a frozen options tree: only the components whose
+    (structurally shared) subtree changed are indexed again.
+    """
+
+    def __init__(self, pin_kinds=PIN_KINDS, tolerance: float = 1e-6):
+        """
+        Initializes an empty index.
+
+        Input:
+            pin_kinds: tuple of str, the parameters holding pin coordinates.
+            tolerance: float, the distance under which two coordinates are considered equal.
+
+        Output:
+            None
+        """
+        self.pin_kinds = tuple(pin_kinds)
+        self.tolerance = tolerance
+        self.cells = {}  # Quantized coordinate -> list of (x, y, cmpnt_name, pin_kind, pin_index)
+        self.cmpnt_entries = {}  # Component name -> (indexed options, list of cell keys)
+        self.order = {}  # Component name -> position of the component in the options
+        self.synced = None
+        return
+
+    def sync(self, cmpnts_ops):
+        """
+        Updates the index to the given component parameters, re-indexing only components that changed.
+
+        Input:
+            cmpnts_ops: dict, the parameters of all components (frozen trees are compared by identity).
+
+        Output:
+            self: PinIndex, the updated index.
+        """
+        if cmpnts_ops is self.synced:
+            return self
+        items = options_tree.shared_items(cmpnts_ops)
+        names = set()
+        for cmpnt_name, cmpnt_ops in items:
+            names.add(cmpnt_name)
+            entry = self.cmpnt_entries.get(cmpnt_name)
+            if entry is not None and entry[0] is cmpnt_ops and _is_frozen(cmpnt_ops):
+                continue  # Same frozen subtree, nothing changed
+            self.remove(cmpnt_name)
+            self.add(cmpnt_name, cmpnt_ops)
+        for cmpnt_name in list(self.cmpnt_entries.keys()):
+            if cmpnt_name not in names:
+                self.remove(cmpnt_name)
+        self.order = {cmpnt_name: i for i, (cmpnt_name, _) in enumerate(items)}
+        self.synced = cmpnts_ops if _is_frozen(cmpnts_ops) else None
+        return self
+
+    def add(self, cmpnt_name, cmpnt_ops):
+        """
+        Indexes the pins of a component.
+
+        Input:
+            cmpnt_name: str, the component name.
+            cmpnt_ops: dict, the component parameters.
+
+        Output:
+            None
+        """
+        keys = []
+        for pin_kind in self.pin_kinds:
+            value = cmpnt_ops.get(pin_kind) if isinstance(cmpnt_ops, dict) else None
+            for pin_index, point in iter_points(value):
+                key = self._key(point[0], point[1])
+                self.cells.setdefault(key, []).append((point[0], point[1], cmpnt_name, pin_kind, pin_index))
+                keys.append(key)
+        self.cmpnt_entries[cmpnt_name] = (cmpnt_ops, keys)
+        if cmpnt_name not in self.order:
+            self.order[cmpnt_name] = len(self.order)
+        return
+
+    def remove(self, cmpnt_name):
+        """
+        Removes the pins of a component from the index.
+
+        Input:
+            cmpnt_name: str, the component name.
+
+        Output:
+            None
+        """
+        entry = self.cmpnt_entries.pop(cmpnt_name, None)
+        if entry is None:
+            return
+        for key in set(entry[1]):
+            cell = [hit for hit in self.cells[key] if hit[2] != cmpnt_name]
+            if cell:
+                self.cells[key] = cell
+            else:
+                del self.cells[key]
+        return
+
+    def lookup(self, point, pin_kind=None):
+        """
+        Finds the pins located at a coordinate.
+
+        Input:
+            point: tuple/list, the (x, y) coordinate.
+            pin_kind: str or tuple of str, only return pins of these kinds (default all kinds).
+
+        Output:
+            hits: list of (cmpnt_name, pin_kind, pin_index), ordered like the components in the indexed options.
+        """
+        if isinstance(pin_kind, str):
+            pin_kind = (pin_kind,)
+        if not (isinstance(point, (list, tuple)) and len(point) == 2 and _is_coord(point[0]) and _is_coord(point[1])):
+            return []
+        x, y = point[0], point[1]
+        kx, ky = self._key(x, y)
+        hits = []
+        for i in (kx - 1, kx, kx + 1):
+            for j in (ky - 1, ky, ky + 1):
+                for hx, hy, cmpnt_name, kind, pin_index in self.cells.get((i, j), ()):
+                    if abs(hx - x) > self.tolerance or abs(hy - y) > self.tolerance:
+                        continue
+                    if pin_kind is None or kind in pin_kind:
+                        hits.append((cmpnt_name, kind, pin_index))
+        hits.sort(key=lambda hit: self.order.get(hit[0], 0))
+        return hits
+
+    def find(self, point, pin_kind=None, last: bool = False):
+        """
+        Finds the component owning a pin at a coordinate.
+
+        Input:
+            point: tuple/list, the (x, y) coordinate.
+            pin_kind: str or tuple of str, only consider pins of these kinds (default all kinds).
+            last: bool, return the last matching component instead of the first.
+
+        Output:
+            cmpnt_name: str, or None if no pin is located at the coordinate.
+        """
+        hits = self.lookup(point, pin_kind)
+        if not hits:
+            return None
+        return hits[-1][0] if last else hits[0][0]
+
+    def _key(self, x, y):
+        return math.floor(x / self.tolerance + 0.5), math.floor(y / self.tolerance + 0.5)
+
+
+def index_of(cmpnts_ops, pin_kinds=PIN_KINDS):
+    """
+    Returns a pin index of component parameters. For frozen options trees the index is built once and kept with the
+    tree, since the tree cannot change; other dictionaries are indexed on each call.
+
+    Input:
+        cmpnts_ops: dict, the parameters of all components.
+        pin_kinds: tuple of str, the parameters holding pin coordinates.
+
+    Output:
+        index: PinIndex.
+    """
+    pin_kinds = tuple(pin_kinds)
+    if _is_frozen(cmpnts_ops):
+        indexes = cmpnts_ops.__dict__.setdefault("_pin_indexes", {})
+        if pin_kinds not in indexes:
+            indexes[pin_kinds] = PinIndex(pin_kinds).sync(cmpnts_ops)
+        return indexes[pin_kinds]
+    return PinIndex(pin_kinds).sync(cmpnts_ops)
+
+
+def _is_frozen(data):
+    return isinstance(data, options_tree.OptionsTree) and data.is_frozen()
+
+
+def _is_coord(x):
+    return isinstance(x, numbers.Real) and not isinstance(x, bool)
+
+
+def iter_points(value):
+    """
+    Iterates over the points of a pin parameter: a single point, a list of points or a dictionary of points.
+
+    Input:
+        value: any type, the pin parameter.
+
+    Output:
+        points: iterator of (pin_index, point), pin_index is None for a single point.
+    """
+    if isinstance(value, (list, tuple)):
+        if len(value) == 2 and _is_coord(value[0]) and _is_coord(value[1]):
+            yield None, value  # A single point
+            return
+        for i, point in enumerate(value):
+            if isinstance(point, (list, tuple)) and len(point) == 2 and _is_coord(point[0]) and _is_coord(point[1]):
+                yield i, point
+    elif isinstance(value, dict):
+        for key, point in value.items():
+            if isinstance(point, (list, tuple)) and len(point) == 2 and _is_coord(point[0]) and _is_coord(point[1]):
+                yield key, point
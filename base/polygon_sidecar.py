@@ -0,0 +1,79 @@
+##############################################################
+# Binary polygon sidecars of the components imported from GDS
+##############################################################
+
+import os
+import numpy as np
+
+# Sidecar path -> (modification time, polygons), shared by all the instances of the imported components
+_cache = {}
+
+
+def save_polygons(path: str, polygons):
+    """
+    Saves polygons in a compressed NumPy sidecar.
+
+    Note:
+        The vertices of all the polygons are stored in one array, with the offset of each polygon and its layer, so
+        the generated component classes only contain code instead of the polygons as Python literals.
+
+    Input:
+        path: str, the path of the .npz sidecar.
+        polygons: list of (points, layer), the vertices (array (M, 2)) and the layer of each polygon.
+
+    Output:
+        None
+    """
+    points = [np.asarray(p, dtype=float).reshape(-1, 2) for p, _ in polygons]
+    offsets = np.zeros(len(points) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(p) for p in points])
+    np.savez_compressed(path,
+                        points=np.concatenate(points) if points else np.zeros((0, 2)),
+                        offsets=offsets,
+                        layers=np.array([layer for _, layer in polygons], dtype=np.int64))
+    _cache.pop(os.path.abspath(path), None)
+    return
+
+
+def save_gds_polygons(gds_path: str, path: str):
+    """
+    Saves the polygons of all the cells of a GDS file in a compressed NumPy sidecar.
+
+    Input:
+        gds_path: str, the path of the GDS file.
+        path: str, the path of the .npz sidecar.
+
+    Output:
+        count: int, the number of polygons saved.
+    """
+    import gdstk
+    polygons = [(polygon.points, polygon.layer) for cell in gdstk.read_gds(gds_path).cells for polygon in cell.polygons]
+    save_polygons(path, polygons)
+    return len(polygons)
+
+
+def load_polygons(path: str):
+    """
+    Loads the polygons of a sidecar, once per process.
+
+    Note:
+        The sidecar is decompressed on the first call and kept until the file changes; the polygons are read-only
+        views of one array, shared by every caller.
+
+    Input:
+        path: str, the path of the .npz sidecar.
+
+    Output:
+        polygons: list of (points, layer), the vertices (array (M, 2)) and the layer of each polygon.
+    """
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with np.load(path) as data:
+        points, offsets, layers = data["points"], data["offsets"], data["layers"]
+    points.flags.writeable = False
+    polygons = [(points[offsets[i]:offsets[i + 1]], int(layers[i])) for i in range(len(layers))]
+    _cache[path] = (mtime, polygons)
+    return polygons
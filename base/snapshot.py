@@ -0,0 +1,249 @@
+##############################################################
+# Versioned binary snapshot format for options trees
+##############################################################
+
+from base import options_tree
+import io, json, numbers, struct, zipfile
+import numpy as np
+
+# File identification
+FORMAT_NAME = "EDA-Q options snapshot"
+FORMAT_VERSION = 1
+EXTENSION = ".edaq"
+HEADER_NAME = "header.json"
+
+# Flags of stored points
+_X_INT, _Y_INT, _IS_LIST = 1, 2, 4
+
+
+def save(options, path, split_depth: int = 2, generation: str = None):
+    """
+    Saves options to a binary snapshot file.
+
+    Note:
+        The file is a zip archive. A compact JSON header holds the version and the top levels of the tree; every subtree
+        found `split_depth` levels below the root (e.g. `gds.qubits` of a design) is stored as a separate chunk that
+        is decoded only when it is first read. Coordinates (points and lists of points) are stored as NumPy arrays
+        instead of text, and the original types (int/float, tuple/list) are restored exactly.
+
+    Input:
+        options: dict, the options to save (frozen OptionsTree objects are saved without copying).
+        path: str, the path of the snapshot file.
+        split_depth: int, the depth at which the tree is split into lazily loaded chunks.
+        generation: str, an identifier of this snapshot, used to match it with its edit journal (see `base.journal`).
+
+    Output:
+        None
+    """
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        chunks = []
+        tree = _split(options, split_depth, chunks)
+        for i, chunk in enumerate(chunks):
+            archive.writestr(f"chunks/{i}.bin", encode_value(chunk))
+        header = {"format": FORMAT_NAME, "version": FORMAT_VERSION, "generation": generation, "chunks": len(chunks),
+                  "tree": tree}
+        archive.writestr(HEADER_NAME, json.dumps(header, separators=(",", ":")))
+    return
+
+
+def load(path):
+    """
+    Loads options from a binary snapshot file.
+
+    Note:
+        Only the header is decoded here. The chunks are decoded when their part of the tree is first accessed,
+        so reading e.g. `load(path).gds.qubits` does not decode the routing geometry.
+
+    Input:
+        path: str, the path of the snapshot file.
+
+    Output:
+        options: OptionsTree, a frozen tree of the saved options (use `.cow()` to get an editable copy).
+    """
+    return read_header(path).tree
+
+
+def read_header(path):
+    """
+    Reads the header of a binary snapshot file.
+
+    Input:
+        path: str, the path of the snapshot file.
+
+    Output:
+        header: OptionsTree, with the format `version`, the `generation` and the lazily decoded options `tree`.
+    """
+    with open(path, "rb") as file:
+        archive = zipfile.ZipFile(io.BytesIO(file.read()))
+
+    def loader(i):
+        return lambda: decode_value(archive.read(f"chunks/{i}.bin"))
+
+    def hook(node):
+        if len(node) == 1 and "$c" in node:
+            return options_tree.Deferred(loader(node["$c"]))
+        return _decode_object(node, None)
+
+    header = json.loads(archive.read(HEADER_NAME), object_hook=hook)
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError(f"{path} is not an options snapshot.")
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {header.get('version')} (supported: {FORMAT_VERSION}).")
+    return header
+
+
+def is_snapshot(path):
+    """
+    Checks whether a file is a binary snapshot.
+
+    Input:
+        path: str, the path of the file.
+
+    Output:
+        result: bool, True if the file is a snapshot.
+    """
+    if not zipfile.is_zipfile(path):
+        return False
+    with zipfile.ZipFile(path) as archive:
+        return HEADER_NAME in archive.namelist()
+
+
+def _split(value, depth, chunks):
+    if depth == 0 and isinstance(value, (dict, list, tuple)):
+        chunks.append(value)
+        return {"$c": len(chunks) - 1}
+    if isinstance(value, dict) and all(type(key) is str and not key.startswith("$") for key in value.keys()):
+        return {key: _split(child, depth - 1, chunks) for key, child in options_tree.shared_items(value)}
+    return _Encoder(header=True).encode(value)
+
+
+class _Encoder():
+    """
+    Converts options into JSON data, moving points into coordinate arrays.
+    """
+
+    def __init__(self, header=False):
+        self.header = header  # Points in the header are kept inline, it has no coordinate arrays
+        self.xy = []
+        self.flags = []
+        return
+
+    def encode(self, value):
+        if value is None or type(value) in (str, bool, int, float):
+            return value
+        if isinstance(value, dict):
+            if all(type(key) is str and not key.startswith("$") for key in value.keys()):
+                return {key: self.encode(child) for key, child in options_tree.shared_items(value)}
+            return {"$d": [[self.encode(key), self.encode(child)] for key, child in options_tree.shared_items(value)]}
+        if isinstance(value, (list, tuple)):
+            if not self.header:
+                points = self.encode_points(value)
+                if points is not None:
+                    return points
+            items = [self.encode(item) for item in value]
+            return items if isinstance(value, list) else {"$t": items}
+        if isinstance(value, (bool, np.bool_)):
+            return bool(value)
+        if isinstance(value, numbers.Integral):
+            return int(value)
+        if isinstance(value, numbers.Real):
+            return float(value)
+        raise ValueError(f"Unsupported data type: {type(value)}")
+
+    def encode_points(self, value):
+        point = _point_flags(value)
+        if point is not None:
+            self.add_point(value, point)
+            return {"$p": len(self.flags) - 1}
+        if not value:
+            return None
+        flags = [_point_flags(item) for item in value]
+        if any(flag is None for flag in flags):
+            return None
+        start = len(self.flags)
+        for item, flag in zip(value, flags):
+            self.add_point(item, flag)
+        return {"$l" if isinstance(value, list) else "$lt": [start, len(value)]}
+
+    def add_point(self, point, flag):
+        self.xy.append((float(point[0]), float(point[1])))
+        self.flags.append(flag)
+        return
+
+
+def _point_flags(value):
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        return None
+    flag = 0 if isinstance(value, tuple) else _IS_LIST
+    for coord, int_flag in zip(value, (_X_INT, _Y_INT)):
+        if isinstance(coord, bool) or not isinstance(coord, numbers.Real):
+            return None
+        if isinstance(coord, numbers.Integral):
+            if abs(coord) >= 2 ** 53:
+                return None
+            flag |= int_flag
+    return flag
+
+
+def encode_value(value):
+    """
+    Encodes options data into the binary chunk format of snapshots.
+
+    Input:
+        value: any supported type (dict, list, tuple, str, number, bool, None).
+
+    Output:
+        blob: bytes.
+    """
+    encoder = _Encoder()
+    data = json.dumps(encoder.encode(value), separators=(",", ":")).encode()
+    xy = np.array(encoder.xy, dtype="<f8").reshape(-1, 2)
+    flags = np.array(encoder.flags, dtype=np.uint8)
+    return struct.pack("<II", len(data), len(flags)) + data + xy.tobytes() + flags.tobytes()
+
+
+def decode_value(blob):
+    """
+    Decodes data encoded by `encode_value`.
+
+    Input:
+        blob: bytes.
+
+    Output:
+        value: the frozen data.
+    """
+    data_size, n_points = struct.unpack_from("<II", blob)
+    start = struct.calcsize("<II") + data_size
+    xy = np.frombuffer(blob, dtype="<f8", count=2 * n_points, offset=start).reshape(-1, 2).tolist()
+    flags = np.frombuffer(blob, dtype=np.uint8, count=n_points, offset=start + 16 * n_points).tolist()
+    points = (xy, flags)
+    value = json.loads(blob[struct.calcsize("<II"):start], object_hook=lambda node: _decode_object(node, points))
+    return options_tree.freeze(value)
+
+
+def _decode_object(node, points):
+    if len(node) == 1:
+        key, value = next(iter(node.items()))
+        if key == "$p":
+            return _decode_point(points, value)
+        if key == "$l":
+            return options_tree.FrozenList(_decode_point(points, i) for i in range(value[0], value[0] + value[1]))
+        if key == "$lt":
+            return tuple(_decode_point(points, i) for i in range(value[0], value[0] + value[1]))
+        if key == "$t":
+            return tuple(options_tree.freeze(item) for item in value)
+        if key == "$d":
+            return options_tree.freeze({_hashable(k): v for k, v in value})
+    return options_tree.freeze(node)
+
+
+def _decode_point(points, i):
+    (x, y), flag = points[0][i], points[1][i]
+    point = (int(x) if flag & _X_INT else x, int(y) if flag & _Y_INT else y)
+    return options_tree.FrozenList(point) if flag & _IS_LIST else point
+
+
+def _hashable(key):
+    if isinstance(key, list):
+        return tuple(_hashable(item) for item in key)
+    return key
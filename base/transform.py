@@ -0,0 +1,146 @@
+##############################################################
+# Affine transforms of vertex arrays (rotation, translation, mirroring)
+##############################################################
+
+import math, numbers
+import numpy as np
+
+
+def matrix(angle: float = 0, center=(0, 0), offset=(0, 0), mirror: bool = False):
+    """
+    Returns the 3x3 matrix of an affine transform of the plane.
+
+    Note:
+        The points are first mirrored across the horizontal line through `center` (if `mirror`), then rotated by
+        `angle` around `center`, then translated by `offset`. Transforms are composed with `@`, the right one applied
+        first.
+
+    Input:
+        angle: float, the rotation angle in radians (counterclockwise).
+        center: tuple, the center of the rotation and of the mirroring.
+        offset: tuple, the translation applied last.
+        mirror: bool, whether to mirror the points (y -> -y around the center).
+
+    Output:
+        matrix: array (3, 3).
+    """
+    cos, sin = math.cos(angle), math.sin(angle)
+    sign = -1 if mirror else 1
+    linear = np.array(((cos, -sin * sign), (sin, cos * sign)))
+    center = np.asarray(center, dtype=float)
+    result = np.eye(3)
+    result[:2, :2] = linear
+    result[:2, 2] = center - linear @ center + np.asarray(offset, dtype=float)
+    return result
+
+
+def apply(transform, points):
+    """
+    Applies an affine transform to all the points of an array at once.
+
+    Input:
+        transform: array (3, 3), see `matrix`.
+        points: array_like (..., 2), the points.
+
+    Output:
+        points: array (..., 2), the transformed points.
+    """
+    points = np.asarray(points, dtype=float)
+    return points @ transform[:2, :2].T + transform[:2, 2]
+
+
+def transform_points(points, angle: float = 0, center=(0, 0), offset=(0, 0), mirror: bool = False):
+    """
+    Rotates, translates and mirrors an array of points, see `matrix`.
+
+    Input:
+        points: array_like (..., 2), the points.
+        angle, center, offset, mirror: see `matrix`.
+
+    Output:
+        points: array (..., 2), the transformed points.
+    """
+    return apply(matrix(angle, center, offset, mirror), points)
+
+
+def transform_polygon_sets(polygon_sets, transform):
+    """
+    Applies an affine transform to the vertices of gdspy polygon sets in place, with one NumPy operation.
+
+    Note:
+        Same result as `translate` and `rotate` called on each polygon set, e.g. in the classes generated from GDS
+        files (see `gds_analysis.read_single_component`).
+
+    Input:
+        polygon_sets: list of gdspy.PolygonSet.
+        transform: array (3, 3), see `matrix`.
+
+    Output:
+        None
+    """
+    polygons = [points for polygon_set in polygon_sets for points in polygon_set.polygons]
+    if not polygons:
+        return
+    points = apply(transform, np.concatenate(polygons))
+    split = iter(np.split(points, np.cumsum([len(p) for p in polygons])[:-1]))
+    for polygon_set in polygon_sets:
+        polygon_set.polygons = [next(split) for _ in polygon_set.polygons]
+    return
+
+
+def _is_point(value):
+    return (isinstance(value, (list, tuple, np.ndarray)) and len(value) == 2
+            and all(isinstance(v, numbers.Real) for v in value))
+
+
+def _collect(value, points):
+    if _is_point(value):
+        points.append(value)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _collect(v, points)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _collect(v, points)
+    return
+
+
+def _rebuild(value, points, point_type):
+    if _is_point(value):
+        x, y = next(points)
+        if point_type is not None:
+            return point_type((x, y))
+        return [x, y] if isinstance(value, list) else (x, y)
+    if isinstance(value, dict):
+        result = value.__class__()
+        for k, v in value.items():
+            result[k] = _rebuild(v, points, point_type)
+        return result
+    if isinstance(value, (list, tuple)):
+        return value.__class__(_rebuild(v, points, point_type) for v in value)
+    return value
+
+
+def transform_nested(values, transform, point_type=None):
+    """
+    Applies an affine transform to all the points found in nested parameters (e.g. the pins and outlines of many
+    components), with one NumPy operation.
+
+    Note:
+        A point is a list or tuple of two numbers; points keep their type (unless `point_type` is given), and the
+        dicts, lists and tuples holding them keep their structure. Other values are returned unchanged.
+
+    Input:
+        values: list, the parameters to transform.
+        transform: array (3, 3), see `matrix`.
+        point_type: type, the type of the transformed points, list or tuple (default: the type of each point).
+
+    Output:
+        values: list, the transformed parameters.
+    """
+    points = []
+    _collect(values, points)
+    if not points:
+        return values
+    transformed = iter(apply(transform, points).tolist())
+    return _rebuild(values, transformed, point_type)
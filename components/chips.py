@@ -41,16 +41,19 @@ class Chips(CmpntsBase):
         self.inject_options(options)  # Inject parameters
         return
     
-    def draw_gds(self):
+    def draw_gds(self, workers: int = None, hierarchical: bool = False, batch_booleans: bool = None):
         """
         Draw GDS layout for multiple chip components.
 
         Input:
-            None
+            workers: int, unused, chips are always drawn in the current process.
+            hierarchical: bool, whether to reference the chip component cells from the chip cells instead of flattening them.
+            batch_booleans: bool, unused, chips have no booleans to batch.
 
         Output:
             None
         """
+        self.apply_pending_options()
         gdspy.library.use_current_library = False
         self.lib = gdspy.GdsLibrary()  # Create a new GDS library
         self.cell_Dict = Dict()
@@ -61,25 +64,52 @@ class Chips(CmpntsBase):
             cmpnt.draw_gds()
 
         # Traverse components, add each component to the corresponding chip cell center
+        module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
         for cmpnt_name in self.cmpnt_name_list:
             cmpnt = getattr(self, cmpnt_name)
             chip_name = cmpnt.name
             if chip_name not in self.cell_Dict.keys():
                 self.cell_Dict[chip_name] = self.lib.new_cell(chip_name)
-            self.cell_Dict[chip_name].add(cmpnt.cell)
+            if hierarchical:  # The layer is assigned in the referenced cell
+                cell = self.layered_cell(f"{module_name}_{cmpnt_name}_{chip_name}", cmpnt.cell, chip_name)
+                self.cell_Dict[chip_name].add(gdspy.CellReference(cell))
+            else:
+                self.cell_Dict[chip_name].add(cmpnt.cell)
 
         # Layer by chip name (set layer number)
         for chip_name, cell in self.cell_Dict.items():
+            if hierarchical:
+                self.lib.add(cell)  # Adds the referenced cells
+                continue
             layer_num = toolbox.custom_hash(chip_name)
             self.cell_Dict[chip_name].flatten(single_layer=layer_num, single_datatype=0)
 
         # Create an overall cell, and integrate all chip cells into the total cell center
-        module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
         self.cell = self.lib.new_cell(module_name)
         for chip_name, chip_cell in self.cell_Dict.items():
-            self.cell.add(chip_cell)
+            self.cell.add(gdspy.CellReference(chip_cell) if hierarchical else chip_cell)
         return
     
+    def write_stream(self, stream):
+        """
+        Draws the chip components one at a time and writes their shapes to a GDS stream.
+
+        Input:
+            stream: GdsStream, the GDS file being written.
+
+        Output:
+            None
+        """
+        self.apply_pending_options()
+        module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
+        for cmpnt_name in self.cmpnt_name_list:
+            cmpnt = getattr(self, cmpnt_name)
+            cmpnt.draw_gds()
+            chip_name = cmpnt.name
+            shapes = toolbox.flatten_shapes(cmpnt.cell, toolbox.custom_hash(chip_name), 0)
+            stream.add_shapes(chip_name, shapes, f"{module_name}_{cmpnt_name}_{chip_name}")
+        return
+
     def change_size_from_Flipichip_routing(self, chip_name, qubits_ops, rdls_ops):
         """
         Adjust chip size based on Flipchip routing.
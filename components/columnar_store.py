@@ -0,0 +1,407 @@
+##############################################################
+# Struct-of-arrays storage for large component collections
+##############################################################
+
+from base import options_tree
+import numpy as np
+
+# Kinds of stored values
+MISSING, POOLED, POINT, POINT_LIST = 0, 1, 2, 3
+
+# Parameters holding coordinates, stored as NumPy arrays instead of Python objects
+POINT_KEYS = ("gds_pos", "topo_pos", "pos", "start_pos", "end_pos",
+              "readout_pins", "control_pins", "coupling_pins", "outline")
+
+
+class ColumnarStore():
+    """
+    Stores the parameters of many components column by column.
+
+    Coordinates (positions, pins, outlines) are kept in NumPy arrays. All other parameter values are kept once in a
+    shared pool and each component only stores the index of its value, so identical geometric parameters
+    (e.g. the same `cpw_width` of every Transmon) cost a single object for the whole collection.
+    Rows are read back as frozen OptionsTree objects, identical to the options of the original components.
+    """
+
+    def __init__(self, point_keys=POINT_KEYS):
+        """
+        Initializes an empty store.
+
+        Input:
+            point_keys: tuple of str, the parameter names stored as coordinate arrays.
+
+        Output:
+            None
+        """
+        self.point_keys = set(point_keys)
+        self.slots = {}  # Component name -> row index
+        self.free_slots = []
+        self.capacity = 0
+        self.columns = {}  # Parameter name -> _Column
+        self.pool = []  # Shared parameter values
+        self.pool_index = {}
+        self.pool_refs = []  # Number of stored values referring to each pool entry
+        self.pool_dead = 0  # Number of pool entries no stored value refers to
+        self.layouts = []  # Shared tuples of parameter names (the key order of each row)
+        self.layout_index = {}
+        self.row_layout = np.zeros(0, dtype=np.int32)
+        return
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, name):
+        return name in self.slots
+
+    def names(self):
+        """
+        Returns the names of the stored components.
+
+        Input:
+            None
+
+        Output:
+            names: list of str.
+        """
+        return list(self.slots.keys())
+
+    def set_row(self, name, options):
+        """
+        Stores (or replaces) the parameters of a component.
+
+        Input:
+            name: str, the component name.
+            options: dict, the component parameters.
+
+        Output:
+            None
+        """
+        slot = self.slots.get(name)
+        keys = tuple(options.keys())
+        if slot is None:
+            slot = self._new_slot()
+            self.slots[name] = slot
+        else:
+            for key in set(self.layouts[self.row_layout[slot]]).difference(keys):
+                self.columns[key].clear_slot(slot, self)  # Release the values of dropped parameters
+        self.row_layout[slot] = self._intern(self.layouts, self.layout_index, keys, keys)
+        for key, value in options_tree.shared_items(options):
+            self._column(key).set(slot, value, key in self.point_keys, self)
+        self._compact_if_mostly_dead()
+        return
+
+    def get_row(self, name):
+        """
+        Reads the parameters of a component.
+
+        Input:
+            name: str, the component name.
+
+        Output:
+            options: OptionsTree, a frozen tree of the component parameters.
+        """
+        slot = self.slots[name]
+        keys = self.layouts[self.row_layout[slot]]
+        return options_tree.freeze({key: self.columns[key].get(slot, self) for key in keys})
+
+    def remove_row(self, name):
+        """
+        Removes a component.
+
+        Input:
+            name: str, the component name.
+
+        Output:
+            None
+        """
+        slot = self.slots.pop(name)
+        for column in self.columns.values():
+            column.clear_slot(slot, self)
+        self.free_slots.append(slot)
+        self._compact_if_mostly_dead()
+        return
+
+    def clear(self):
+        """
+        Removes all components and the shared value pool.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        self.__init__(point_keys=tuple(self.point_keys))
+        return
+
+    def compact(self):
+        """
+        Rebuilds the store so that pool values and rows of deleted or replaced components are released.
+
+        Note:
+            Called by `set_row` and `remove_row` once most pool entries are no longer used.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        rows = [(name, self.get_row(name)) for name in self.slots.keys()]
+        self.clear()
+        for name, options in rows:
+            self.set_row(name, options)
+        return
+
+    def points(self, key, names=None):
+        """
+        Returns a coordinate parameter of several components as one array.
+
+        Input:
+            key: str, a parameter holding a single point (e.g. "gds_pos").
+            names: list of str, the components to read (default all stored components).
+
+        Output:
+            points: np.ndarray of shape (n, 2), NaN for components without a point value.
+        """
+        if names is None:
+            names = self.slots.keys()
+        slots = np.fromiter((self.slots[name] for name in names), dtype=np.int64)
+        column = self.columns.get(key)
+        if column is None or column.xy is None:
+            return np.full((len(slots), 2), np.nan)
+        points = column.xy[slots].copy()
+        points[column.kind[slots] != POINT] = np.nan
+        return points
+
+    def _new_slot(self):
+        if self.free_slots:
+            return self.free_slots.pop()
+        slot = len(self.slots)
+        if slot >= self.capacity:
+            self.capacity = max(16, self.capacity * 2)
+            self.row_layout = _grow(self.row_layout, self.capacity)
+            for column in self.columns.values():
+                column.grow(self.capacity)
+        return slot
+
+    def _column(self, key):
+        column = self.columns.get(key)
+        if column is None:
+            column = _Column(self.capacity)
+            self.columns[key] = column
+        return column
+
+    def _compact_if_mostly_dead(self):
+        # Also bounded by the number of rows, so that the rebuilds cost O(1) per replaced value on average
+        if self.pool_dead > max(1024, len(self.pool) - self.pool_dead, len(self.slots)):
+            self.compact()
+        return
+
+    def _intern(self, pool, index, key, value):
+        i = index.get(key)
+        if i is None:
+            i = len(pool)
+            pool.append(value)
+            index[key] = i
+        return i
+
+    def intern_value(self, value):
+        """
+        Returns the pool index of a parameter value, shared by the equal values of other components.
+
+        Note:
+            Only values made of dictionaries, lists, tuples and scalars are shared, keyed by their content hash (see
+            `options_tree.content_hash`, which tells 1 from 1.0 and lists from tuples). Other values (NumPy arrays,
+            arbitrary objects) get their own entry: their repr can be truncated or the same for different values.
+
+        Input:
+            value: any type, the parameter value.
+
+        Output:
+            index: int, the index of the value in `pool`.
+        """
+        value = options_tree.freeze(value)
+        if _is_plain(value):
+            index = self._intern(self.pool, self.pool_index, options_tree.content_hash(value), value)
+        else:
+            self.pool.append(value)
+            index = len(self.pool) - 1
+        if index == len(self.pool_refs):
+            self.pool_refs.append(0)
+        elif self.pool_refs[index] == 0:
+            self.pool_dead -= 1
+        self.pool_refs[index] += 1
+        return index
+
+    def release_value(self, index):
+        """
+        Drops one reference to a pool entry, returned by `intern_value`.
+
+        Input:
+            index: int, the index of the value in `pool`.
+
+        Output:
+            None
+        """
+        self.pool_refs[index] -= 1
+        if self.pool_refs[index] == 0:
+            self.pool_dead += 1
+        return
+
+
+class _Column():
+    """
+    One parameter of all rows: a kind code per row plus the pool index or the coordinates of the value.
+    """
+
+    def __init__(self, capacity):
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.ref = np.zeros(capacity, dtype=np.int32)
+        self.xy = None  # float64 (capacity, 2), single points
+        self.xy_int = None  # bool (capacity, 2), coordinates that were integers
+        self.xy_list = np.zeros(capacity, dtype=bool)  # points (or points of point lists) stored as lists, not tuples
+        self.seq_start = None  # int64 (capacity,), first point of each point list in `seq_xy`
+        self.seq_len = None  # int32 (capacity,), number of points of each point list
+        self.seq_xy = None  # float64 (size, 2), the points of all point lists, one after the other
+        self.seq_int = None  # bool (size, 2)
+        self.seq_used = 0  # Number of rows of `seq_xy` in use, including replaced point lists
+        self.seq_live = 0  # Number of rows of `seq_xy` belonging to stored point lists
+        return
+
+    def grow(self, capacity):
+        self.kind = _grow(self.kind, capacity)
+        self.ref = _grow(self.ref, capacity)
+        self.xy_list = _grow(self.xy_list, capacity)
+        if self.xy is not None:
+            self.xy = _grow(self.xy, capacity)
+            self.xy_int = _grow(self.xy_int, capacity)
+        if self.seq_start is not None:
+            self.seq_start = _grow(self.seq_start, capacity)
+            self.seq_len = _grow(self.seq_len, capacity)
+        return
+
+    def clear_slot(self, slot, store):
+        if self.kind[slot] == POOLED:
+            store.release_value(int(self.ref[slot]))
+        elif self.kind[slot] == POINT_LIST:
+            self.seq_live -= int(self.seq_len[slot])
+        self.kind[slot] = MISSING
+        return
+
+    def set(self, slot, value, is_point_key, store):
+        self.clear_slot(slot, store)
+        if is_point_key:
+            point = _encode_point(value)
+            if point is not None:
+                if self.xy is None:
+                    capacity = len(self.kind)
+                    self.xy = np.zeros((capacity, 2))
+                    self.xy_int = np.zeros((capacity, 2), dtype=bool)
+                self.xy[slot], self.xy_int[slot], self.xy_list[slot] = point
+                self.kind[slot] = POINT
+                return
+            point_list = _encode_point_list(value)
+            if point_list is not None:
+                self._set_point_list(slot, *point_list)
+                self.kind[slot] = POINT_LIST
+                return
+        self.ref[slot] = store.intern_value(value)
+        self.kind[slot] = POOLED
+        return
+
+    def _set_point_list(self, slot, data, ints, inner_list):
+        if self.seq_start is None:
+            capacity = len(self.kind)
+            self.seq_start = np.zeros(capacity, dtype=np.int64)
+            self.seq_len = np.zeros(capacity, dtype=np.int32)
+            self.seq_xy = np.zeros((64, 2))
+            self.seq_int = np.zeros((64, 2), dtype=bool)
+        if self.seq_used - self.seq_live > max(1024, self.seq_live):
+            self._compact_points()  # Mostly replaced point lists, drop them
+        start, end = self.seq_used, self.seq_used + len(data)
+        if end > len(self.seq_xy):
+            size = max(end, 2 * len(self.seq_xy))
+            self.seq_xy = _grow(self.seq_xy, size)
+            self.seq_int = _grow(self.seq_int, size)
+        if data:
+            self.seq_xy[start:end] = data
+            self.seq_int[start:end] = ints
+        self.seq_start[slot], self.seq_len[slot] = start, len(data)
+        self.xy_list[slot] = inner_list
+        self.seq_used = end
+        self.seq_live += len(data)
+        return
+
+    def _compact_points(self):
+        slots = np.flatnonzero(self.kind == POINT_LIST)
+        parts = [np.arange(self.seq_start[i], self.seq_start[i] + self.seq_len[i]) for i in slots]
+        rows = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+        self.seq_xy = self.seq_xy[rows].copy()
+        self.seq_int = self.seq_int[rows].copy()
+        self.seq_start[slots] = np.cumsum(self.seq_len[slots]) - self.seq_len[slots]
+        self.seq_used = self.seq_live = len(rows)
+        return
+
+    def get(self, slot, store):
+        kind = self.kind[slot]
+        if kind == POOLED:
+            return store.pool[self.ref[slot]]
+        if kind == POINT:
+            return _decode_point(self.xy[slot], self.xy_int[slot], self.xy_list[slot])
+        if kind == POINT_LIST:
+            start, end = self.seq_start[slot], self.seq_start[slot] + self.seq_len[slot]
+            inner_list = self.xy_list[slot]
+            data, ints = self.seq_xy[start:end].tolist(), self.seq_int[start:end].tolist()
+            return options_tree.FrozenList(_decode_point(data[i], ints[i], inner_list) for i in range(len(data)))
+        raise KeyError(slot)
+
+
+def _grow(array, capacity):
+    new_array = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    new_array[:len(array)] = array
+    return new_array
+
+
+def _is_plain(value):
+    if type(value) in _SCALAR_TYPES:
+        return True
+    if isinstance(value, dict):
+        return all(type(k) in _SCALAR_TYPES and _is_plain(v) for k, v in dict.items(value))
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(item) for item in value)
+    return False
+
+
+_SCALAR_TYPES = (str, int, float, bool, complex, type(None))
+
+
+def _is_coord(x):
+    return (type(x) is float or type(x) is int) and abs(x) < 2 ** 53
+
+
+def _encode_point(value):
+    if type(value) not in (tuple, list, options_tree.FrozenList) or len(value) != 2:
+        return None
+    if not (_is_coord(value[0]) and _is_coord(value[1])):
+        return None
+    return (float(value[0]), float(value[1])), (type(value[0]) is int, type(value[1]) is int), type(value) is not tuple
+
+
+def _encode_point_list(value):
+    if type(value) not in (list, options_tree.FrozenList):
+        return None
+    points = [_encode_point(point) for point in value]
+    if any(point is None for point in points):
+        return None
+    inner_list = all(point[2] for point in points)
+    if points and not inner_list and any(point[2] for point in points):
+        return None  # Mixed tuples and lists, keep the value as it is
+    return [point[0] for point in points], [point[1] for point in points], inner_list
+
+
+def _decode_point(xy, xy_int, is_list):
+    coords = tuple(int(c) if i else float(c) for c, i in zip(xy, xy_int))
+    if is_list:
+        return options_tree.FrozenList(coords)
+    return coords
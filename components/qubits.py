@@ -26,6 +26,7 @@ class Qubits(CmpntsBase):
         return
     
     def calc_general_ops(self):
+        self.apply_pending_options()
         for cmpnt_name in self.cmpnt_name_list:
             getattr(self, cmpnt_name).calc_general_ops()
         return
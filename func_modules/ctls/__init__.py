@@ -1,6 +1,7 @@
 import os
 import copy
 import toolbox
+from base import pin_index
 
 from func_modules.ctls import gene_ctls_ops
 from func_modules.ctls import primitives
@@ -95,15 +96,13 @@ def find_ctl_name(ctls_ops, qubit_ops):
     Exception:
         ValueError: Throws an exception if no corresponding control line is found.
     """
-    ctls_ops = copy.deepcopy(ctls_ops)
-    qubit_ops = copy.deepcopy(qubit_ops)
- 
     result = None
 
-    for ctl_name, ctl_ops in ctls_ops.items():
-        if ctl_ops.start_pos in qubit_ops.control_pins:
-            result = ctl_name
-            break
+    # The first control line starting at one of the control pins, found through the pin index
+    index = pin_index.index_of(ctls_ops, ("start_pos",))
+    hits = [hit for _, pin in pin_index.iter_points(qubit_ops.control_pins) for hit in index.lookup(pin)]
+    if hits:
+        result = min(hits, key=lambda hit: index.order[hit[0]])[0]
     if result is None:
         raise ValueError(f"Cannot find the control line corresponding to {qubit_ops.name}!")
     return result
\ No newline at end of file
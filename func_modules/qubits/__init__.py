@@ -1,6 +1,7 @@
 import os
 import copy
 import toolbox
+from base import pin_index
 
 from func_modules.qubits import gene_qubits
 from func_modules.qubits import primitives
@@ -285,15 +286,15 @@ def generate_qubits_from_topo(**gene_ops):
     return copy.deepcopy(qubits_ops)
 
 def find_qname_from_ctl_ops(ctl_ops, qubits_ops):
-    for q_name, q_ops in qubits_ops.items():
-        control_pins = copy.deepcopy(q_ops.control_pins)
-        if ctl_ops.start_pos in control_pins:
-            return q_name
+    # Pin index lookup, the index of a frozen qubits_ops is built once and reused
+    q_name = pin_index.index_of(qubits_ops, ("control_pins",)).find(ctl_ops.start_pos)
+    if q_name is not None:
+        return q_name
     raise ValueError(f"No qubit found corresponding to control line {ctl_ops.name}!")
 
 def find_qname_from_rdl_ops(rdl_ops, qubits_ops):
-    for q_name, q_ops in qubits_ops.items():
-        readout_pins = copy.deepcopy(q_ops.readout_pins)
-        if rdl_ops.start_pos in readout_pins:
-            return q_name
+    # Pin index lookup, the index of a frozen qubits_ops is built once and reused
+    q_name = pin_index.index_of(qubits_ops, ("readout_pins",)).find(rdl_ops.start_pos)
+    if q_name is not None:
+        return q_name
     raise ValueError(f"No qubit found corresponding to readout line {rdl_ops.name}!")
\ No newline at end of file
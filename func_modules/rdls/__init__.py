@@ -1,6 +1,7 @@
 import os
 import copy
 import toolbox
+from base import pin_index
 
 from func_modules.rdls import gene_rdls
 from func_modules.rdls import primitives
@@ -12,9 +13,12 @@ def generate_readout_lines(**init_ops):
 def find_rdl_name(rdls_ops, qubit_ops):
     rdl_name_result = None
 
-    for rdl_name, rdl_ops in rdls_ops.items():
-        if rdl_ops.start_pos in qubit_ops.readout_pins:
-            rdl_name_result = rdl_ops.name
+    # The last readout line starting at one of the readout pins, found through the pin index
+    index = pin_index.index_of(rdls_ops, ("start_pos",))
+    hits = [hit for _, pin in pin_index.iter_points(qubit_ops.readout_pins) for hit in index.lookup(pin)]
+    if hits:
+        rdl_name = max(hits, key=lambda hit: index.order[hit[0]])[0]
+        rdl_name_result = rdls_ops[rdl_name].name
 
     if rdl_name_result is None:
         raise ValueError(f"No readout line found corresponding to {qubit_ops.name}!")
@@ -2,7 +2,9 @@ from addict import Dict
 import copy
 from base.branch_base import BranchBase
 from func_modules.topo import primitives
-from func_modules.topo.gene_topo_ops import qasm
+from base.lazy_import import lazy_import
+
+qasm = lazy_import("func_modules.topo.gene_topo_ops.qasm")  # qiskit, seaborn: imported on the first qasm topology
 
 def gene_topo_ops(**gene_ops):
     gto = GeneTopoOps(**gene_ops)
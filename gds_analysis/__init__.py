@@ -1,15 +1,12 @@
 from gds_analysis import read_chip_code
+from base import polygon_sidecar
 
 def read_chip(file_path):
     read_chip_code.read_layout_gds(file_path=file_path)
 
 def read_single_component(filepath: str, location: str):
-    import gdstk
     import os
-    # Load the GDS file
     filename = os.path.basename(filepath)
-    gds_lib = gdstk.read_gds(filepath)
-    cells = gds_lib.cells
 
     # Generate class name from file name
     base_name = os.path.splitext(filename)[0]
@@ -17,10 +14,11 @@ def read_single_component(filepath: str, location: str):
 
     # Create class content
     class_definition = f"""
-import gdspy, copy
+import gdspy, copy, os
 from addict import Dict
 import math as mt
 from base.library_base import LibraryBase
+from base import polygon_sidecar, transform
 
 class {class_name}(LibraryBase):
     default_options = Dict(
@@ -38,20 +36,11 @@ class {class_name}(LibraryBase):
         return
 
     def _add_polygons_to_cell(self):
-        polygon_data = [
-"""
-
-    # Add polygons for each cell
-    for cell in cells:
-        for polygon in cell.polygons:
-            points = polygon.points.tolist()
-            layer = polygon.layer
-            class_definition += f"""
-            ({points}, {layer}),
+        # The polygons are stored in a binary sidecar next to this file, loaded on the first draw
+        polygon_data = polygon_sidecar.load_polygons(os.path.join(os.path.dirname(__file__), "{base_name}.npz"))
 """
 
     class_definition += """
-        ]
 
         for points in polygon_data:
             layer = points[-1]
@@ -76,9 +65,9 @@ class {class_name}(LibraryBase):
         return min_x, min_y, max_x, max_y
 
     def _transform_polygons(self, dx, dy, rotation, center):
-        for polygon in self.cell.polygons:
-            polygon.translate(dx, dy)
-            polygon.rotate(rotation, center=center)
+        # Translate, then rotate the vertices of all the polygons at once
+        affine = transform.matrix(rotation, center) @ transform.matrix(offset=(dx, dy))
+        transform.transform_polygon_sets(self.cell.polygons, affine)
 
     def calc_general_ops(self):
         self.lib = gdspy.GdsLibrary()
@@ -115,7 +104,8 @@ class {class_name}(LibraryBase):
     output_dir = os.path.join("./", location)
     os.makedirs(output_dir, exist_ok=True)
 
-    # Write the class to a file
+    # Write the polygons to a binary sidecar, then the class to a file
+    polygon_sidecar.save_gds_polygons(filepath, os.path.join(output_dir, f"{base_name}.npz"))
     output_filename = os.path.join(output_dir, f"{base_name}.py")
     with open(output_filename, "w") as py_file:
         py_file.write(class_definition)
@@ -124,19 +114,18 @@ class {class_name}(LibraryBase):
 
 def add_component_temporarily(path, components_type):
     import importlib
+    import library
     import toolbox
 
     read_single_component(path, "")
     
-    components_module = importlib.import_module("library.{}".format(components_type))    # Obtain component category modules
     new_component_module_name = toolbox.get_filename(path)    # Obtain the module name of the newly added component
-    components_module.module_name_list.append(new_component_module_name)    # Add a new module name to the component category module
 
-    # Add new component classes as attributes to the component category module
+    # Register the new component class in the component category module (also updates the class registry)
     new_component_class_name = toolbox.convert_to_camel_case(new_component_module_name)    # The class name of the new component
     new_component_module = importlib.import_module(new_component_module_name)    # Modules of new components
     new_component_class = getattr(new_component_module, new_component_class_name)    # Class of new components
-    setattr(components_module, new_component_class_name, new_component_class)    # Add new component classes as attributes to the component category module
+    library.register_component(components_type, new_component_module_name, new_component_class)
 
     # Print prompt information
     print("The new component was added in {} successfully. "
@@ -6,12 +6,9 @@ import os
 import importlib
 #from toolbox import generate_python_class_from_gds
 import math
+from base import polygon_sidecar
 def generate_python_class_from_gds(filepath: str, location: str):
-    import gdstk
-    # Load the GDS file
     filename = os.path.basename(filepath)
-    gds_lib = gdstk.read_gds(filepath)
-    cells = gds_lib.cells
 
     # Generate class name from file name
     base_name = os.path.splitext(filename)[0]
@@ -19,10 +16,11 @@ def generate_python_class_from_gds(filepath: str, location: str):
 
     # Create class content
     class_definition = f"""
-import gdspy, copy
+import gdspy, copy, os
 from addict import Dict
 import math as mt
 from base.library_base import LibraryBase
+from base import polygon_sidecar, transform
 
 class {class_name}(LibraryBase):
     default_options = Dict(
@@ -41,20 +39,11 @@ class {class_name}(LibraryBase):
         return
 
     def _add_polygons_to_cell(self):
-        self.polygon_data = [
-"""
-
-    # Add polygons for each cell
-    for cell in cells:
-        for polygon in cell.polygons:
-            points = polygon.points.tolist()
-            layer = polygon.layer
-            class_definition += f"""
-            ({points}, {layer}),
+        # The polygons are stored in a binary sidecar next to this file, loaded on the first draw
+        self.polygon_data = polygon_sidecar.load_polygons(os.path.join(os.path.dirname(__file__), "{base_name}.npz"))
 """
 
     class_definition += """
-        ]
 
         for points in self.polygon_data:
             layer = points[-1]
@@ -84,9 +73,9 @@ class {class_name}(LibraryBase):
         return min_x, min_y, max_x, max_y
 
     def _transform_polygons(self, dx, dy, rotation, center):
-        for polygon in self.cell.polygons:
-            polygon.translate(dx, dy)
-            polygon.rotate(rotation, center=center)
+        # Translate, then rotate the vertices of all the polygons at once
+        affine = transform.matrix(rotation, center) @ transform.matrix(offset=(dx, dy))
+        transform.transform_polygon_sets(self.cell.polygons, affine)
 
     def calc_general_ops(self):
         self.lib = gdspy.GdsLibrary()
@@ -123,7 +112,8 @@ class {class_name}(LibraryBase):
     output_dir = os.path.join("../library", location)
     os.makedirs(output_dir, exist_ok=True)
 
-    # Write the class to a file
+    # Write the polygons to a binary sidecar, then the class to a file
+    polygon_sidecar.save_gds_polygons(filepath, os.path.join(output_dir, f"{base_name}.npz"))
     output_filename = os.path.join(output_dir, f"{base_name}.py")
     with open(output_filename, "w") as py_file:
         py_file.write(class_definition)
@@ -173,10 +163,11 @@ def read_layout_gds(file_path):
         parts_index = 0#Number of components
         for item in base.polygon_data:
             part_name = f'part_{parts_index}'
-            globals()[part_name] = item[0]
-            if(is_rectangle(item[0])):
+            points = item[0].tolist()    # The sidecar polygons are arrays, the part classes embed lists
+            globals()[part_name] = points
+            if(is_rectangle(points)):
                 continue
-            generate_python_class_from_layout(item[0],librarypath, part_name)
+            generate_python_class_from_layout(points,librarypath, part_name)
             parts_index += 1
 
     files = [f for f in os.listdir(librarypath) if f.startswith("part_") and f.endswith(".py")]
@@ -312,6 +303,7 @@ import gdspy, copy
 from addict import Dict
 import math as mt
 from base.library_base import LibraryBase
+from base import transform
 
 class {class_name}(LibraryBase):
     default_options = Dict(
@@ -361,9 +353,9 @@ class {class_name}(LibraryBase):
         return min_x, min_y, max_x, max_y
 
     def _transform_polygons(self, dx, dy, rotation, center):
-        for polygon in self.cell.polygons:
-            polygon.translate(dx, dy)
-            polygon.rotate(rotation, center=center)
+        # Translate, then rotate the vertices of all the polygons at once
+        affine = transform.matrix(rotation, center) @ transform.matrix(offset=(dx, dy))
+        transform.transform_polygon_sets(self.cell.polygons, affine)
 
     def calc_general_ops(self):
         self.lib = gdspy.GdsLibrary()
@@ -9,4 +9,79 @@ from library import others
 from library import pins
 from library import qubits
 from library import readout_lines
-from library import transmission_lines
\ No newline at end of file
+from library import transmission_lines
+import toolbox
+
+# Component class registry: collection class name -> (module names, {class name: class})
+_class_registry = {}
+
+
+def component_classes(cmpnts_class_name, refresh: bool = False):
+    """
+    Returns the component classes of a library category, resolved once and cached.
+
+    Note:
+        The cache is rebuilt automatically when the names of the category's `module_name_list` change
+        (e.g. after `register_component` or `gds_analysis.add_component_temporarily`); `get_component_class` also
+        picks up a class replaced directly on the category module.
+
+    Input:
+        cmpnts_class_name: str, the name of the component collection class (e.g. "Qubits").
+        refresh: bool, whether to force a rebuild of the cache (default False).
+
+    Output:
+        classes: dict, mapping component type names to library classes.
+    """
+    category = globals()[toolbox.convert_to_snake_case(cmpnts_class_name)]
+    module_names = tuple(category.module_name_list)
+    entry = _class_registry.get(cmpnts_class_name)
+    if entry is not None and not refresh and entry[0] == module_names:
+        return entry[1]
+    classes = {}
+    for module_name in module_names:
+        class_name = toolbox.convert_to_camel_case(module_name)
+        if hasattr(category, class_name):
+            classes[class_name] = getattr(category, class_name)
+    _class_registry[cmpnts_class_name] = (module_names, classes)
+    return classes
+
+
+def get_component_class(cmpnts_class_name, cmpnt_type):
+    """
+    Looks up the library class of a component type in O(1).
+
+    Input:
+        cmpnts_class_name: str, the name of the component collection class (e.g. "Qubits").
+        cmpnt_type: str, the component type (e.g. "Transmon").
+
+    Output:
+        cmpnt_class: class, or None if the type is not defined in the library.
+    """
+    if not isinstance(cmpnt_type, str):
+        return None
+    cmpnt_class = component_classes(cmpnts_class_name).get(cmpnt_type)
+    category = globals()[toolbox.convert_to_snake_case(cmpnts_class_name)]
+    if cmpnt_class is None or getattr(category, cmpnt_type, None) is not cmpnt_class:
+        # The class may have been attached to (or replaced on) the category after its module name was registered
+        cmpnt_class = component_classes(cmpnts_class_name, refresh=True).get(cmpnt_type)
+    return cmpnt_class
+
+
+def register_component(components_type, module_name, cmpnt_class):
+    """
+    Adds a component class to a library category at runtime and updates the class registry.
+
+    Input:
+        components_type: str, the library category (e.g. "qubits").
+        module_name: str, the snake_case module name of the new component.
+        cmpnt_class: class, the new component class.
+
+    Output:
+        None
+    """
+    category = globals()[components_type]
+    if module_name not in category.module_name_list:
+        category.module_name_list.append(module_name)
+    setattr(category, toolbox.convert_to_camel_case(module_name), cmpnt_class)
+    component_classes(toolbox.convert_to_camel_case(components_type), refresh=True)
+    return
@@ -5,6 +5,7 @@
 import gdspy
 import math
 from base.library_base import LibraryBase
+from base import cpw
 from addict import Dict
 
 class ChargeLine(LibraryBase):
@@ -64,20 +65,15 @@ class ChargeLine(LibraryBase):
         gdspy.library.use_current_library = False
         corner_radius = self.corner_radius
 
-        self.cell_extract = self.lib.new_cell(self.name + "_extract")
-        self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
+        # Shorten the conductor by the pad height (on a local copy, so repeated drawing does not modify the options)
+        pos = list(self.pos)
+        d = math.sqrt((pos[-1][1] - pos[-2][1])**2 + (pos[-1][0] - pos[-2][0])**2)
+        pos[-1] = (pos[-1][0] - (self.pad_height / d) * (pos[-1][0] - pos[-2][0]), pos[-1][1] - (self.pad_height / d) * (pos[-1][1] - pos[-2][1]))
 
-        control_L_out = gdspy.FlexPath(self.pos, self.width + self.gap * 2, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        self.cell_extract.add(control_L_out)
-
-        d = math.sqrt((self.pos[-1][1] - self.pos[-2][1])**2 + (self.pos[-1][0] - self.pos[-2][0])**2)
-        self.pos[-1] = (self.pos[-1][0] - (self.pad_height / d) * (self.pos[-1][0] - self.pos[-2][0]), self.pos[-1][1] - (self.pad_height / d) * (self.pos[-1][1] - self.pos[-2][1]))
-
-        control_L_inner = gdspy.FlexPath(self.pos, self.width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        self.cell_subtract.add(control_L_inner)
-
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        # Gaps along the conductor, then the full width of the line over the pad height
+        polygons = cpw.polyline(pos, corner_radius).gap_polygons(self.width, self.gap)
+        polygons.extend(cpw.polyline([pos[-1], self.pos[-1]]).strip_polygons(self.width + self.gap * 2))
         self.cell = self.lib.new_cell(self.name + "_cell")
-        self.cell.add(pad)
+        self.cell.add(gdspy.PolygonSet(polygons))
 
         return
\ No newline at end of file
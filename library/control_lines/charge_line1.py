@@ -5,6 +5,7 @@
 import gdspy
 import math
 from base.library_base import LibraryBase
+from base import fidelity
 from addict import Dict
 
 class ChargeLine1(LibraryBase):
@@ -73,20 +74,20 @@ class ChargeLine1(LibraryBase):
         self.cell_extract = self.lib.new_cell(self.name + "_extract")
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
-        control_L_out = gdspy.FlexPath(self.path, self.width + self.gap * 2, corners="circular bend", bend_radius=corner_radius).to_polygonset()
+        control_L_out = gdspy.FlexPath(self.path, self.width + self.gap * 2, corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
         self.cell_extract.add(control_L_out)
 
         pad_height = self.pad_height
-        pos = self.path
+        pos = list(self.path)  # Shortened below, keep the parameter unchanged
         width = self.width
 
         d = math.sqrt((pos[-1][1] - pos[-2][1])**2 + (pos[-1][0] - pos[-2][0])**2)
         pos[-1] = (pos[-1][0] - (pad_height / d) * (pos[-1][0] - pos[-2][0]), pos[-1][1] - (pad_height / d) * (pos[-1][1] - pos[-2][1]))
 
-        control_L_inner = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
+        control_L_inner = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
         self.cell_subtract.add(control_L_inner)
 
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        pad = self.extract_minus_subtract()
         self.cell = self.lib.new_cell(self.name + "_cell")
         self.cell.add(pad)
 
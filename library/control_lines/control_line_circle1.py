@@ -8,6 +8,7 @@ import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import fidelity
 
 class ControlLineCircle1(LibraryBase):
     """
@@ -72,18 +73,18 @@ class ControlLineCircle1(LibraryBase):
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
         control_L_out = gdspy.FlexPath(pos, self.width + self.gap * 2,
-                                        corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        circle = gdspy.Round(pos[-1], self.radius + self.gap, tolerance=0.01)
+                                        corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
+        circle = gdspy.Round(pos[-1], self.radius + self.gap, tolerance=fidelity.tolerance())
         self.cell_extract.add(control_L_out)
         self.cell_extract.add(circle)
 
         control_L_inner = gdspy.FlexPath(pos, self.width,
-                                         corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        circle = gdspy.Round(pos[-1], self.radius, tolerance=0.01)
+                                         corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
+        circle = gdspy.Round(pos[-1], self.radius, tolerance=fidelity.tolerance())
         self.cell_subtract.add(control_L_inner)
         self.cell_subtract.add(circle)
 
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        pad = self.extract_minus_subtract()
         self.cell = self.lib.new_cell(self.name + "_cell")
         self.cell.add(pad)
 
@@ -10,6 +10,7 @@ from addict import Dict
 from copy import deepcopy
 import toolbox
 from base.library_base import LibraryBase
+from base import fidelity, gds_backend
 
 import math
 
@@ -148,16 +149,16 @@ class ControlLineCircle2408(LibraryBase):
         gdspy.library.use_current_library = False
 
         corner_radius = self.corner_radius
-        pos = deepcopy(self.pos)
+        pos = list(self.pos)  # Extended by add_points
         self.cell_extract = self.lib.new_cell(self.name + "_extract")
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
         pos = add_points(pos)
         control_L_out = gdspy.FlexPath(pos, self.width + self.gap * 2,
-                                       corners="circular bend", bend_radius=corner_radius).to_polygonset()
+                                       corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
 
         control_L_inner = gdspy.FlexPath(pos, self.width,
-                                         corners="circular bend", bend_radius=corner_radius).to_polygonset()
+                                         corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
         (x1, y1), (x2, y2) = calculate_intermediate_points(pos)
         cx = (x1 + x2) / 2
         cy = (y1 + y2) / 2
@@ -178,15 +179,15 @@ class ControlLineCircle2408(LibraryBase):
         point1 = (x1, y1)
         point2 = (x2, y2)
         square = gdspy.Polygon([point1, point4, point2, point3])
-        control_L_out = gdspy.boolean(control_L_out, square, "or")
+        control_L_out = gds_backend.boolean(control_L_out, square, "or")
         self.cell_extract.add(control_L_out)
         # self.cell_extract.add(circle)
 
         self.cell_subtract.add(control_L_inner)
         # self.cell_subtract.add(circle)
 
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
-        # pad = gdspy.boolean(pad, square, "or")
+        pad = self.extract_minus_subtract()
+        # pad = gds_backend.boolean(pad, square, "or")
         self.cell = self.lib.new_cell(self.name + "_cell")
         self.cell.add(pad)
 
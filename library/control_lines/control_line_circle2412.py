@@ -10,6 +10,7 @@ from addict import Dict
 from copy import deepcopy
 import toolbox
 from base.library_base import LibraryBase
+from base import fidelity, gds_backend
 
 import math
 
@@ -150,7 +151,7 @@ class ControlLineCircle2412(LibraryBase):
 
         corner_radius = self.corner_radius
         end_radius = self.end_radius
-        pos = deepcopy(self.pos)
+        pos = list(self.pos)  # Extended by add_points
         self.cell_extract = self.lib.new_cell(self.name + "_extract")
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
@@ -165,19 +166,19 @@ class ControlLineCircle2412(LibraryBase):
 
         # Points before the split form a path, using corner_radius
         control_L_out_part1 = gdspy.FlexPath(pos_1, self.width + self.gap * 2,
-                                             corners="circular bend", bend_radius=corner_radius).to_polygonset()
+                                             corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
         control_L_inner_part1 = gdspy.FlexPath(pos_1, self.width,
-                                               corners="circular bend", bend_radius=corner_radius).to_polygonset()
+                                               corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
 
         # The last five points form a path, using end_radius
         control_L_out_part2 = gdspy.FlexPath(pos_2, self.width + self.gap * 2,
-                                             corners="circular bend", bend_radius=end_radius).to_polygonset()
+                                             corners="circular bend", bend_radius=end_radius, tolerance=fidelity.tolerance()).to_polygonset()
         control_L_inner_part2 = gdspy.FlexPath(pos_2, self.width,
-                                               corners="circular bend", bend_radius=end_radius).to_polygonset()
+                                               corners="circular bend", bend_radius=end_radius, tolerance=fidelity.tolerance()).to_polygonset()
 
         # Merge the paths
-        control_L_out = gdspy.boolean(control_L_out_part1, control_L_out_part2, "or")
-        control_L_inner = gdspy.boolean(control_L_inner_part1, control_L_inner_part2, "or")
+        control_L_out = gds_backend.boolean(control_L_out_part1, control_L_out_part2, "or")
+        control_L_inner = gds_backend.boolean(control_L_inner_part1, control_L_inner_part2, "or")
 
         (x1, y1), (x2, y2) = calculate_intermediate_points(pos)
         cx = (x1 + x2) / 2
@@ -198,15 +199,15 @@ class ControlLineCircle2412(LibraryBase):
         point1 = (x1, y1)
         point2 = (x2, y2)
         square = gdspy.Polygon([point1, point4, point2, point3])
-        control_L_out = gdspy.boolean(control_L_out, square, "or")
+        control_L_out = gds_backend.boolean(control_L_out, square, "or")
         self.cell_extract.add(control_L_out)
         # self.cell_extract.add(circle)
 
         self.cell_subtract.add(control_L_inner)
         # self.cell_subtract.add(circle)
 
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
-        # pad = gdspy.boolean(pad, square, "or")
+        pad = self.extract_minus_subtract()
+        # pad = gds_backend.boolean(pad, square, "or")
         self.cell = self.lib.new_cell(self.name + "_cell")
         self.cell.add(pad)
 
@@ -9,6 +9,7 @@ import copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import cpw, gds_backend
 
 
 class ControlLineWidthDiff(LibraryBase):
@@ -79,29 +80,27 @@ class ControlLineWidthDiff(LibraryBase):
         # It can convert user-friendly parameter sets into developer-friendly parameter sets.
 
         ################################ Drawing ##################################
-        control_L_out = gdspy.FlexPath(pos[:-1], width[0] + gap[0] * 2, corners="circular bend",
-                                       bend_radius=corner_radius).to_polygonset()
-        buffer_L_out = gdspy.Path(width[0] + gap[0] * 2, pos[-2])
-        buffer_L_out.segment(buffer_length, direction=np.arctan2(pos[-1][1] - pos[-2][1], pos[-1][0] - pos[-2][0]),
-                             final_width=(width[1] + gap[1] * 2))
-        buffer_L_out.segment(
-            length=(math.sqrt((pos[-1][0] - pos[-2][0]) ** 2 + (pos[-1][1] - pos[-2][1]) ** 2) - buffer_length),
-            direction=np.arctan2(pos[-1][1] - pos[-2][1], pos[-1][0] - pos[-2][0]))
-
-        control_L_out = gdspy.boolean(control_L_out, buffer_L_out, 'or')
-
-        control_L_in = gdspy.FlexPath(pos[:-1], width[0], corners="circular bend",
-                                      bend_radius=corner_radius).to_polygonset()
-        buffer_L_in = gdspy.Path(width[0], pos[-2])
-        buffer_L_in.segment(buffer_length, direction=np.arctan2(pos[-1][1] - pos[-2][1], pos[-1][0] - pos[-2][0]),
-                            final_width=width[1])
-        buffer_L_in.segment(length=(
-                    math.sqrt((pos[-1][0] - pos[-2][0]) ** 2 + (pos[-1][1] - pos[-2][1]) ** 2) - buffer_length - gap[
-                1]), direction=np.arctan2(pos[-1][1] - pos[-2][1], pos[-1][0] - pos[-2][0]))
-
-        control_L_in = gdspy.boolean(control_L_in, buffer_L_in, 'or')
-
-        control_L = gdspy.boolean(control_L_out, control_L_in, 'not')
+        # Gaps along the path up to the buffer, offset from its centerline
+        path = cpw.polyline(pos[:-1], corner_radius)
+        control_L = path.gap_polygons(width[0], gap[0])
+
+        # Buffer along the last segment: taper to the final width, then the line ends with a gap before the last point
+        length = math.sqrt((pos[-1][0] - pos[-2][0]) ** 2 + (pos[-1][1] - pos[-2][1]) ** 2)
+        direction = np.subtract(pos[-1], pos[-2]) / length
+        taper_end = pos[-2] + buffer_length * direction
+        line_end = pos[-2] + (length - gap[1]) * direction
+        buffer = cpw.polyline([taper_end, line_end])
+        control_L.extend(cpw.taper_gap_polygons(pos[-2], taper_end, width[0], gap[0], width[1], gap[1]))
+        control_L.extend(buffer.gap_polygons(width[1], gap[1]))
+        control_L.extend(cpw.polyline([line_end, pos[-1]]).strip_polygons(width[1] + gap[1] * 2))
+
+        if abs(math.cos(path.heading) * direction[1] - math.sin(path.heading) * direction[0]) > 1e-9:
+            # The buffer bends away from the path: the conductor of each part cuts the gaps of the other
+            taper_in = cpw.taper_gap_polygons(pos[-2], taper_end, 0, width[0] / 2, 0, width[1] / 2)
+            conductors = path.strip_polygons(width[0]) + taper_in + buffer.strip_polygons(width[1])
+            control_L = gds_backend.boolean(control_L, conductors, 'not')
+        else:
+            control_L = gdspy.PolygonSet(control_L)
 
         # Add your code
         self.cell.add(control_L)
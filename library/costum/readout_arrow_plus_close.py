@@ -10,6 +10,7 @@ import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import fidelity, gds_backend
 from library.readout_lines.readout_cavity_plus import ReadoutCavityPlus
 
 
@@ -149,7 +150,7 @@ class ReadoutArrowPlusClose(LibraryBase):
 
         # Merge and translate
         start_pos = self.start_pos
-        pattern = gdspy.boolean(arrow_finger.cell, rd.cell, "or")
+        pattern = gds_backend.boolean(arrow_finger.cell, rd.cell, "or")
         pattern.translate(start_pos[0], start_pos[1])
         self.cell.add(pattern)
 
@@ -235,8 +236,8 @@ class ArrowFinger(LibraryBase):
 
         # Draw finger
         finger = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend",
-                                bend_radius=corner_radius).to_polygonset()
-        sub_finger = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
+                                bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
+        sub_finger = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
 
         # Rotate finger
         finger.rotate(math.radians(finger_orientation), (0, 0))
@@ -269,9 +270,9 @@ class ArrowFinger(LibraryBase):
         sub_arrow = gdspy.FlexPath(arrow_pos1, width, corners="natural").to_polygonset()
 
         # Get the total shape
-        arrow_finger = gdspy.boolean(finger, arrow, "or")
-        sub_arrow_finger = gdspy.boolean(sub_finger, sub_arrow, "or")
-        arrow_finger = gdspy.boolean(arrow_finger, sub_arrow_finger, "not")
+        arrow_finger = gds_backend.boolean(finger, arrow, "or")
+        sub_arrow_finger = gds_backend.boolean(sub_finger, sub_arrow, "or")
+        arrow_finger = gds_backend.boolean(arrow_finger, sub_arrow_finger, "not")
 
         # Translate
         arrow_finger.translate(start_pos[0], start_pos[1])
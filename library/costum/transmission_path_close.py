@@ -7,6 +7,7 @@ import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import fidelity
 
 class TransmissionPathClose(LibraryBase):
     """
@@ -72,14 +73,14 @@ class TransmissionPathClose(LibraryBase):
         gdspy.library.use_current_library = False
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
-        transmission_L_inner = gdspy.FlexPath(pos_inner, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
+        transmission_L_inner = gdspy.FlexPath(pos_inner, width, corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
         self.cell_subtract.add(transmission_L_inner)
 
         self.cell_extract = self.lib.new_cell(name + "_extract")
-        control_L_out = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius).to_polygonset()
+        control_L_out = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
         self.cell_extract.add(control_L_out)
 
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        pad = self.extract_minus_subtract()
         self.cell = self.lib.new_cell(name + "_cell")
         self.cell.add(pad)
         return
\ No newline at end of file
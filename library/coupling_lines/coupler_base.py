@@ -10,6 +10,7 @@ import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import gds_backend
 
 
 class CouplerBase(LibraryBase):
@@ -113,30 +114,30 @@ class CouplerBase(LibraryBase):
         upper_rec_in = gdspy.Rectangle(
             (pos[0] - width / 2 + metal_width, pos[1] + upper_height - metal_width + gap / 2),
             (pos[0] + width / 2 - metal_width, pos[1] + gap / 2))
-        upper_rec = gdspy.boolean(upper_rec_out, upper_rec_in, "not")
+        upper_rec = gds_backend.boolean(upper_rec_out, upper_rec_in, "not")
 
         lower_rec_out = gdspy.Rectangle((pos[0] - width / 2, pos[1] - gap / 2),
                                         (pos[0] + width / 2, pos[1] - lower_height - gap / 2))
         lower_rec_in = gdspy.Rectangle((pos[0] - width / 2 + metal_width, pos[1] - gap / 2), (
         pos[0] + width / 2 - metal_width, pos[1] - lower_height + metal_width - gap / 2))
-        lower_rec = gdspy.boolean(lower_rec_out, lower_rec_in, "not")
+        lower_rec = gds_backend.boolean(lower_rec_out, lower_rec_in, "not")
 
-        rec = gdspy.boolean(upper_rec, lower_rec, "or")
+        rec = gds_backend.boolean(upper_rec, lower_rec, "or")
 
         claw1 = gdspy.Rectangle((pos[0] - width / 2 - claw_width, pos[1] + gap / 2 + claw_height),
                                 (pos[0] - width / 2, pos[1] + gap / 2))
         claw2 = gdspy.Rectangle((pos[0] - width / 2 - claw_width, pos[1] - claw_height - gap / 2),
                                 (pos[0] - width / 2, pos[1] - gap / 2))
-        claw_left = gdspy.boolean(claw1, claw2, "or")
+        claw_left = gds_backend.boolean(claw1, claw2, "or")
 
         claw3 = gdspy.Rectangle((pos[0] + width / 2, pos[1] + gap / 2 + claw_height),
                                 (pos[0] + width / 2 + claw_width, pos[1] + gap / 2))
         claw4 = gdspy.Rectangle((pos[0] + width / 2, pos[1] - claw_height - gap / 2),
                                 (pos[0] + width / 2 + claw_width, pos[1] - gap / 2))
-        claw_right = gdspy.boolean(claw3, claw4, "or")
-        claw = gdspy.boolean(claw_left, claw_right, "or")
+        claw_right = gds_backend.boolean(claw3, claw4, "or")
+        claw = gds_backend.boolean(claw_left, claw_right, "or")
 
-        coupler = gdspy.boolean(rec, claw, "or")
+        coupler = gds_backend.boolean(rec, claw, "or")
         coupler.rotate(rotate, center=pos)
 
         self.cell.add(coupler)
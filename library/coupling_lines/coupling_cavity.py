@@ -5,6 +5,7 @@
 
 from addict import Dict
 from base.library_base import LibraryBase
+from base import fidelity
 import toolbox
 import copy, gdspy, math
 import numpy as np
@@ -92,18 +93,18 @@ class CouplingCavity(LibraryBase):
                     num + 1) * math.pi * options.r - (num - 1) * 2 * options.r) / (num))
 
         # Add segments and turns
-        readout_l.turn(options.r, 'l')
+        readout_l.turn(options.r, 'l', tolerance=fidelity.tolerance())
 
         for i in range(num):
             if i != 0:
                 readout_l.segment(options.r, '-x' if i % 2 == 0 else '+x')
             readout_l.segment(segment / 2, '-x' if i % 2 == 0 else '+x')
-            readout_l.turn(options.r, 'll' if i % 2 == 1 else 'rr')
+            readout_l.turn(options.r, 'll' if i % 2 == 1 else 'rr', tolerance=fidelity.tolerance())
             readout_l.segment(segment / 2, '-x' if i % 2 == 1 else '+x')
             if i != num - 1:
                 readout_l.segment(options.r, '-x' if i % 2 == 1 else '+x')
 
-        readout_l.turn(options.r, 'l' if num % 2 == 1 else 'r')
+        readout_l.turn(options.r, 'l' if num % 2 == 1 else 'r', tolerance=fidelity.tolerance())
         readout_l.segment(options.end_straight, '+y')
 
         # Rotate the entire shape based on the calculated angle
@@ -135,18 +136,18 @@ class CouplingCavity(LibraryBase):
                     num + 1) * math.pi * options.r - (num - 1) * 2 * options.r) / (num))
 
         # Add segments and turns
-        readout_l.turn(options.r, 'l')
+        readout_l.turn(options.r, 'l', tolerance=fidelity.tolerance())
 
         for i in range(num):
             if i != 0:
                 readout_l.segment(options.r, '-x' if i % 2 == 0 else '+x')
             readout_l.segment(segment / 2, '-x' if i % 2 == 0 else '+x')
-            readout_l.turn(options.r, 'll' if i % 2 == 1 else 'rr')
+            readout_l.turn(options.r, 'll' if i % 2 == 1 else 'rr', tolerance=fidelity.tolerance())
             readout_l.segment(segment / 2, '-x' if i % 2 == 1 else '+x')
             if i != num - 1:
                 readout_l.segment(options.r, '-x' if i % 2 == 1 else '+x')
 
-        readout_l.turn(options.r, 'l' if num % 2 == 1 else 'r')
+        readout_l.turn(options.r, 'l' if num % 2 == 1 else 'r', tolerance=fidelity.tolerance())
         readout_l.segment(options.end_straight, '+y')
 
         # Rotate the entire shape based on the calculated angle
@@ -155,7 +156,7 @@ class CouplingCavity(LibraryBase):
         self.cell_extract.add(readout_l)
 
         # Temporary use
-        sub_poly = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        sub_poly = self.extract_minus_subtract()
         self.cell = self.lib.new_cell(self.name + "_cell")
         self.cell.add(sub_poly)
 
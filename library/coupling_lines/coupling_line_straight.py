@@ -5,6 +5,7 @@
 
 from addict import Dict
 from base.library_base import LibraryBase
+from base import cpw
 import toolbox
 import copy, gdspy
 import numpy as np
@@ -61,19 +62,9 @@ class CouplingLineStraight(LibraryBase):
         """
         self.lib = gdspy.GdsLibrary()
         gdspy.library.use_current_library = False
-        self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
-        path = gdspy.PolyPath([self.start_pos, self.end_pos], self.width)
+        gaps = cpw.polyline([self.start_pos, self.end_pos]).gap_polygons(self.width, self.gap)
 
-        self.cell_subtract.add(path)
-
-        self.cell_extract = self.lib.new_cell(self.name + "_extract")
-
-        path = gdspy.PolyPath([self.start_pos, self.end_pos], self.width + self.gap*2)
-
-        self.cell_extract.add(path)
-
-        sub_poly = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
         self.cell = self.lib.new_cell(self.name + "_cell")
-        self.cell.add(sub_poly)
+        self.cell.add(gdspy.PolygonSet(gaps))
         return
\ No newline at end of file
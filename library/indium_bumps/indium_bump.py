@@ -8,6 +8,7 @@ import copy
 from addict import Dict
 import math as mt
 from base.library_base import LibraryBase
+from base import fidelity
 
 
 class IndiumBump(LibraryBase):
@@ -54,4 +55,4 @@ class IndiumBump(LibraryBase):
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         # Add the circle to the cell
-        self.cell.add(gdspy.Round(center=center_pos, radius=radius))
\ No newline at end of file
+        self.cell.add(gdspy.Round(center=center_pos, radius=radius, tolerance=fidelity.tolerance()))
\ No newline at end of file
@@ -8,6 +8,7 @@ import gdspy, copy
 from addict import Dict
 import math as mt
 from base.library_base import LibraryBase
+from base import fidelity, gds_backend
 
 
 class Arrow(LibraryBase):
@@ -62,8 +63,8 @@ class Arrow(LibraryBase):
         bottom_outer_rec = gdspy.Rectangle(start_pos, outer_bottom_rec_right)
         bottom_inner_rec = gdspy.Rectangle(inner_bottom_rec_left, inner_bottom_rec_right)
 
-        inner_rec = gdspy.boolean(left_inner_rec, bottom_inner_rec, 'or')
-        outer_rec = gdspy.boolean(left_outer_rec, bottom_outer_rec, 'or')
+        inner_rec = gds_backend.boolean(left_inner_rec, bottom_inner_rec, 'or')
+        outer_rec = gds_backend.boolean(left_outer_rec, bottom_outer_rec, 'or')
 
         inner_points = [
             (start_pos[0] + gap + width - inclined_gap * mt.cos(mt.pi / 180 * 45) / 2,
@@ -95,16 +96,16 @@ class Arrow(LibraryBase):
 
         outer_inclined_rec = gdspy.Polygon(outer_points)
 
-        inner_rec = gdspy.boolean(inner_rec, inner_inclined_rec, 'or')
-        outer_rec = gdspy.boolean(outer_rec, outer_inclined_rec, 'or')
-        rec = gdspy.boolean(outer_rec, inner_rec, 'not')
+        inner_rec = gds_backend.boolean(inner_rec, inner_inclined_rec, 'or')
+        outer_rec = gds_backend.boolean(outer_rec, outer_inclined_rec, 'or')
+        rec = gds_backend.boolean(outer_rec, inner_rec, 'not')
 
         path = gdspy.Path(width, (start_pos[0] + gap + width + l1 * mt.cos(mt.pi / 180 * 45),
                                   start_pos[1] + gap + width + l1 * mt.sin(mt.pi / 180 * 45)), 2, gap + width)
         path.segment(0, mt.pi / 180 * (45))
-        path.turn(50, mt.pi / 180 * 45)
+        path.turn(50, mt.pi / 180 * 45, tolerance=fidelity.tolerance())
 
-        rec = gdspy.boolean(rec, path, 'or')
+        rec = gds_backend.boolean(rec, path, 'or')
 
         self.end_pos = (
             start_pos[0] + gap + width + l1 * mt.cos(mt.pi / 180 * 45) + 50 - 50 * mt.cos(45 / 180 * mt.pi),
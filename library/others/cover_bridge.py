@@ -3,6 +3,7 @@ import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import fidelity
 
 # We still need to add a coverage bridge for straight line segments now, then improve the algorithm for adding coverage bridges
 # Let's do it next week. This week is too tiring
@@ -204,20 +205,20 @@ class CoverBridge(LibraryBase):
 
             # Camber line
             if self.direction == 1:
-                path2.turn(self.bg_inner_r, self.corner_radius, layer=2)
+                path2.turn(self.bg_inner_r, self.corner_radius, layer=2, tolerance=fidelity.tolerance())
 
                 # Outer arc
-                path.turn(self.width/2 + self.bg_inner_r + self.bg_width/2, self.corner_radius, layer=2)
+                path.turn(self.width/2 + self.bg_inner_r + self.bg_width/2, self.corner_radius, layer=2, tolerance=fidelity.tolerance())
                 # Inner arc
-                path1.turn(-self.width/2 + self.bg_inner_r - self.bg_width/2, self.corner_radius, layer=2)
+                path1.turn(-self.width/2 + self.bg_inner_r - self.bg_width/2, self.corner_radius, layer=2, tolerance=fidelity.tolerance())
 
             elif self.direction == 0:
-                path2.turn(self.bg_inner_r, -self.corner_radius, layer=2)
+                path2.turn(self.bg_inner_r, -self.corner_radius, layer=2, tolerance=fidelity.tolerance())
 
                 # Outer arc
-                path.turn(self.width/2 + self.bg_inner_r + self.bg_width/2, -self.corner_radius, layer=2)
+                path.turn(self.width/2 + self.bg_inner_r + self.bg_width/2, -self.corner_radius, layer=2, tolerance=fidelity.tolerance())
                 # Inner arc
-                path1.turn(-self.width/2 + self.bg_inner_r - self.bg_width/2, -self.corner_radius, layer=2)
+                path1.turn(-self.width/2 + self.bg_inner_r - self.bg_width/2, -self.corner_radius, layer=2, tolerance=fidelity.tolerance())
 
         self.cell.add(path)
         self.cell.add(path1)
@@ -10,6 +10,7 @@ import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import fidelity, gds_backend
 
 
 class Finger(LibraryBase):
@@ -72,9 +73,9 @@ class Finger(LibraryBase):
 
         # Drawing
         finger = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend",
-                                bend_radius=corner_radius).to_polygonset()
-        sub_finger = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        finger = gdspy.boolean(finger, sub_finger, "not")
+                                bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
+        sub_finger = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
+        finger = gds_backend.boolean(finger, sub_finger, "not")
 
         # Translate and rotate
         finger.rotate(math.radians(orientation), (0, 0))
@@ -7,6 +7,7 @@ import gdspy, copy
 from addict import Dict
 import math as mt
 from base.library_base import LibraryBase
+from base import fidelity
 
 
 class IndiumBump(LibraryBase):
@@ -52,4 +53,4 @@ class IndiumBump(LibraryBase):
         gdspy.library.use_current_library = False
         self.cell = self.lib.new_cell(self.name + "_cell")
 
-        self.cell.add(gdspy.Round(center=center_pos, radius=radius))
\ No newline at end of file
+        self.cell.add(gdspy.Round(center=center_pos, radius=radius, tolerance=fidelity.tolerance()))
\ No newline at end of file
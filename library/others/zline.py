@@ -7,6 +7,7 @@ import gdspy, copy
 from addict import Dict
 import math
 from base.library_base import LibraryBase
+from base import gds_backend
 
 
 class Zline(LibraryBase):
@@ -72,7 +73,7 @@ class Zline(LibraryBase):
             [gap / 2 + pos[0], pos[1]]
         )
 
-        rect_large = gdspy.boolean(rect1, rect2, 'or')
+        rect_large = gds_backend.boolean(rect1, rect2, 'or')
 
         rect3 = gdspy.Rectangle(
             [-(gap / 2 + length1) + pos[0], length + pos[1]],
@@ -84,8 +85,8 @@ class Zline(LibraryBase):
             [-gap / 2 + pos[0], length + width + pos[1]]
         )
 
-        rect_little = gdspy.boolean(rect3, rect4, 'or')
-        rect = gdspy.boolean(rect_large, rect_little, 'or')
+        rect_little = gds_backend.boolean(rect3, rect4, 'or')
+        rect = gds_backend.boolean(rect_large, rect_little, 'or')
 
         rect.rotate(math.pi * orientation / 180, pos)
 
@@ -7,6 +7,7 @@ import gdspy, copy
 from addict import Dict
 import math
 from base.library_base import LibraryBase
+from base import gds_backend
 
 
 class ZlineFlipchip(LibraryBase):
@@ -138,7 +139,7 @@ class ZlineFlipchip(LibraryBase):
 
         poly_outer = gdspy.Polygon(modify_points_outer)
 
-        poly = gdspy.boolean(poly_inner, poly_outer, 'or')
+        poly = gds_backend.boolean(poly_inner, poly_outer, 'or')
 
         poly.rotate(math.pi * orientation / 180, pad_pos)
 
@@ -95,7 +95,7 @@ class LaunchPad(LibraryBase):
         path.rotate(math.radians(orientation), pos)
         self.cell_extract.add(path)
 
-        sub_ploy = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        sub_ploy = self.extract_minus_subtract()
         self.cell = self.lib.new_cell(name + "_cell")
         self.cell.add(sub_ploy)
         return
\ No newline at end of file
@@ -6,6 +6,7 @@
 
 from addict import Dict
 from base.library_base import LibraryBase
+from base import fidelity, gds_backend
 import toolbox
 import copy
 import gdspy
@@ -43,6 +44,9 @@ class Circlemon(LibraryBase):
         readout_width = 6  # Readout line width
     )
 
+    derived_options = ("readout_pins", "control_pins", "coupling_pins", "outline")  # Computed lazily by calc_general_ops
+    instance_position = "gds_pos"  # Drawn once per distinct shape, see LibraryBase.draw_instance
+
     def __init__(self, options):
         """
         Initialize the Circlemon class.
@@ -131,35 +135,35 @@ class Circlemon(LibraryBase):
         self.cell = self.lib.new_cell(self.name)
 
         # Create circles and arcs
-        circle1 = gdspy.Round((gds_pos[0], gds_pos[1]), circle1_rad, tolerance=0.01)
-        circle2 = gdspy.Round((gds_pos[0], gds_pos[1]), circle2_rad, tolerance=0.01)
-        circle3 = gdspy.Round((gds_pos[0], gds_pos[1]), circle3_rad, tolerance=0.01)
-        circle6 = gdspy.Round((gds_pos[0], gds_pos[1]), circle6_rad, tolerance=0.01)
+        circle1 = gdspy.Round((gds_pos[0], gds_pos[1]), circle1_rad, tolerance=fidelity.tolerance())
+        circle2 = gdspy.Round((gds_pos[0], gds_pos[1]), circle2_rad, tolerance=fidelity.tolerance())
+        circle3 = gdspy.Round((gds_pos[0], gds_pos[1]), circle3_rad, tolerance=fidelity.tolerance())
+        circle6 = gdspy.Round((gds_pos[0], gds_pos[1]), circle6_rad, tolerance=fidelity.tolerance())
         circle_arc = gdspy.Round((gds_pos[0], gds_pos[1]), circle5_rad,
                                  inner_radius=circle4_rad,
                                  initial_angle=np.pi / 180 * initial_angle,
                                  final_angle=np.pi / 180 * final_angle,
-                                 tolerance=0.01)
+                                 tolerance=fidelity.tolerance())
 
         # Create readout line and finger structures
         readout_line = gdspy.Rectangle(left_readout_line, right_readout_line)
-        circle_arc = gdspy.boolean(circle_arc, readout_line, 'or').rotate(np.pi / 180 * pad_orientation, center=(gds_pos[0], gds_pos[1]))
+        circle_arc = gds_backend.boolean(circle_arc, readout_line, 'or').rotate(np.pi / 180 * pad_orientation, center=(gds_pos[0], gds_pos[1]))
         
         inner_finger = gdspy.Rectangle(left_inner_finger, right_inner_finger)
         inner_finger_pad = gdspy.Rectangle(left_inner_finger_pad, right_inner_finger_pad)
-        inner_finger = gdspy.boolean(inner_finger, inner_finger_pad, 'or').rotate(np.pi / 180 * finger_orientation, center=(gds_pos[0], gds_pos[1]))
+        inner_finger = gds_backend.boolean(inner_finger, inner_finger_pad, 'or').rotate(np.pi / 180 * finger_orientation, center=(gds_pos[0], gds_pos[1]))
         
         outer_finger = gdspy.Rectangle(left_outer_finger, right_outer_finger)
         outer_finger_pad = gdspy.Rectangle(left_outer_finger_pad, right_outer_finger_pad)
-        outer_finger = gdspy.boolean(outer_finger, outer_finger_pad, 'or').rotate(np.pi / 180 * finger_orientation, center=(gds_pos[0], gds_pos[1]))
+        outer_finger = gds_backend.boolean(outer_finger, outer_finger_pad, 'or').rotate(np.pi / 180 * finger_orientation, center=(gds_pos[0], gds_pos[1]))
 
         # Generate final shape
-        circle_in = gdspy.boolean(circle2, circle1, 'not')
-        circle_out = gdspy.boolean(circle6, circle3, 'not')
-        circle_out = gdspy.boolean(circle_out, circle_arc, 'not')
-        circle = gdspy.boolean(circle_in, circle_out, 'or')
-        circle = gdspy.boolean(circle, outer_finger, 'or')
-        circle = gdspy.boolean(circle, inner_finger, 'not')
+        circle_in = gds_backend.boolean(circle2, circle1, 'not')
+        circle_out = gds_backend.boolean(circle6, circle3, 'not')
+        circle_out = gds_backend.boolean(circle_out, circle_arc, 'not')
+        circle = gds_backend.boolean(circle_in, circle_out, 'or')
+        circle = gds_backend.boolean(circle, outer_finger, 'or')
+        circle = gds_backend.boolean(circle, inner_finger, 'not')
         
         self.cell.add(circle)  # Add shape to the cell
 
@@ -36,6 +36,9 @@ class Transmon(LibraryBase):
         subtract_height = 600
     )
 
+    derived_options = ("readout_pins", "control_pins", "coupling_pins", "outline")  # Computed lazily by calc_general_ops
+    instance_position = "gds_pos"  # Drawn once per distinct shape, see LibraryBase.draw_instance
+
     def __init__(self, options):
         """
         Initializes the Transmon class.
@@ -210,7 +213,7 @@ class Transmon(LibraryBase):
         
         self.cell_extract.add(subtract_square)
 
-        sub_poly = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        sub_poly = self.extract_minus_subtract()
 
         self.cell = self.lib.new_cell(self.name + "_cell")
         self.cell.add(sub_poly)
@@ -8,6 +8,7 @@ import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import gds_backend
 
 class TransmonBenzheng(LibraryBase):
     default_options = Dict(
@@ -32,6 +33,8 @@ class TransmonBenzheng(LibraryBase):
         coupling_pins = [],
         readout_pins = []
     )
+
+    derived_options = ("readout_pins", "coupling_pins")  # Computed lazily by calc_general_ops
     
     def __init__(self, options = Dict()):
         """
@@ -104,9 +107,9 @@ class TransmonBenzheng(LibraryBase):
         square = gdspy.Rectangle((pos[0]-square_width/2,pos[1]-square_width/2), (pos[0]+square_width/2,pos[1]+square_width/2))
         upper_pad = gdspy.Rectangle((pos[0]-pad_width/2,pos[1]+gap/2), (pos[0]+pad_width/2,pos[1]+pad_height + gap/2))
         lower_pad = gdspy.Rectangle((pos[0]-pad_width/2,pos[1]-pad_height - gap/2), (pos[0]+pad_width/2,pos[1]-gap/2))
-        pad = gdspy.boolean(upper_pad, lower_pad, "or")
+        pad = gds_backend.boolean(upper_pad, lower_pad, "or")
 
-        transmon = gdspy.boolean(square, pad, "not")
+        transmon = gds_backend.boolean(square, pad, "not")
         small_pad_end = [square_width/2-small_pad_offset[0]-small_pad_width[0]-small_pad_incline[0]*math.cos(math.radians(small_pad_angel[0])),
                          square_width/2-gap/2-pad_height-small_pad_gap[1]-small_pad_height[1],
                          square_width/2-small_pad_offset[2]-small_pad_width[2]-small_pad_incline[2]*math.cos(math.radians(small_pad_angel[2])),
@@ -120,43 +123,43 @@ class TransmonBenzheng(LibraryBase):
                         (pos[0]-small_pad_offset[0]-small_pad_width[0]-small_pad_incline[0]*math.cos(math.radians(small_pad_angel[0])),pos[1]+gap/2+pad_height+small_pad_height[0]/2+small_pad_gap[0]+small_pad_incline[0]*math.sin(math.radians(small_pad_angel[0]))),
                         (pos[0]-small_pad_offset[0]-small_pad_width[0]-small_pad_incline[0]*math.cos(math.radians(small_pad_angel[0]))-small_pad_end[0],pos[1]+gap/2+pad_height+small_pad_height[0]/2+small_pad_gap[0]+small_pad_incline[0]*math.sin(math.radians(small_pad_angel[0])))]
             small_pad0 = gdspy.FlexPath(path_pos0,small_pad_height[0])
-            transmon = gdspy.boolean(transmon, small_pad0, "not")
+            transmon = gds_backend.boolean(transmon, small_pad0, "not")
         if small_pad_options[2]!= 0:
             path_pos2 = [(pos[0]+small_pad_offset[2],pos[1]+gap/2+pad_height+small_pad_height[2]/2+small_pad_gap[2]),                    
                         (pos[0]+small_pad_offset[2]+small_pad_width[2],pos[1]+gap/2+pad_height+small_pad_height[2]/2+small_pad_gap[2]),
                         (pos[0]+small_pad_offset[2]+small_pad_width[2]+small_pad_incline[2]*math.cos(math.radians(small_pad_angel[2])),pos[1]+gap/2+pad_height+small_pad_height[2]/2+small_pad_gap[2]+small_pad_incline[2]*math.sin(math.radians(small_pad_angel[2]))),
                         (pos[0]+small_pad_offset[2]+small_pad_width[2]+small_pad_incline[2]*math.cos(math.radians(small_pad_angel[2]))+small_pad_end[2],pos[1]+gap/2+pad_height+small_pad_height[2]/2+small_pad_gap[2]+small_pad_incline[2]*math.sin(math.radians(small_pad_angel[2])))]
             small_pad2 = gdspy.FlexPath(path_pos2,small_pad_height[2])
-            transmon = gdspy.boolean(transmon, small_pad2, "not")
+            transmon = gds_backend.boolean(transmon, small_pad2, "not")
         if small_pad_options[3] != 0:
             path_pos3 = [(pos[0]-small_pad_offset[3],pos[1]-gap/2-pad_height-small_pad_height[3]/2-small_pad_gap[3]),
                         (pos[0]-small_pad_offset[3]-small_pad_width[3],pos[1]-gap/2-pad_height-small_pad_height[3]/2-small_pad_gap[3]),
                         (pos[0]-small_pad_offset[3]-small_pad_width[3]-small_pad_incline[3]*math.cos(math.radians(small_pad_angel[3])),pos[1]-gap/2-pad_height-small_pad_height[3]/2-small_pad_gap[3]-small_pad_incline[3]*math.sin(math.radians(small_pad_angel[3]))),
                         (pos[0]-small_pad_offset[3]-small_pad_width[3]-small_pad_incline[3]*math.cos(math.radians(small_pad_angel[3]))-small_pad_end[3],pos[1]-gap/2-pad_height-small_pad_height[3]/2-small_pad_gap[3]-small_pad_incline[3]*math.sin(math.radians(small_pad_angel[3])))]
             small_pad3 = gdspy.FlexPath(path_pos3,small_pad_height[3])
-            transmon = gdspy.boolean(transmon, small_pad3, "not")
+            transmon = gds_backend.boolean(transmon, small_pad3, "not")
         if small_pad_options[5] != 0:
             path_pos5 = [(pos[0]+small_pad_offset[5],pos[1]-gap/2-pad_height-small_pad_height[5]/2-small_pad_gap[5]),
                         (pos[0]+small_pad_offset[5]+small_pad_width[5],pos[1]-gap/2-pad_height-small_pad_height[5]/2-small_pad_gap[5]),
                         (pos[0]+small_pad_offset[5]+small_pad_width[5]+small_pad_incline[5]*math.cos(math.radians(small_pad_angel[5])),pos[1]-gap/2-pad_height-small_pad_height[5]/2-small_pad_gap[5]-small_pad_incline[5]*math.sin(math.radians(small_pad_angel[5]))),
                         (pos[0]+small_pad_offset[5]+small_pad_width[5]+small_pad_incline[5]*math.cos(math.radians(small_pad_angel[5]))+small_pad_end[5],pos[1]-gap/2-pad_height-small_pad_height[5]/2-small_pad_gap[5]-small_pad_incline[5]*math.sin(math.radians(small_pad_angel[5])))]
             small_pad5 = gdspy.FlexPath(path_pos5,small_pad_height[5])
-            transmon = gdspy.boolean(transmon, small_pad5, "not")
+            transmon = gds_backend.boolean(transmon, small_pad5, "not")
         
         if small_pad_options[1] != 0:
             rec = gdspy.Rectangle((pos[0]-small_pad_width[1]/2,pos[1]+gap/2+pad_height+small_pad_gap[1]), 
                                   (pos[0]+small_pad_width[1]/2,pos[1]+gap/2+pad_height+small_pad_height[1]+small_pad_gap[1]))
             line = gdspy.Path(small_pad_incline[1],(pos[0],pos[1]+gap/2+pad_height+small_pad_height[1]+small_pad_gap[1]))
             line.segment(small_pad_end[1], direction='+y')
-            small_pad2 = gdspy.boolean(rec, line, "or")
-            transmon = gdspy.boolean(transmon, small_pad2, "not")
+            small_pad2 = gds_backend.boolean(rec, line, "or")
+            transmon = gds_backend.boolean(transmon, small_pad2, "not")
         if small_pad_options[4] != 0:
             rec = gdspy.Rectangle((pos[0]-small_pad_width[4]/2,pos[1]-gap/2-pad_height-small_pad_gap[4]), 
                                   (pos[0]+small_pad_width[4]/2,pos[1]-gap/2-pad_height-small_pad_height[4]-small_pad_gap[4]))
             line = gdspy.Path(small_pad_incline[4],(pos[0],pos[1]-gap/2-pad_height-small_pad_height[4]-small_pad_gap[4]))
             line.segment(small_pad_end[4], direction='-y')
-            small_pad3 = gdspy.boolean(rec, line, "or")
-            transmon = gdspy.boolean(transmon, small_pad3, "not")
+            small_pad3 = gds_backend.boolean(rec, line, "or")
+            transmon = gds_backend.boolean(transmon, small_pad3, "not")
             
         self.cell.add(transmon)
 
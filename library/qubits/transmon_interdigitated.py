@@ -5,6 +5,7 @@
 #########################################################################
 from addict import Dict
 from base.library_base import LibraryBase
+from base import gds_backend
 import toolbox
 import copy, gdspy
 
@@ -228,18 +229,18 @@ class TransmonInterdigitated(LibraryBase):
                                     right_comb_upper_j)
 
         # Combine lower pad
-        lower_pad = gdspy.boolean(lower_pad,lower_comb_1,'or')
-        lower_pad = gdspy.boolean(lower_pad,lower_comb_2,'or')
-        lower_pad = gdspy.boolean(lower_pad,lower_comb_3,'or')
-        lower_pad = gdspy.boolean(lower_pad,lower_comb_4,'or')
-        lower_pad = gdspy.boolean(lower_pad,lower_comb_j,'or')
+        lower_pad = gds_backend.boolean(lower_pad,lower_comb_1,'or')
+        lower_pad = gds_backend.boolean(lower_pad,lower_comb_2,'or')
+        lower_pad = gds_backend.boolean(lower_pad,lower_comb_3,'or')
+        lower_pad = gds_backend.boolean(lower_pad,lower_comb_4,'or')
+        lower_pad = gds_backend.boolean(lower_pad,lower_comb_j,'or')
 
         # Combine upper pad
-        upper_pad = gdspy.boolean(upper_pad,upper_comb_1,'or')
-        upper_pad = gdspy.boolean(upper_pad,upper_comb_2,'or')
-        upper_pad = gdspy.boolean(upper_pad,upper_comb_3,'or')
-        upper_pad = gdspy.boolean(upper_pad,upper_comb_4,'or')
-        upper_pad = gdspy.boolean(upper_pad,upper_comb_j,'or')
+        upper_pad = gds_backend.boolean(upper_pad,upper_comb_1,'or')
+        upper_pad = gds_backend.boolean(upper_pad,upper_comb_2,'or')
+        upper_pad = gds_backend.boolean(upper_pad,upper_comb_3,'or')
+        upper_pad = gds_backend.boolean(upper_pad,upper_comb_4,'or')
+        upper_pad = gds_backend.boolean(upper_pad,upper_comb_j,'or')
 
         # Draw lower coupling pads
         lower_lpad_center = gdspy.Rectangle(left_lpad_lower_center,
@@ -256,9 +257,9 @@ class TransmonInterdigitated(LibraryBase):
         lower_cpw_right = gdspy.Rectangle(left_cpw_lower_right,
                                         right_cpw_lower_right)
         # Combine lower coupling pads
-        lower_lpad_center = gdspy.boolean(lower_lpad_center,lower_cpw_center,'or')
-        lower_lpad_left = gdspy.boolean(lower_lpad_left,lower_cpw_left,'or')
-        lower_lpad_right = gdspy.boolean(lower_lpad_right,lower_cpw_right,'or')
+        lower_lpad_center = gds_backend.boolean(lower_lpad_center,lower_cpw_center,'or')
+        lower_lpad_left = gds_backend.boolean(lower_lpad_left,lower_cpw_left,'or')
+        lower_lpad_right = gds_backend.boolean(lower_lpad_right,lower_cpw_right,'or')
 
         # Draw upper coupling pads
         upper_lpad_left = gdspy.Rectangle(left_lpad_upper_left,
@@ -275,17 +276,17 @@ class TransmonInterdigitated(LibraryBase):
         upper_cpw_center = gdspy.Rectangle(left_cpw_upper_center,
                                         right_cpw_upper_center)
         # Combine upper coupling pads
-        upper_lpad_left = gdspy.boolean(upper_lpad_left,upper_cpw_left,'or')
-        upper_lpad_right = gdspy.boolean(upper_lpad_right,upper_cpw_right,'or')
-        upper_lpad_center = gdspy.boolean(upper_lpad_center,upper_cpw_center,'or')
+        upper_lpad_left = gds_backend.boolean(upper_lpad_left,upper_cpw_left,'or')
+        upper_lpad_right = gds_backend.boolean(upper_lpad_right,upper_cpw_right,'or')
+        upper_lpad_center = gds_backend.boolean(upper_lpad_center,upper_cpw_center,'or')
 
-        rect = gdspy.boolean(rect,lower_pad,'not')
-        rect = gdspy.boolean(rect,upper_pad,'not')
-        rect = gdspy.boolean(rect,lower_lpad_center,'not')
-        rect = gdspy.boolean(rect,lower_lpad_left,'not')
-        rect = gdspy.boolean(rect,lower_lpad_right,'not')
-        rect = gdspy.boolean(rect,upper_lpad_left,'not')
-        rect = gdspy.boolean(rect,upper_lpad_right,'not')
-        rect = gdspy.boolean(rect,upper_lpad_center,'not')
+        rect = gds_backend.boolean(rect,lower_pad,'not')
+        rect = gds_backend.boolean(rect,upper_pad,'not')
+        rect = gds_backend.boolean(rect,lower_lpad_center,'not')
+        rect = gds_backend.boolean(rect,lower_lpad_left,'not')
+        rect = gds_backend.boolean(rect,lower_lpad_right,'not')
+        rect = gds_backend.boolean(rect,upper_lpad_left,'not')
+        rect = gds_backend.boolean(rect,upper_lpad_right,'not')
+        rect = gds_backend.boolean(rect,upper_lpad_center,'not')
         self.cell.add(rect)
         return
\ No newline at end of file
@@ -5,6 +5,7 @@
 #########################################################################
 from addict import Dict
 from base.library_base import LibraryBase
+from base import gds_backend, transform
 import gdspy, numpy as np
 import math
 
@@ -38,6 +39,10 @@ class TransmonRotate(LibraryBase):
         subtract_height = 600
     )
 
+    derived_options = ("readout_pins", "control_pins", "coupling_pins", "outline")  # Computed lazily by calc_general_ops
+    instance_position = "gds_pos"  # Drawn once per distinct shape, see LibraryBase.draw_instance
+    instance_rotation = ("rotate", 180 / math.pi)
+
     def __init__(self, options):
         """
         Initializes the TransmonRotate class.
@@ -92,23 +97,10 @@ class TransmonRotate(LibraryBase):
                         [gds_pos[0]-width/2-subtract_gap, gds_pos[1]-gap/2-height-subtract_gap],
                         [gds_pos[0]-width/2-subtract_gap, gds_pos[1]+gap/2+height+subtract_gap]]
         
-        def rotate_point(x, y, cx, cy, angle):
-            # Calculate the rotated coordinates
-            new_x = math.cos(angle) * (x - cx) - math.sin(angle) * (y - cy) + cx
-            new_y = math.sin(angle) * (x - cx) + math.cos(angle) * (y - cy) + cy
-            return new_x, new_y
-
-        # Update all coordinate points
-        new_readout_pins = [rotate_point(x, y, gds_pos[0], gds_pos[1], rotate) for x, y in self.readout_pins]
-        new_control_pins = [rotate_point(x, y, gds_pos[0], gds_pos[1], rotate) for x, y in self.control_pins]
-        new_coupling_pins = [rotate_point(x, y, gds_pos[0], gds_pos[1], rotate) for x, y in self.coupling_pins]
-        new_outline = [rotate_point(x, y, gds_pos[0], gds_pos[1], rotate) for x, y in self.outline]
-
-        # Assign back to the original variables
-        self.readout_pins = new_readout_pins
-        self.control_pins = new_control_pins
-        self.coupling_pins = new_coupling_pins
-        self.outline = new_outline    
+        # Rotate all coordinate points at once, around the qubit center (the rotated points are tuples)
+        rotation = transform.matrix(rotate, gds_pos)
+        self.readout_pins, self.control_pins, self.coupling_pins, self.outline = transform.transform_nested(
+            [self.readout_pins, self.control_pins, self.coupling_pins, self.outline], rotation, point_type=tuple)
 
         return
 
@@ -231,7 +223,7 @@ class TransmonRotate(LibraryBase):
         
         self.cell_extract.add(subtract_square)
 
-        sub_poly = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        sub_poly = gds_backend.boolean(self.cell_extract, self.cell_subtract, "not")
         sub_poly.rotate(rotate, center=gds_pos)
 
         self.cell = self.lib.new_cell(self.name + "_cell")
@@ -5,6 +5,7 @@
 #########################################################################
 from addict import Dict
 from base.library_base import LibraryBase
+from base import fidelity, gds_backend
 import toolbox
 import copy, gdspy
 
@@ -197,15 +198,15 @@ class TransmonTeeth(LibraryBase):
         )
         # Create the left circle in the lower rectangle
         circle_left_lower = gdspy.Round(lower_circle_left,
-                                        pad_height/2,tolerance=0.01)
+                                        pad_height/2,tolerance=fidelity.tolerance())
 
         # Create the right circle in the lower rectangle
         circle_right_lower = gdspy.Round(lower_circle_right,
-                                        pad_height/2,tolerance=0.01)
+                                        pad_height/2,tolerance=fidelity.tolerance())
 
         # Combine the lower pad
-        lower_comb = gdspy.boolean(rect_lower,circle_left_lower,'or')
-        lower_comb = gdspy.boolean(lower_comb,circle_right_lower,'or')
+        lower_comb = gds_backend.boolean(rect_lower,circle_left_lower,'or')
+        lower_comb = gds_backend.boolean(lower_comb,circle_right_lower,'or')
                 
         # Create the upper rectangle shape
         rect_upper = gdspy.Rectangle(
@@ -214,33 +215,33 @@ class TransmonTeeth(LibraryBase):
         )
         # Create the left circle in the upper rectangle
         circle_left_upper = gdspy.Round(upper_circle_left,
-                                        pad_height/2,tolerance=0.01)
+                                        pad_height/2,tolerance=fidelity.tolerance())
         # Create the right circle in the upper rectangle
         circle_right_upper = gdspy.Round(upper_circle_right,
-                                        pad_height/2,tolerance=0.01)
+                                        pad_height/2,tolerance=fidelity.tolerance())
         # Create the left tooth in the upper part
         rect_tooth_left = gdspy.Rectangle(left_tooth_left,
                                         left_tooth_right)
         # Create the left tooth circle
         circle_tooth_left = gdspy.Round(left_tooth_circle,
-                                        coupled_pad_width/2,tolerance=0.01)
+                                        coupled_pad_width/2,tolerance=fidelity.tolerance())
         # Combine the left tooth
-        tooth_left = gdspy.boolean(rect_tooth_left,circle_tooth_left,'or')
+        tooth_left = gds_backend.boolean(rect_tooth_left,circle_tooth_left,'or')
 
         # Create the right tooth in the upper part
         rect_tooth_right = gdspy.Rectangle(right_tooth_left,
                                         right_tooth_right)
         # Create the right tooth circle
         circle_tooth_right = gdspy.Round(right_tooth_circle,
-                                        coupled_pad_width/2,tolerance=0.01)
+                                        coupled_pad_width/2,tolerance=fidelity.tolerance())
         # Combine the right tooth
-        tooth_right = gdspy.boolean(rect_tooth_right,circle_tooth_right,'or')
+        tooth_right = gds_backend.boolean(rect_tooth_right,circle_tooth_right,'or')
 
         # Combine the upper pad
-        upper_comb = gdspy.boolean(rect_upper,circle_left_upper,'or')
-        upper_comb = gdspy.boolean(upper_comb,circle_right_upper,'or')
-        upper_comb = gdspy.boolean(upper_comb,tooth_left,'or')
-        upper_comb = gdspy.boolean(upper_comb,tooth_right,'or')
+        upper_comb = gds_backend.boolean(rect_upper,circle_left_upper,'or')
+        upper_comb = gds_backend.boolean(upper_comb,circle_right_upper,'or')
+        upper_comb = gds_backend.boolean(upper_comb,tooth_left,'or')
+        upper_comb = gds_backend.boolean(upper_comb,tooth_right,'or')
 
         # Create the small pad in the center of the upper part
         upper_pad_loc_center = gdspy.Rectangle(left_pad_upper_center,
@@ -249,7 +250,7 @@ class TransmonTeeth(LibraryBase):
         upper_cpw_in_center = gdspy.Rectangle(left_cpw_upper_center,
                                     right_cpw_upper_center)
         # Combine the upper center small pad and cpw 
-        upper_pad_loc_center = gdspy.boolean(upper_pad_loc_center,upper_cpw_in_center,'or')
+        upper_pad_loc_center = gds_backend.boolean(upper_pad_loc_center,upper_cpw_in_center,'or')
 
         # Create the small pad on the left of the upper part
         upper_pad_loc_left = gdspy.Rectangle(left_pad_upper_left,
@@ -258,7 +259,7 @@ class TransmonTeeth(LibraryBase):
         upper_cpw_in_left = gdspy.Rectangle(left_cpw_upper_left,
                                     right_cpw_upper_left)
         # Combine the upper left small pad and cpw 
-        upper_pad_loc_left = gdspy.boolean(upper_pad_loc_left,upper_cpw_in_left,'or')
+        upper_pad_loc_left = gds_backend.boolean(upper_pad_loc_left,upper_cpw_in_left,'or')
 
         # Create the small pad on the right of the upper part
         upper_pad_loc_right = gdspy.Rectangle(left_pad_upper_right,
@@ -267,7 +268,7 @@ class TransmonTeeth(LibraryBase):
         upper_cpw_in_right = gdspy.Rectangle(left_cpw_upper_right,
                                     right_cpw_upper_right)
         # Combine the upper right small pad and cpw 
-        upper_pad_loc_right = gdspy.boolean(upper_pad_loc_right,upper_cpw_in_right,'or')
+        upper_pad_loc_right = gds_backend.boolean(upper_pad_loc_right,upper_cpw_in_right,'or')
 
         # Create the small pad in the center of the lower part
         lower_pad_loc_center = gdspy.Rectangle(left_pad_lower_center,
@@ -276,7 +277,7 @@ class TransmonTeeth(LibraryBase):
         lower_cpw_in_center = gdspy.Rectangle(left_cpw_lower_center,
                                     right_cpw_lower_center)
         # Combine the lower center small pad and cpw 
-        lower_pad_loc_center = gdspy.boolean(lower_pad_loc_center,lower_cpw_in_center,'or')
+        lower_pad_loc_center = gds_backend.boolean(lower_pad_loc_center,lower_cpw_in_center,'or')
 
         # Create the small pad on the left of the lower part
         lower_pad_loc_left = gdspy.Rectangle(left_pad_lower_left,
@@ -285,7 +286,7 @@ class TransmonTeeth(LibraryBase):
         lower_cpw_in_left = gdspy.Rectangle(left_cpw_lower_left,
                                         right_cpw_lower_left)
         # Combine the lower left small pad and cpw 
-        lower_pad_loc_left = gdspy.boolean(lower_pad_loc_left,lower_cpw_in_left,'or')
+        lower_pad_loc_left = gds_backend.boolean(lower_pad_loc_left,lower_cpw_in_left,'or')
 
         # Create the small pad on the right of the lower part
         lower_pad_loc_right = gdspy.Rectangle(left_pad_lower_right,
@@ -294,13 +295,13 @@ class TransmonTeeth(LibraryBase):
         lower_cpw_in_right = gdspy.Rectangle(left_cpw_lower_right,
                                         right_cpw_lower_right)
         # Combine the lower right small pad and cpw 
-        lower_pad_loc_right = gdspy.boolean(lower_pad_loc_right,lower_cpw_in_right,'or')
+        lower_pad_loc_right = gds_backend.boolean(lower_pad_loc_right,lower_cpw_in_right,'or')
 
         pad_loc = [upper_pad_loc_center,upper_pad_loc_left,upper_pad_loc_right,lower_pad_loc_center,lower_pad_loc_left,lower_pad_loc_right]
-        rect = gdspy.boolean(rect,lower_comb,'not')
-        rect = gdspy.boolean(rect,upper_comb,'not')
+        rect = gds_backend.boolean(rect,lower_comb,'not')
+        rect = gds_backend.boolean(rect,upper_comb,'not')
         for i in range(6):
             if pad_options[i] == 1:
-                rect = gdspy.boolean(rect,pad_loc[i],'not')
+                rect = gds_backend.boolean(rect,pad_loc[i],'not')
         self.cell.add(rect)
         return
\ No newline at end of file
@@ -31,6 +31,9 @@ class Xmon(LibraryBase):
         claw_width = 10,
         claw_gap = 6
     )
+
+    derived_options = ("readout_pins", "control_pins", "coupling_pins", "outline")  # Computed lazily by calc_general_ops
+    instance_position = "gds_pos"  # Drawn once per distinct shape, see LibraryBase.draw_instance
     
     def __init__(self, options = Dict()):
         """
@@ -6,7 +6,9 @@
 #########################################################################
 from addict import Dict
 from base.library_base import LibraryBase
+from base import transform
 import toolbox
+import math
 import copy, gdspy, numpy as np
 
 class XmonRotate(LibraryBase):
@@ -32,6 +34,10 @@ class XmonRotate(LibraryBase):
         claw_gap = 6,
         rotation = 0
     )
+
+    derived_options = ("readout_pins", "control_pins", "coupling_pins", "outline")  # Computed lazily by calc_general_ops
+    instance_position = "gds_pos"  # Drawn once per distinct shape, see LibraryBase.draw_instance
+    instance_rotation = ("rotation", 1)
     
     def __init__(self, options = Dict()):
         """
@@ -91,6 +97,11 @@ class XmonRotate(LibraryBase):
                                    gds_pos[1] + cross_height + ground_spacing + claw_gap + claw_width + claw_length],
                                   [gds_pos[0] - cross_height - ground_spacing - claw_gap - claw_width - claw_length,
                                    gds_pos[1] - cross_height - ground_spacing - claw_gap - claw_width - claw_length]]
+
+        # Rotate all coordinate points at once, like the qubit drawn around its center
+        rotation = transform.matrix(math.radians(self.rotation), gds_pos)
+        self.readout_pins, self.control_pins, self.coupling_pins, self.outline = transform.transform_nested(
+            [self.readout_pins, self.control_pins, self.coupling_pins, self.outline], rotation)
         return
 
     def draw_gds(self):
@@ -179,7 +190,6 @@ class XmonRotate(LibraryBase):
                                   (-gap + height) * d, (width + gap + height) * d, (-gap + height) * d, (width + gap) * d, (-gap) * d, (width + gap) * d, 0, (width) * d,
                                   )
         
-        import math
         qubit_polygon = gdspy.Polygon(qubit.get_points())
         qubit_polygon.rotate(math.radians(rotation), self.gds_pos)
         self.cell.add([qubit_polygon])
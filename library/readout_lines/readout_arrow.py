@@ -13,6 +13,7 @@ import toolbox
 from library.readout_lines.readout_line_finger import ReadoutLineFinger
 from library.others.arrow import Arrow
 from base.library_base import LibraryBase
+from base import gds_backend
 
 class ReadoutArrow(LibraryBase):
     default_options = Dict(
@@ -107,7 +108,7 @@ class ReadoutArrow(LibraryBase):
         self.end_pos = options.end_pos  # Update the ending position
 
         # Merge the arrow and finger shapes
-        all_pattern = gdspy.boolean(arrow.cell, finger.cell, operation="or")  # Perform OR operation
+        all_pattern = gds_backend.boolean(arrow.cell, finger.cell, operation="or")  # Perform OR operation
         all_pattern.rotate(orientation, start_pos)  # Rotate the shape
         self.cell.add(all_pattern)  # Add to the cell
 
@@ -11,6 +11,7 @@ import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import fidelity, gds_backend
 from library.readout_lines.readout_cavity_plus import ReadoutCavityPlus
 
 class ReadoutArrowPlus(LibraryBase):
@@ -132,7 +133,7 @@ class ReadoutArrowPlus(LibraryBase):
 
         # Merge and translate
         start_pos = self.start_pos
-        pattern = gdspy.boolean(arrow_finger.cell, rd.cell, "or")  # Merge shapes
+        pattern = gds_backend.boolean(arrow_finger.cell, rd.cell, "or")  # Merge shapes
         pattern.translate(start_pos[0], start_pos[1])  # Translate to the starting position
         self.cell.add(pattern)  # Add to the cell
 
@@ -201,8 +202,8 @@ class ArrowFinger(LibraryBase):
         pos.append(now_p)
 
         # Draw finger
-        finger = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        sub_finger = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
+        finger = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
+        sub_finger = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
 
         # Rotate finger
         finger.rotate(math.radians(finger_orientation), (0, 0))
@@ -236,9 +237,9 @@ class ArrowFinger(LibraryBase):
         sub_arrow = gdspy.FlexPath(sub_arrow_pos, width, corners="natural").to_polygonset()
 
         # Get the total shape
-        arrow_finger = gdspy.boolean(finger, arrow, "or")  # Merge finger and arrow
-        sub_arrow_finger = gdspy.boolean(sub_finger, sub_arrow, "or")  # Merge sub-finger and sub-arrow
-        arrow_finger = gdspy.boolean(arrow_finger, sub_arrow_finger, "not")  # Subtract sub-arrow_finger
+        arrow_finger = gds_backend.boolean(finger, arrow, "or")  # Merge finger and arrow
+        sub_arrow_finger = gds_backend.boolean(sub_finger, sub_arrow, "or")  # Merge sub-finger and sub-arrow
+        arrow_finger = gds_backend.boolean(arrow_finger, sub_arrow_finger, "not")  # Subtract sub-arrow_finger
         
         # Translate
         arrow_finger.translate(start_pos[0], start_pos[1])  # Translate to the starting position
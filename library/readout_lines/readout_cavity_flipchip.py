@@ -11,6 +11,7 @@ import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import fidelity, gds_backend
 
 class ReadoutCavityFlipchip(LibraryBase):
     default_options = Dict(
@@ -104,8 +105,8 @@ class ReadoutCavityFlipchip(LibraryBase):
         pos = flip_pos + pos  # Merge the flip path and other paths
 
         # Draw the cavity
-        path = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=radius).to_polygonset()
-        sub_path = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=radius).to_polygonset()
+        path = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=radius, tolerance=fidelity.tolerance()).to_polygonset()
+        sub_path = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=radius, tolerance=fidelity.tolerance()).to_polygonset()
 
         # Draw the small pad
         sub_small_pad = gdspy.Rectangle((flip_inner[0] - smallpad_height / 2, flip_inner[1]),
@@ -114,12 +115,12 @@ class ReadoutCavityFlipchip(LibraryBase):
                                      (flip_inner[0] + smallpad_height / 2 + gap, flip_inner[1] - smallpad_width - gap))
 
         # Perform boolean operations to generate the cavity
-        cavity = gdspy.boolean(path, sub_path, 'not')  # Subtract operation
-        small_pad = gdspy.boolean(small_pad, sub_small_pad, 'not')  # Subtract operation
-        connect = gdspy.boolean(sub_path, small_pad, 'and')  # Intersection operation
+        cavity = gds_backend.boolean(path, sub_path, 'not')  # Subtract operation
+        small_pad = gds_backend.boolean(small_pad, sub_small_pad, 'not')  # Subtract operation
+        connect = gds_backend.boolean(sub_path, small_pad, 'and')  # Intersection operation
 
-        cavity = gdspy.boolean(cavity, small_pad, 'or')  # Union operation
-        cavity = gdspy.boolean(cavity, connect, 'not')  # Subtract operation
+        cavity = gds_backend.boolean(cavity, small_pad, 'or')  # Union operation
+        cavity = gds_backend.boolean(cavity, connect, 'not')  # Subtract operation
         # Rotate and translate
         cavity.rotate(math.radians(orientation), (0, 0))  # Rotate the cavity
         cavity.translate(dx=start_pos[0], dy=start_pos[1])  # Translate the cavity
@@ -11,6 +11,7 @@ import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import cpw
 
 class ReadoutCavityPlus(LibraryBase):
     default_options = Dict(
@@ -83,9 +84,7 @@ class ReadoutCavityPlus(LibraryBase):
         pos = self.get_pos(start_dir, start_length, space_num, space_dist, one_mid_straight, end_length, coupling_length)
         
         # Draw the cavity
-        path = gdspy.FlexPath(pos, width + gap*2, corners="circular bend", bend_radius=radius).to_polygonset()
-        sub_path = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=radius).to_polygonset()
-        cavity = gdspy.boolean(path, sub_path, 'not')  # Perform boolean operation to generate the cavity
+        cavity = gdspy.PolygonSet(cpw.polyline(pos, radius).gap_polygons(width, gap))  # Gaps on both sides of the cavity
 
         # Rotate and translate
         cavity.rotate(math.radians(orientation), (0, 0))  # Rotate the cavity
@@ -12,6 +12,7 @@ import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import fidelity, gds_backend
 from library.readout_lines.readout_cavity_plus import ReadoutCavityPlus
 
 class ReadoutLineFingerPlus(LibraryBase):
@@ -128,7 +129,7 @@ class ReadoutLineFingerPlus(LibraryBase):
 
         # Merge the finger structure and the cavity, and translate to the start position
         start_pos = self.start_pos
-        pattern = gdspy.boolean(finger.cell, rd.cell, "or")
+        pattern = gds_backend.boolean(finger.cell, rd.cell, "or")
         pattern.translate(start_pos[0], start_pos[1])
         self.cell.add(pattern)  # Add to the cell
 
@@ -193,9 +194,9 @@ class Finger(LibraryBase):
         pos.append(now_p)
 
         # Draw the finger structure
-        finger = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        sub_finger = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        finger = gdspy.boolean(finger, sub_finger, "not")  # Calculate the difference
+        finger = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
+        sub_finger = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius, tolerance=fidelity.tolerance()).to_polygonset()
+        finger = gds_backend.boolean(finger, sub_finger, "not")  # Calculate the difference
         
         # Translate and rotate
         finger.rotate(math.radians(orientation), (0, 0))
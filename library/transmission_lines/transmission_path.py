@@ -10,6 +10,7 @@ import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import cpw
 
 
 class TransmissionPath(LibraryBase):
@@ -59,21 +60,8 @@ class TransmissionPath(LibraryBase):
 
         self.lib = gdspy.GdsLibrary()  # Create a GDS library
         gdspy.library.use_current_library = False  # Do not use the current library
-        self.cell_subtract = self.lib.new_cell(self.name + "_subtract")  # Create a subtraction cell
-
-        # Create the inner transmission line
-        transmission_L_inner = gdspy.FlexPath(pos, width, corners="circular bend",
-                                              bend_radius=corner_radius).to_polygonset()
-        self.cell_subtract.add(transmission_L_inner)  # Add the inner transmission line to the subtraction cell
-
-        # Create the outer control line
-        self.cell_extract = self.lib.new_cell(name + "_extract")
-        control_L_out = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend",
-                                       bend_radius=corner_radius).to_polygonset()
-        self.cell_extract.add(control_L_out)  # Add the outer control line to the extraction cell
-
-        # Calculate the final pattern
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        # Gaps on both sides of the transmission line, offset from its centerline
+        gaps = cpw.polyline(pos, corner_radius).gap_polygons(width, gap)
         self.cell = self.lib.new_cell(name + "_cell")  # Create the final cell
-        self.cell.add(pad)  # Add the final pattern to the final cell
+        self.cell.add(gdspy.PolygonSet(gaps))  # Add the final pattern to the final cell
         return
\ No newline at end of file
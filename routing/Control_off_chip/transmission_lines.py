@@ -8,6 +8,7 @@ import math
 import copy
 import re
 import func_modules
+from base import options_tree
 
 
 def convert_topo(topo_poss):
@@ -77,7 +78,7 @@ def boundary_readout_line_pos(i, qubits, readout_lines):
     The maximum and minimum vertical coordinates.
     """
     qubits = copy.deepcopy(qubits)
-    readout_lines = copy.deepcopy(readout_lines)
+    readout_lines = options_tree.freeze(readout_lines)  # Read-only, indexed once for all qubits
     end_pos = []
 
     for q_name, q_op in qubits.items():
@@ -102,7 +103,7 @@ def boundary_readout_line_space(i, qubits, readout_lines):
     The maximum and minimum values of space.
     """
     qubits = copy.deepcopy(qubits)
-    readout_lines = copy.deepcopy(readout_lines)
+    readout_lines = options_tree.freeze(readout_lines)  # Read-only, indexed once for all qubits
     space = []
     for q_name, q_op in qubits.items():
         if q_op.topo_pos[1] != i:
@@ -12,6 +12,7 @@ from routing.Flipchip import calc_chip_size
 import copy
 import toolbox
 import func_modules
+from base import options_tree
 from addict import Dict
 
 
@@ -175,6 +176,7 @@ def convert_qubits_ops_format(qubits_ops, rdls_ops):
         qubits_ops: Dictionary containing converted qubit operation parameters.
     """
     qubits_ops = copy.deepcopy(qubits_ops)
+    rdls_ops = options_tree.freeze(rdls_ops)  # Read-only, its pin index is built once for all qubits
     for q_name, q_ops in qubits_ops.items():
         coupling_pins = Dict()
         coupling_pins.top = toolbox.find_topmost_coordinate(list(q_ops.control_pins))
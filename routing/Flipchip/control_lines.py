@@ -10,6 +10,7 @@ import math
 import re
 import copy
 import func_modules
+from base import options_tree
 
 gap = 100
 
@@ -825,8 +826,9 @@ def generate_control_lines(qubits, readout_lines, pins, chip):
     Returns:
         control_lines: Dictionary, control line information.
     """
-    qubits = copy.deepcopy(qubits)
-    readout_lines = copy.deepcopy(readout_lines)
+    # Read-only snapshots: copying them is free and their pin indexes are built only once
+    qubits = options_tree.freeze(qubits)
+    readout_lines = options_tree.freeze(readout_lines)
     pins = copy.deepcopy(pins)
     chip = copy.deepcopy(chip)
 
@@ -9,6 +9,7 @@ import math
 import re
 import copy
 import func_modules
+from base import options_tree
 
 gap = 100
 
@@ -253,8 +254,9 @@ def generate_pins(qubits, readout_lines, chip, pins_geometric_ops):
         chip: Dictionary, updated operation parameters of the chip.
     """
     ########################### Interface ###########################
-    qubits = copy.deepcopy(qubits)
-    readout_lines = copy.deepcopy(readout_lines)
+    # Read-only snapshots: copying them is free and their pin indexes are built only once
+    qubits = options_tree.freeze(qubits)
+    readout_lines = options_tree.freeze(readout_lines)
     chip = copy.deepcopy(chip)
     pins_geometric_ops = copy.deepcopy(pins_geometric_ops)
 
@@ -9,6 +9,7 @@ import math
 import re
 import copy
 import func_modules
+from base import options_tree
 
 gap = 100
 
@@ -452,8 +453,9 @@ def generate_transmission_lines(qubits, readout_lines, pins, chip):
         transmission_lines: Dictionary, transmission line information.
     """
     # Interface
-    qubits = copy.deepcopy(qubits)
-    readout_lines = copy.deepcopy(readout_lines)
+    # Read-only snapshots: copying them is free and their pin indexes are built only once
+    qubits = options_tree.freeze(qubits)
+    readout_lines = options_tree.freeze(readout_lines)
     pins = copy.deepcopy(pins)
     chip = copy.deepcopy(chip)
 
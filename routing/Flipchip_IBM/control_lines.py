@@ -7,12 +7,12 @@
 from addict import Dict
 import numpy as np
 import math
-from scipy.spatial import KDTree
-import matplotlib.pyplot as plt
-import networkx as nx
 import re
 import copy
 import func_modules
+from base.lazy_import import lazy_import
+
+nx = lazy_import("networkx")  # Imported on the first routing
 
 
 def convert_topo(topo_poss):
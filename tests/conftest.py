@@ -0,0 +1,97 @@
+##############################################################
+# Test configuration: the modules are imported from the repository root
+##############################################################
+
+import collections, os, random, sys
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def build_design(n: int = 3, readout: bool = True, routing: bool = False):
+    """
+    Builds a small design: an n x n grid of Transmons with their coupling lines, chip and readout lines, and
+    optionally a second chip with the flip-chip routing.
+    """
+    from api.design import Design
+    random.seed(0)
+    design = Design()
+    design.generate_topology(topo_col=n, topo_row=n)
+    design.topology.generate_full_edges()
+    design.generate_qubits(topology=True, qubits_type="Transmon", chip_name="chip0", dist=3000)
+    design.generate_coupling_lines(topology=True, qubits=True, cpls_type="CouplingLineStraight", chip="chip0")
+    design.generate_chip(qubits=True, dist=4000)
+    if readout:
+        design.generate_readout_lines(qubits=True, rdls_type="ReadoutCavity", chip_name="chip0")
+    if routing:
+        design.gds.chips.copy_chip(old_chip_name="chip0", new_chip_name="chip1")
+        design.routing(method="Flipchip_routing", chip_name="chip1")
+    return design
+
+
+def layer_areas(path):
+    """
+    Returns the area covered on each (layer, datatype) of the top-level cells of a GDS file, references flattened.
+    """
+    import gdstk
+    polygons = collections.defaultdict(list)
+    for cell in gdstk.read_gds(path).top_level():
+        for polygon in cell.get_polygons():
+            polygons[(polygon.layer, polygon.datatype)].append(polygon)
+    return {key: sum(p.area() for p in gdstk.boolean(shapes, [], "or", precision=1e-3))
+            for key, shapes in polygons.items()}
+
+
+def assert_same_areas(path, reference):
+    areas, expected = layer_areas(path), layer_areas(reference)
+    assert expected and all(area > 0 for area in expected.values())
+    assert sorted(areas) == sorted(expected)
+    for key, area in expected.items():
+        assert areas[key] == pytest.approx(area, rel=1e-6, abs=1e-2), key
+
+
+def cell_snapshot(cells):
+    """
+    Returns the layers, datatypes and vertices of the polygons of gdspy cells, by cell name, in a comparable form.
+    """
+    return {name: sorted((tuple(polygon_set.layers), tuple(polygon_set.datatypes),
+                          tuple(points.tobytes() for points in polygon_set.polygons))
+                         for polygon_set in cell.polygons)
+            for name, cell in cells.items()}
+
+
+@pytest.fixture
+def design():
+    return build_design()
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """
+    Counts the components constructed by each collection.
+    """
+    from base.cmpnts_base import CmpntsBase
+    counts = collections.Counter()
+    create_component = CmpntsBase.create_component
+
+    def counting_create_component(self, cmpnt_name, cmpnt_ops):
+        counts[self.__class__.__name__] += 1
+        return create_component(self, cmpnt_name, cmpnt_ops)
+
+    monkeypatch.setattr(CmpntsBase, "create_component", counting_create_component)
+    return counts
+
+
+def assert_xor_within(polygons, reference, tolerance):
+    """
+    Checks that two polygon sets cover the same region, up to `tolerance` of distance along their edges: the XOR
+    area must not exceed the edge length of the reference times the tolerance.
+    """
+    import gdstk
+    union = gdstk.boolean(reference, [], "or", precision=1e-4)
+    edges = sum(np.linalg.norm(np.diff(np.vstack([p.points, p.points[:1]]), axis=0), axis=1).sum() for p in union)
+    xor = sum(p.area() for p in gdstk.boolean(polygons, reference, "xor", precision=1e-4))
+    assert union and xor <= tolerance * edges, (xor, edges)
@@ -0,0 +1,76 @@
+##############################################################
+# Batched edits defer the construction of the components
+##############################################################
+
+import contextlib, random
+import pytest
+from api.design import Design
+
+
+def new_design():
+    design = Design()
+    design.generate_topology(topo_col=3, topo_row=3)
+    design.topology.generate_full_edges()
+    return design
+
+
+def regenerate_qubits(batch):
+    design = new_design()
+    with design.batch() if batch else contextlib.nullcontext():
+        for dist in (2000, 2500, 3000):
+            design.generate_qubits(topology=True, qubits_type="Transmon", chip_name="chip0", dist=dist)
+            assert "qubits" in design.gds.options  # Reading the GDS inside the batch constructs nothing
+    return design
+
+
+def test_batch_constructs_fewer_components(builds):
+    unbatched = regenerate_qubits(batch=False).gds.content_hash()
+    unbatched_builds = builds["Qubits"]
+    builds.clear()
+    batched = regenerate_qubits(batch=True).gds.content_hash()
+    assert batched == unbatched
+    assert builds["Qubits"] == 9
+    assert builds["Qubits"] < unbatched_builds
+
+
+def test_collection_edits_are_recorded_in_batch(builds):
+    design = regenerate_qubits(batch=False)
+    builds.clear()
+    with design.batch():
+        design.gds.qubits.change_option("gds_pos", (100, 100))
+        design.gds.qubits.change_options({"gds_pos": (200, 300)})
+        assert builds["Qubits"] == 0
+    assert builds["Qubits"] == 9
+    assert design.gds.qubits.q0.gds_pos == (200, 300)
+
+
+def generate_chain(design):
+    design.generate_qubits(topology=True, qubits_type="Transmon", chip_name="chip0", dist=3000)
+    design.generate_coupling_lines(topology=True, qubits=True, cpls_type="CouplingLineStraight", chip="chip0")
+    design.generate_chip(qubits=True, dist=4000)
+    design.generate_readout_lines(qubits=True, rdls_type="ReadoutCavity", chip_name="chip0")
+
+
+def test_reads_inside_batch_see_calculated_parameters(builds):
+    random.seed(0)
+    design = new_design()
+    generate_chain(design)
+    unbatched_builds = sum(builds.values())
+    builds.clear()
+    random.seed(0)
+    batched = new_design()
+    with batched.batch():
+        generate_chain(batched)  # The coupling lines read the pins of the deferred qubits
+    assert batched.gds.content_hash() == design.gds.content_hash()
+    assert sum(builds.values()) <= unbatched_builds
+
+
+def test_batch_rolls_back_on_error():
+    design = regenerate_qubits(batch=False)
+    saved = design.gds.content_hash()
+    with pytest.raises(RuntimeError):
+        with design.batch():
+            design.generate_qubits(topology=True, qubits_type="Transmon", chip_name="chip0", dist=5000)
+            design.gds.qubits.change_option("gds_pos", (0, 0))
+            raise RuntimeError
+    assert design.gds.content_hash() == saved
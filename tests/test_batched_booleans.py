@@ -0,0 +1,75 @@
+##############################################################
+# Booleans batched by tile cover the same area as the per-component booleans
+##############################################################
+
+import gdspy
+import gdstk
+import numpy as np
+import pytest
+from base import gds_backend
+
+
+def rectangle(x0, y0, x1, y1):
+    return np.array([(x0, y0), (x1, y0), (x1, y1), (x0, y1)], dtype=float)
+
+
+def component(x, y, reach=0):
+    """
+    A pad with a hole, whose subtracted slot reaches `reach` beyond its right edge.
+    """
+    extract = [rectangle(x, y, x + 100, y + 100)]
+    subtract = [rectangle(x + 30, y + 30, x + 70, y + 70), rectangle(x + 80, y + 40, x + 100 + reach, y + 60)]
+    return extract, subtract
+
+
+def area(polygons):
+    return sum(p.area() for p in gdstk.boolean(polygons, [], "or", precision=1e-3))
+
+
+def union_area(polygon_sets):
+    return area([points for polygon_set in polygon_sets for points in polygon_set.polygons])
+
+
+def reference_area(pairs):
+    return union_area([gdspy.boolean(extract, subtract, "not") for extract, subtract in pairs])
+
+
+def make_pairs():
+    pairs = [component(x, y) for x in range(0, 1000, 150) for y in range(0, 600, 150)]
+    pairs.append(component(2000, 0, reach=40))  # Its slot reaches into the next pad
+    pairs.append(component(2110, 0))
+    return pairs
+
+
+def test_batched_difference_matches_per_component_booleans():
+    pairs = make_pairs()
+    batched = gds_backend.batched_difference(pairs, 500)
+    assert union_area(batched) == pytest.approx(reference_area(pairs), rel=1e-9)
+    assert len(batched) < len(pairs)  # Batched
+
+
+def test_conflicting_neighbours_are_not_batched():
+    pairs = [component(0, 0, reach=40), component(110, 0)]
+    batched = gds_backend.batched_difference(pairs, 1000)
+    assert union_area(batched) == pytest.approx(reference_area(pairs), rel=1e-9)
+    naive = gdspy.boolean([p for e, _ in pairs for p in e], [p for _, s in pairs for p in s], "not")
+    assert union_area([naive]) < reference_area(pairs)  # One boolean would cut the slot into the neighbour
+
+
+def test_cache_reuses_unchanged_tiles(monkeypatch):
+    calls = []
+    tile_difference = gds_backend._tile_difference
+    monkeypatch.setattr(gds_backend, "_tile_difference", lambda pairs, *args: calls.append(len(pairs)) or
+                        tile_difference(pairs, *args))
+    pairs = make_pairs()
+    cache = {}
+    gds_backend.batched_difference(pairs, 500, cache=cache)
+    tiles = len(calls)
+    calls.clear()
+    pairs[0] = component(0, 0, reach=200)  # Reaches the next pad of its tile
+    batched = gds_backend.batched_difference(pairs, 500, cache=cache)
+    assert len(calls) == 1 and tiles > 1
+    assert union_area(batched) == pytest.approx(reference_area(pairs), rel=1e-9)
+    calls.clear()
+    assert union_area(gds_backend.batched_difference(pairs, 500, cache=cache)) == pytest.approx(reference_area(pairs))
+    assert calls == []
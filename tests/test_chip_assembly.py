@@ -0,0 +1,51 @@
+##############################################################
+# Chip cells share the component polygons without letting them change
+##############################################################
+
+import pytest
+from conftest import build_design, cell_snapshot as snapshot
+
+
+def collection_cells(design):
+    return {(cmpnts_name, chip_name): cell for cmpnts_name in design.gds.cmpnts_name_list
+            for chip_name, cell in getattr(design.gds, cmpnts_name).cell_Dict.items()}
+
+
+def test_chip_cells_do_not_alias_component_cells(design):
+    design.gds.draw_gds()
+    before = snapshot(collection_cells(design))
+    chip_cell = design.gds.cell_Dict["chip0"]
+    for cell in collection_cells(design).values():
+        assert cell is not chip_cell and cell.polygons is not chip_cell.polygons
+    design.gds.draw_ground_plane(tile_size=2000)  # Adds to the chip cell only
+    chip_cell.flatten(single_layer=7, single_datatype=3)
+    assert snapshot(collection_cells(design)) == before
+
+
+def test_shared_coordinates_are_read_only(design):
+    design.gds.draw_gds()
+    points = design.gds.cell_Dict["chip0"].polygons[0].polygons[0]
+    with pytest.raises(ValueError):
+        points[0, 0] += 1
+    assert not design.gds.qubits.cell_Dict["chip0"].polygons[0].polygons[0].flags.writeable
+
+
+def test_redraw_leaves_previous_layout_intact(design):
+    design.gds.draw_gds()
+    previous = design.gds.cell_Dict
+    before = snapshot(previous)
+    design.gds.qubits.q4.gds_pos = (123, 456)
+    design.gds.draw_gds()
+    assert design.gds.cell_Dict is not previous and snapshot(previous) == before
+    assert snapshot(design.gds.cell_Dict) != before
+
+
+def test_redraw_after_edits_matches_fresh_build(design):
+    design.gds.draw_gds()
+    design.gds.cell_Dict["chip0"].flatten(single_layer=7, single_datatype=3)
+    design.gds.qubits.q4.gds_pos = (123, 456)
+    design.gds.draw_gds()
+    fresh = build_design()
+    fresh.gds.qubits.q4.gds_pos = (123, 456)
+    fresh.gds.draw_gds()
+    assert snapshot(design.gds.cell_Dict) == snapshot(fresh.gds.cell_Dict)
@@ -0,0 +1,63 @@
+##############################################################
+# Columnar (struct-of-arrays) storage of component parameters
+##############################################################
+
+import numpy as np
+from components.columnar_store import ColumnarStore
+
+
+class Label():
+    def __init__(self, text):
+        self.text = text
+
+    def __repr__(self):
+        return "Label"  # The same for every label
+
+
+def test_rows_round_trip_exactly():
+    store = ColumnarStore()
+    options = {"name": "q0", "gds_pos": (0, 1.5), "readout_pins": [(1, 2), (3.0, 4)], "outline": [],
+               "width": 455, "gap": 30.0, "flag": True, "nested": {"a": [1, (2, 3)]}}
+    store.set_row("q0", options)
+    row = store.get_row("q0")
+    assert row == options
+    assert type(row["width"]) is int and type(row["gap"]) is float and type(row["flag"]) is bool
+    assert type(row["gds_pos"]) is tuple and type(row["gds_pos"][0]) is int
+
+
+def test_equal_values_share_one_pool_entry():
+    store = ColumnarStore()
+    for i in range(10):
+        store.set_row(f"q{i}", {"width": 455, "pad_options": [1, 1, 1, 1, 1, 1]})
+    assert len(store.pool) == 2
+
+
+def test_values_with_equal_reprs_are_kept_apart():
+    store = ColumnarStore()
+    big, other = np.zeros(5000), np.zeros(5000)
+    other[2500] = 1  # Same truncated repr
+    store.set_row("a", {"array": big, "label": Label("a"), "number": 1, "seq": [1, 2]})
+    store.set_row("b", {"array": other, "label": Label("b"), "number": 1.0, "seq": (1, 2)})
+    a, b = store.get_row("a"), store.get_row("b")
+    assert a["array"][2500] == 0 and b["array"][2500] == 1
+    assert a["label"].text == "a" and b["label"].text == "b"
+    assert type(a["number"]) is int and type(b["number"]) is float
+    assert isinstance(a["seq"], list) and isinstance(b["seq"], tuple)
+
+
+def test_replaced_values_do_not_grow_the_pool():
+    store = ColumnarStore()
+    for i in range(5000):
+        store.set_row(f"q{i % 3}", {"array": np.full(4, i), "label": Label(str(i)), "width": i})
+    assert len(store.pool) <= 2 * 1024 + 9
+    assert store.get_row("q2")["array"][0] == 4997 and store.get_row("q2")["label"].text == "4997"
+    for i in range(3):
+        store.remove_row(f"q{i}")
+    assert store.pool_dead == len(store.pool) - sum(count > 0 for count in store.pool_refs)
+
+
+def test_dropped_parameters_release_their_values():
+    store = ColumnarStore()
+    store.set_row("q0", {"array": np.zeros(2), "width": 455})
+    store.set_row("q0", {"width": 455})
+    assert store.pool_dead == 1 and store.get_row("q0") == {"width": 455}
@@ -0,0 +1,47 @@
+##############################################################
+# The component class registry follows runtime changes of the library
+##############################################################
+
+import os, shutil
+import pytest
+import gds_analysis
+import library
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+@pytest.fixture
+def others(monkeypatch):
+    """
+    The "others" category, restored after the test.
+    """
+    monkeypatch.setattr(library.others, "module_name_list", list(library.others.module_name_list))
+    return library.others
+
+
+def test_component_added_at_runtime(tmp_path, monkeypatch, others):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(others, "RuntimePad", None, raising=False)
+    assert library.get_component_class("Others", "RuntimePad") is None
+    path = str(tmp_path / "runtime_pad.gds")
+    shutil.copy(os.path.join(DATA, "smon_read_test.gds"), path)
+    gds_analysis.add_component_temporarily(path, "others")
+    cmpnt_class = library.get_component_class("Others", "RuntimePad")
+    assert cmpnt_class is not None and cmpnt_class.__name__ == "RuntimePad"
+    assert "RuntimePad" in library.component_classes("Others")
+
+
+def test_replaced_module_name(others, monkeypatch):
+    library.component_classes("Others")
+    monkeypatch.setattr(others, "RenamedArrow", others.Arrow, raising=False)
+    others.module_name_list[others.module_name_list.index("arrow")] = "renamed_arrow"  # Same length
+    classes = library.component_classes("Others")
+    assert "RenamedArrow" in classes and "Arrow" not in classes
+
+
+def test_class_replaced_on_category(others, monkeypatch):
+    assert library.get_component_class("Others", "Arrow") is others.Arrow
+    replacement = type("Arrow", (others.Arrow,), {})
+    monkeypatch.setattr(others, "Arrow", replacement)
+    assert library.get_component_class("Others", "Arrow") is replacement
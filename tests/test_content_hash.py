@@ -0,0 +1,65 @@
+##############################################################
+# Merkle content hashes are stable and sensitive to every change
+##############################################################
+
+import os, subprocess, sys
+import numpy as np
+import pytest
+from base import options_tree
+from conftest import ROOT
+
+DATA = {"b": [1, 2.5, (3, "x")], "a": {"c": None, "d": True}}
+DATA_HASH = "2e5739577de42ae140c9785e6951a071"
+
+
+def test_hash_is_stable():
+    assert options_tree.content_hash(DATA) == DATA_HASH
+    assert options_tree.content_hash({"a": DATA["a"], "b": DATA["b"]}) == DATA_HASH  # Key order
+    assert options_tree.content_hash(options_tree.freeze(DATA)) == DATA_HASH
+    code = f"from base import options_tree; print(options_tree.content_hash({DATA!r}))"
+    for seed in ("1", "2"):
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True,
+                                env=dict(os.environ, PYTHONHASHSEED=seed)).stdout
+        assert output.strip() == DATA_HASH
+
+
+@pytest.mark.parametrize("changed", [
+    {"b": [1, 2.5 + 1e-12, (3, "x")], "a": {"c": None, "d": True}},
+    {"b": [1.0, 2.5, (3, "x")], "a": {"c": None, "d": True}},  # int and float
+    {"b": [1, 2.5, [3, "x"]], "a": {"c": None, "d": True}},  # tuple and list
+    {"b": [1, 2.5, (3, "x")], "a": {"c": None, "d": 1}},  # bool and int
+    {"b": [1, 2.5, (3, "x")], "a": {"c": "None", "d": True}},
+    {"b": [1, 2.5, (3, "x")], "a": {"e": None, "d": True}},  # Renamed key
+    {"b": [1, 2.5, (3, "x"), None], "a": {"c": None, "d": True}},
+    {"b": [2.5, 1, (3, "x")], "a": {"c": None, "d": True}},  # List order
+])
+def test_hash_is_sensitive(changed):
+    assert options_tree.content_hash(changed) != DATA_HASH
+
+
+def test_arrays_hash_their_values():
+    array = np.arange(6, dtype=float)
+    assert options_tree.content_hash(array) == options_tree.content_hash(array.copy())
+    assert options_tree.content_hash(array) != options_tree.content_hash(array.reshape(2, 3))
+    assert options_tree.content_hash(array) != options_tree.content_hash(array.astype(np.float32))
+
+
+def test_design_hash_follows_edits(design):
+    before = design.gds.content_hash()
+    qubits, chips = design.gds.qubits.content_hash(), design.gds.chips.content_hash()
+    position = tuple(design.gds.qubits.q4.gds_pos)
+    design.gds.qubits.q4.gds_pos = (position[0] + 1, position[1])
+    assert design.gds.content_hash() != before and design.gds.qubits.content_hash() != qubits
+    assert design.gds.chips.content_hash() == chips
+    design.gds.qubits.q4.gds_pos = position
+    assert design.gds.content_hash() == before
+
+
+def test_unchanged_subtrees_reuse_their_digests(design):
+    tree = design.gds.qubits.options_tree
+    options_tree.content_hash(tree)
+    q0 = tree["q0"]
+    design.gds.qubits.q4.gds_pos = (0, 0)
+    edited = design.gds.qubits.options_tree
+    assert edited is not tree and edited["q0"] is q0  # Shared subtree, hashed once
+    assert "_content_digest" in q0.__dict__
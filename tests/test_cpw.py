@@ -0,0 +1,93 @@
+##############################################################
+# CPW gaps offset from one centerline match the FlexPath booleans they replace
+##############################################################
+
+import copy, math
+import gdspy
+import pytest
+from addict import Dict
+from base import cpw, fidelity
+from conftest import assert_xor_within
+from library.control_lines.charge_line import ChargeLine
+from library.coupling_lines.coupling_line_straight import CouplingLineStraight
+from library.readout_lines.readout_cavity_plus import ReadoutCavityPlus
+from library.transmission_lines.transmission_path import TransmissionPath
+
+TOLERANCE = fidelity.FIDELITIES["tapeout"]
+PATH = [(0, 0), (500, 0), (500, 700), (-300, 700), (-300, 1500), (400, 2200)]
+
+
+def flexpath_gaps(outer_points, width, gap, radius, inner_points=None):
+    """
+    The previous drawing: the outer strip minus the conductor, two FlexPaths with circular bends and a boolean.
+    """
+    outer = gdspy.FlexPath(outer_points, width + gap * 2, corners="circular bend", bend_radius=radius,
+                           tolerance=TOLERANCE).to_polygonset()
+    inner = gdspy.FlexPath(inner_points or outer_points, width, corners="circular bend", bend_radius=radius,
+                           tolerance=TOLERANCE).to_polygonset()
+    return gdspy.boolean(outer, inner, "not").polygons
+
+
+def drawn(cmpnt):
+    with fidelity.fidelity_mode("tapeout"):
+        cmpnt.draw_gds()
+    return [p.tolist() for p in cmpnt.cell.get_polygons()]
+
+
+@pytest.mark.parametrize("options", [Dict(), Dict(pos=PATH)])
+def test_transmission_path(options):
+    cmpnt = TransmissionPath(options=Dict(TransmissionPath.default_options, **options))
+    reference = flexpath_gaps(cmpnt.pos, cmpnt.width, cmpnt.gap, cmpnt.corner_radius)
+    assert_xor_within(drawn(cmpnt), reference, TOLERANCE)
+
+
+@pytest.mark.parametrize("options", [Dict(), Dict(pos=PATH)])
+def test_charge_line(options):
+    cmpnt = ChargeLine(options=Dict(ChargeLine.default_options, **options))
+    pos = copy.deepcopy(list(cmpnt.pos))
+    (x0, y0), (x1, y1) = pos[-2], pos[-1]
+    d = math.hypot(x1 - x0, y1 - y0)
+    inner = pos[:-1] + [(x1 - cmpnt.pad_height / d * (x1 - x0), y1 - cmpnt.pad_height / d * (y1 - y0))]  # Open end
+    reference = flexpath_gaps(pos, cmpnt.width, cmpnt.gap, cmpnt.corner_radius, inner)
+    assert_xor_within(drawn(cmpnt), reference, TOLERANCE)
+
+
+@pytest.mark.filterwarnings("ignore:.*PolyPath is deprecated")
+@pytest.mark.parametrize("options", [Dict(), Dict(start_pos=(0, 0), end_pos=(300, 400))])
+def test_coupling_line_straight(options):
+    cmpnt = CouplingLineStraight(options=Dict(CouplingLineStraight.default_options, **options))
+    outer = gdspy.PolyPath([cmpnt.start_pos, cmpnt.end_pos], cmpnt.width + cmpnt.gap * 2)
+    reference = gdspy.boolean(outer, gdspy.PolyPath([cmpnt.start_pos, cmpnt.end_pos], cmpnt.width), "not").polygons
+    assert_xor_within(drawn(cmpnt), reference, TOLERANCE)
+
+
+def test_readout_cavity_plus():
+    cmpnt = ReadoutCavityPlus(options=Dict(ReadoutCavityPlus.default_options))
+    space_num = cmpnt.calc_space_num(cmpnt.height, cmpnt.space_dist)
+    length, start_length, coupling_length = cmpnt.convert_length(cmpnt.length, cmpnt.coupling_length, cmpnt.start_length,
+                                                                 corner_num=space_num * 2, corner_radius=cmpnt.radius)
+    end_length, one_mid_straight = cmpnt.calc_length(length=length, start_length=start_length,
+                                                     coupling_length=coupling_length, space_dist=cmpnt.space_dist,
+                                                     height=cmpnt.height, space_num=space_num)
+    pos = cmpnt.get_pos(cmpnt.start_dir, start_length, space_num, cmpnt.space_dist, one_mid_straight, end_length,
+                        coupling_length)
+    cavity = gdspy.PolygonSet(flexpath_gaps(pos, cmpnt.width, cmpnt.gap, cmpnt.radius))
+    cavity.rotate(math.radians(cmpnt.orientation), (0, 0))
+    cavity.translate(cmpnt.start_pos[0], cmpnt.start_pos[1])
+    assert_xor_within(drawn(cmpnt), cavity.polygons, TOLERANCE)
+
+
+def test_gap_polygons_fit_in_gds_polygons():
+    polygons = cpw.polyline(PATH, 100).gap_polygons(10, 6)
+    assert max(len(p) for p in polygons) < 200
+    reference = flexpath_gaps(PATH, 10, 6, 100)
+    assert_xor_within(polygons, reference, TOLERANCE)
+
+
+@pytest.mark.parametrize("points", [[(0, 0), (1000, 0), (1000, 30), (2000, 30)],
+                                    [(0, 0), (1000, 0), (1000, 100), (2000, 100)]])
+def test_short_jog_matches_flexpath(points):
+    polygons = cpw.polyline(points, 50).gap_polygons(10, 6)
+    reference = flexpath_gaps(points, 10, 6, 50)
+    assert_xor_within(polygons, reference, TOLERANCE)
+    assert gdspy.PolygonSet(polygons).area() == pytest.approx(gdspy.PolygonSet(reference).area(), rel=1e-4)
@@ -0,0 +1,37 @@
+##############################################################
+# Derived parameters (pins and outline) follow the parameters they are computed from
+##############################################################
+
+from addict import Dict
+from api.design import Design
+from library.qubits.transmon import Transmon
+
+
+def test_collection_change_option_moves_eager_component():
+    design = Design()
+    design.gds.air_bridges.add(Dict(name="ab0", type="AirbridgeNb"))
+    design.gds.air_bridges.change_option("gds_pos", (1000, 1000))
+    assert design.gds.air_bridges.ab0.outline[:2] == [[982.0, 943.0], [1018.0, 1057.0]]
+
+
+def test_collection_change_options_moves_eager_component():
+    design = Design()
+    design.gds.air_bridges.add(Dict(name="ab0", type="AirbridgeNb"))
+    design.gds.air_bridges.change_options(Dict(gds_pos=(-100, 50)))
+    assert design.gds.air_bridges.ab0.outline[:2] == [[-118.0, -7.0], [-82.0, 107.0]]
+
+
+def test_stale_derived_options_are_recomputed():
+    qubit = Transmon(Dict(name="q0"))
+    outline = qubit.outline
+    qubit.change_option("gds_pos", (500, 0))
+    assert "outline" not in qubit.__dict__  # Pending until read
+    assert qubit.outline == [[x + 500, y] for x, y in outline]
+    assert qubit.options.outline == qubit.outline
+
+
+def test_injection_recomputes_lazy_derived_options():
+    qubit = Transmon(Dict(name="q0"))
+    pins = qubit.readout_pins
+    qubit.inject_options(Dict(gds_pos=(0, 300)))
+    assert [tuple(p) for p in qubit.readout_pins] == [(x, y + 300) for x, y in pins]
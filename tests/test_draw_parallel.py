@@ -0,0 +1,76 @@
+##############################################################
+# Parallel drawing gives the same polygons as serial drawing
+##############################################################
+
+from base import draw_pool, gds_backend, options_tree
+from base.library_base import LibraryBase
+from conftest import build_design
+
+
+def cell_polygons(design):
+    polygons = []
+    for name, cell in design.gds.cell_Dict.items():
+        for polygon in cell.polygons:
+            polygons.append((name, tuple(polygon.layers), tuple(polygon.datatypes),
+                             [points.tobytes() for points in polygon.polygons]))
+    return sorted(polygons)
+
+
+def test_parallel_draw_matches_serial(monkeypatch):
+    calls = []
+    draw_components = draw_pool.draw_components
+    monkeypatch.setattr(draw_pool, "draw_components", lambda *args, **kwargs: calls.append(args[0]) or
+                        draw_components(*args, **kwargs))
+    serial = build_design()
+    serial.gds.draw_gds(workers=1)
+    assert calls == []
+    parallel = build_design()
+    parallel.gds.draw_gds(workers=2)
+    assert "Qubits" in calls  # Drawn by the worker processes
+    assert cell_polygons(parallel) == cell_polygons(serial)
+    assert len(cell_polygons(serial)) > 0
+
+
+def test_parallel_redraw_after_edit_matches_serial():
+    serial, parallel = build_design(), build_design()
+    parallel.gds.draw_gds(workers=2)
+    for design in (serial, parallel):
+        design.gds.qubits.q4.gds_pos = (100, 200)
+    serial.gds.draw_gds(workers=1)
+    parallel.gds.draw_gds(workers=2)
+    assert cell_polygons(parallel) == cell_polygons(serial)
+
+
+def test_workers_use_the_parent_backend(monkeypatch):
+    design = build_design()
+    trees = [tree for _, tree in options_tree.shared_items(design.gds.qubits.options_tree)]
+    monkeypatch.setattr(gds_backend, "_backend", "gdspy")  # A worker that did not inherit the parent backend
+    results = draw_pool.draw_chunk("Qubits", trees, backend="gdstk")
+    assert gds_backend.get_backend() == "gdstk"
+    assert len(results) == len(trees) and None not in results
+
+
+def test_pools_are_kept_per_backend(monkeypatch):
+    monkeypatch.setattr(draw_pool, "_executors", {})
+    monkeypatch.setattr(draw_pool, "ProcessPoolExecutor", lambda max_workers: object())
+    monkeypatch.setattr(gds_backend, "_backend", "gdspy")
+    assert draw_pool.executor(2) is draw_pool.executor(2, "gdspy")
+    assert draw_pool.executor(2, "gdstk") is not draw_pool.executor(2, "gdspy")
+
+
+def test_backend_change_redraws(monkeypatch):
+    calls = []
+    draw_pieces = LibraryBase.draw_pieces
+    monkeypatch.setattr(LibraryBase, "draw_pieces", lambda self, *args, **kwargs: calls.append(self.name) or
+                        draw_pieces(self, *args, **kwargs))
+    monkeypatch.setattr(gds_backend, "_backend", "gdspy")
+    design = build_design()
+    design.gds.qubits.draw_gds()
+    calls.clear()
+    gds_backend.set_backend("gdstk")
+    design.gds.qubits.draw_gds()
+    assert sorted(calls) == sorted(design.gds.qubits.cmpnt_name_list)
+    calls.clear()
+    gds_backend.set_backend("gdspy")
+    design.gds.qubits.draw_gds()
+    assert calls == []
@@ -0,0 +1,38 @@
+##############################################################
+# Switching between preview and tapeout reuses the drawings of each fidelity
+##############################################################
+
+from base.library_base import LibraryBase
+from conftest import build_design
+
+
+def test_fidelity_switch_reuses_drawings(tmp_path, monkeypatch):
+    calls = []
+    draw_pieces = LibraryBase.draw_pieces
+    monkeypatch.setattr(LibraryBase, "draw_pieces", lambda self, *args, **kwargs: calls.append(self.name) or
+                        draw_pieces(self, *args, **kwargs))
+    design = build_design()
+    readout_lines = design.gds.readout_lines
+    readout_lines.save_svg(path=str(tmp_path / "preview.svg"))
+    readout_lines.save_gds(str(tmp_path / "tapeout.gds"))
+    assert sorted(calls) == sorted(readout_lines.cmpnt_name_list * 2)
+    calls.clear()
+    readout_lines.save_svg(path=str(tmp_path / "preview.svg"))
+    readout_lines.save_gds(str(tmp_path / "tapeout.gds"))
+    assert calls == []
+
+
+def cell_polygons(collection):
+    return sorted((name, [points.tobytes() for points in polygon.polygons])
+                  for name, cell in collection.cell_Dict.items() for polygon in cell.polygons)
+
+
+def test_fidelity_caches_keep_their_curves(tmp_path):
+    design = build_design()
+    readout_lines = design.gds.readout_lines
+    readout_lines.draw_gds()
+    tapeout = cell_polygons(readout_lines)
+    readout_lines.save_svg(path=str(tmp_path / "preview.svg"))
+    assert cell_polygons(readout_lines) != tapeout
+    readout_lines.draw_gds()
+    assert cell_polygons(readout_lines) == tapeout
@@ -0,0 +1,62 @@
+##############################################################
+# Tiled ground planes match the serial boolean and are not stacked
+##############################################################
+
+import gdstk
+import numpy as np
+import pytest
+from addict import Dict
+from base import ground_plane
+from conftest import build_design
+import toolbox
+
+CHEESE_OPS = Dict(size=20, pitch=200, clearance=20, margin=100)
+
+
+def etched_shapes(design, chip_name):
+    polygons = []
+    for cmpnts_name in design.gds.cmpnts_name_list:
+        cmpnts = getattr(design.gds, cmpnts_name)
+        if cmpnts is not design.gds.chips and chip_name in cmpnts.cell_Dict.keys():
+            polygons.extend(cmpnts.cell_Dict[chip_name].get_polygons())
+    return polygons
+
+
+def test_tiled_cheesed_matches_serial_boolean():
+    design = build_design()
+    design.gds.draw_gds()
+    chip = design.gds.chips.chip0
+    chip_box = (tuple(chip.start_pos), tuple(chip.end_pos))
+    polygons = etched_shapes(design, "chip0")
+    tiled = ground_plane.ground_plane(chip_box, polygons, tile_size=1000, workers=1, cheese_ops=CHEESE_OPS)
+
+    (x0, y0), (x1, y1) = chip_box
+    boxes = np.array([(*np.min(p, axis=0), *np.max(p, axis=0)) for p in polygons])
+    holes = ground_plane.cheese_holes((x0, y0, x1, y1), boxes, chip_box, Dict(ground_plane.default_cheese_ops,
+                                                                              **CHEESE_OPS))
+    assert len(holes) > 0
+    rectangle = [np.array([(x0, y0), (x1, y0), (x1, y1), (x0, y1)])]
+    serial = gdstk.boolean(rectangle, [np.asarray(p) for p in polygons] + list(holes), "not", precision=1e-3)
+    tiled = [gdstk.Polygon(p) for p in tiled]
+    area = sum(p.area() for p in serial)
+    assert sum(p.area() for p in tiled) == pytest.approx(area, rel=1e-9)
+    for difference in (gdstk.boolean(tiled, serial, "not", precision=1e-3),
+                       gdstk.boolean(serial, tiled, "not", precision=1e-3)):
+        assert sum(p.area() for p in difference) < 1e-9 * area
+
+
+def test_ground_plane_is_replaced(design):
+    design.gds.draw_gds()
+    layer = toolbox.custom_hash("chip0")
+    chip_cell = design.gds.cell_Dict["chip0"]
+
+    def counts():
+        ground = chip_cell.get_polygons(by_spec=True)[(layer, 1)]
+        return len(chip_cell.polygons), len(design.gds.cell.polygons), len(ground)
+
+    first = design.gds.draw_ground_plane(tile_size=1000)
+    once = counts()
+    second = design.gds.draw_ground_plane(tile_size=1000)
+    assert counts() == once
+    assert second["chip0"] is not first["chip0"]
+    assert all(polygon_set is not first["chip0"] for polygon_set in chip_cell.polygons + design.gds.cell.polygons)
@@ -0,0 +1,26 @@
+##############################################################
+# Hierarchical GDS output covers the same shapes as the flat output
+##############################################################
+
+import gdstk
+from conftest import assert_same_areas, build_design
+
+
+def test_hierarchical_matches_flat_areas(tmp_path):
+    design = build_design(routing=True)
+    flat, hierarchical = str(tmp_path / "flat.gds"), str(tmp_path / "hierarchical.gds")
+    design.gds.save_gds(flat)
+    design.gds.save_gds(hierarchical, hierarchical=True)
+    assert_same_areas(hierarchical, flat)
+    library = gdstk.read_gds(hierarchical)
+    assert any(cell.references for cell in library.cells)  # Component shapes are referenced, not copied
+    assert len(library.cells) > len(gdstk.read_gds(flat).cells)
+
+
+def test_switching_output_modes_keeps_the_flat_output(tmp_path):
+    design = build_design(routing=True)
+    first, again = str(tmp_path / "first.gds"), str(tmp_path / "again.gds")
+    design.gds.save_gds(first)
+    design.gds.save_gds(str(tmp_path / "hierarchical.gds"), hierarchical=True)
+    design.gds.save_gds(again)
+    assert_same_areas(again, first)
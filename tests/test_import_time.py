@@ -0,0 +1,37 @@
+##############################################################
+# Importing the design API does not import the optional heavy modules
+##############################################################
+
+import json, subprocess, sys
+from conftest import ROOT
+
+# Top-level modules only needed by simulation, equivalent circuits, qasm topologies and plotting
+HEAVY_MODULES = ("simulation", "equ_circ", "qucat", "sympy", "qiskit", "seaborn", "matplotlib", "networkx",
+                 "win32com", "IPython", "func_modules.topo.gene_topo_ops.qasm")
+
+# Seconds allowed for `import api.design` (it takes about 0.1 s; it took 1.5 s with the eager imports)
+IMPORT_BUDGET = 1.0
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import api.design
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def import_design():
+    result = subprocess.run([sys.executable, "-c", SCRIPT], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_skips_heavy_modules():
+    modules = import_design()["modules"]
+    loaded = [name for name in modules for heavy in HEAVY_MODULES if name == heavy or name.startswith(heavy + ".")]
+    assert loaded == []
+
+
+def test_import_stays_within_budget():
+    elapsed = min(import_design()["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET
@@ -0,0 +1,40 @@
+##############################################################
+# Incremental injection only constructs the components that changed
+##############################################################
+
+from addict import Dict
+
+
+def test_adding_a_component_keeps_the_others(design, builds):
+    qubits = {name: getattr(design.gds.qubits, name) for name in design.gds.qubits.cmpnt_name_list}
+    design.gds.air_bridges.add(Dict(name="ab0", type="AirbridgeNb", gds_pos=(100, 100)))
+    assert dict(builds) == {"AirBridges": 1}
+    assert all(getattr(design.gds.qubits, name) is qubit for name, qubit in qubits.items())
+
+
+def test_gds_injection_rebuilds_changed_components_only(design, builds):
+    q0, q1 = design.gds.qubits.q0, design.gds.qubits.q1
+    ops = design.gds.options
+    ops.qubits.q0.gds_pos = (-500, -500)
+    design.gds.inject_options(ops)
+    assert dict(builds) == {"Qubits": 1}
+    assert design.gds.qubits.q0 is not q0 and design.gds.qubits.q1 is q1
+    assert tuple(design.gds.qubits.q0.gds_pos) == (-500, -500)
+
+
+def test_removed_components_are_deleted(design, builds):
+    ops = design.gds.qubits.options
+    del ops["q0"]
+    design.gds.qubits.inject_options(ops)
+    assert sum(builds.values()) == 0
+    assert "q0" not in design.gds.qubits.cmpnt_name_list and not hasattr(design.gds.qubits, "q0")
+
+
+def test_incremental_and_full_injection_agree(design, builds):
+    ops = design.gds.options
+    ops.qubits.q4.gds_pos = (10, 20)
+    design.gds.inject_options(ops)
+    incremental = design.gds.content_hash()
+    design.gds.inject_options(ops, incremental=False)
+    assert design.gds.content_hash() == incremental
+    assert builds["Qubits"] == 1 + len(design.gds.qubits.cmpnt_name_list)
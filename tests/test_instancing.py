@@ -0,0 +1,54 @@
+##############################################################
+# Components placed with CellReferences cover the same shapes as a flat draw
+##############################################################
+
+import math
+import gdspy
+import pytest
+from addict import Dict
+from conftest import assert_same_areas
+from library.qubits.circlemon import Circlemon
+from library.qubits.transmon import Transmon
+from library.qubits.transmon_rotate import TransmonRotate
+from library.qubits.xmon import Xmon
+from library.qubits.xmon_rotate import XmonRotate
+
+CASES = [
+    (Transmon, Dict(gds_pos=(1200, -300))),
+    (TransmonRotate, Dict(gds_pos=(100, 50))),
+    (TransmonRotate, Dict(gds_pos=(-40, 700), rotate=0.3)),
+    (Xmon, Dict(gds_pos=(-500, 20))),
+    (XmonRotate, Dict(gds_pos=(10, 20), rotation=30)),
+    (Circlemon, Dict(gds_pos=(300, 300))),
+]
+
+
+def write_cell(cell, path):
+    lib = gdspy.GdsLibrary()
+    lib.add(cell, include_dependencies=True)
+    lib.write_gds(path)
+    return path
+
+
+def make(cmpnt_class, options, name="q0"):
+    return cmpnt_class(Dict(cmpnt_class.default_options, name=name, **options))
+
+
+@pytest.mark.parametrize("cmpnt_class, options", CASES)
+def test_instance_matches_flat_draw(tmp_path, cmpnt_class, options):
+    instanced = make(cmpnt_class, options)
+    assert instanced.draw_instance({}) is not None
+    assert len(instanced.cell.references) == 1 and not instanced.cell.polygons
+    flat = make(cmpnt_class, options)
+    flat.draw_gds()
+    assert_same_areas(write_cell(instanced.cell, str(tmp_path / "instanced.gds")),
+                      write_cell(flat.cell, str(tmp_path / "flat.gds")))
+
+
+def test_same_shapes_share_one_master():
+    cache = {}
+    keys = [make(TransmonRotate, Dict(gds_pos=(i * 1000, 0), rotate=i * math.pi / 2), f"q{i}").draw_instance(cache)
+            for i in range(4)]
+    assert len(set(keys)) == 1 and len(cache) == 1
+    wider = make(TransmonRotate, Dict(gds_pos=(0, 0), width=500), "q4").draw_instance(cache)
+    assert wider not in keys and len(cache) == 2
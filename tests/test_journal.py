@@ -0,0 +1,59 @@
+##############################################################
+# Append-only edit journal of binary snapshots
+##############################################################
+
+import os
+from api.design import Design
+from base import journal
+
+
+def edit(design):
+    design.gds.qubits.q3.gds_pos = (123, 456)
+    ops = design.gds.qubits.options
+    del ops["q5"]
+    design.gds.qubits.inject_options(ops)
+
+
+def test_journal_round_trip(design, tmp_path):
+    path = str(tmp_path / "design.edaq")
+    log = journal.Journal(path, sync=False)
+    log.compact(design.options_tree)
+    size = os.path.getsize(path)
+    edit(design)
+    assert log.record(design.options_tree, "edit") == 6  # The position, the 4 derived parameters and the deletion
+    assert log.record(design.options_tree) == 0  # Nothing changed
+    assert os.path.getsize(path) == size  # Edits are appended to the journal, not to the snapshot
+    assert journal.load(path) == design.options_tree
+    loaded = Design()
+    loaded.import_options(path)
+    assert loaded.content_hash() == design.content_hash()
+
+
+def test_torn_tail_is_ignored(design, tmp_path):
+    path = str(tmp_path / "design.edaq")
+    log = journal.Journal(path, sync=False)
+    log.compact(design.options_tree)
+    edit(design)
+    log.record(design.options_tree)
+    with open(path + journal.JOURNAL_SUFFIX, "ab") as file:
+        file.write(b"\x10\x00\x00\x00torn")  # A record cut short by a crash
+    assert journal.load(path) == design.options_tree
+
+    reopened = journal.Journal(path, sync=False)
+    reopened.open()
+    design.gds.qubits.q1.gds_pos = (7, 7)
+    reopened.record(design.options_tree)  # Overwrites the torn record
+    assert journal.load(path) == design.options_tree
+
+
+def test_stale_journal_is_ignored_after_compaction(design, tmp_path):
+    path = str(tmp_path / "design.edaq")
+    log = journal.Journal(path, sync=False)
+    log.compact(design.options_tree)
+    edit(design)
+    log.record(design.options_tree)
+    stale = open(path + journal.JOURNAL_SUFFIX, "rb").read()
+    log.compact()
+    with open(path + journal.JOURNAL_SUFFIX, "wb") as file:
+        file.write(stale)  # As if the crash happened between the snapshot and the journal replacement
+    assert journal.load(path) == design.options_tree
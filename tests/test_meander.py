@@ -0,0 +1,30 @@
+##############################################################
+# Readout meanders drawn from the analytic centerline
+##############################################################
+
+import os
+import pytest
+from addict import Dict
+from base import fidelity, polygon_sidecar
+from conftest import assert_xor_within
+from library.readout_lines.readout_cavity import ReadoutCavity
+from library.readout_lines.readout_line_finger import ReadoutLineFinger
+
+# Reference polygons: `draw_gds` of the gdspy.Path implementation (segments and turns, then a boolean) for these cases
+DATA = os.path.join(os.path.dirname(__file__), "data")
+CASES = [dict(),
+         dict(start_pos=[100, 50], end_pos=[1500, 900], length=5000),
+         dict(start_pos=[0, 0], end_pos=[-800, -400], length=4000, r=60, start_r=80, gap=8, cpw_width=12),
+         dict(end_pos=[0, 2000], length=8000)]
+
+
+@pytest.mark.parametrize("cls, stem", [(ReadoutCavity, "readout_cavity"), (ReadoutLineFinger, "readout_line_finger")])
+@pytest.mark.parametrize("case", range(len(CASES)))
+def test_meander_matches_path_geometry(cls, stem, case):
+    cmpnt = cls(options=Dict(cls.default_options, **CASES[case]))
+    with fidelity.fidelity_mode("tapeout"):
+        cmpnt.draw_gds()
+    polygons = [p.tolist() for p in cmpnt.cell.get_polygons()]
+    reference = [points for points, _ in polygon_sidecar.load_polygons(os.path.join(DATA, f"{stem}_{case}.npz"))]
+    assert_xor_within(polygons, reference, fidelity.FIDELITIES["tapeout"])
+    assert max(len(p) for p in polygons) < 200  # Emitted in polygons gdspy writes without fracturing
@@ -0,0 +1,70 @@
+##############################################################
+# Copy-on-write options trees of the components
+##############################################################
+
+import pytest
+from addict import Dict
+from base.library_base import LibraryBase
+from library.control_lines.charge_line1 import ChargeLine1
+from library.qubits.transmon import Transmon
+
+
+class AppendingPins(LibraryBase):
+    default_options = Dict(
+        name="a0",
+        type="AppendingPins",
+        gds_pos=(0, 0),
+        readout_pins=[],
+    )
+
+    def calc_general_ops(self):
+        self.readout_pins.append(tuple(self.gds_pos))  # Updated in place, not assigned
+        return
+
+
+def test_options_view_does_not_change_component():
+    qubit = Transmon(Dict(name="q0"))
+    options = qubit.options
+    options.gds_pos = (10, 10)
+    options.readout_pins.append((1, 1))
+    assert qubit.gds_pos == (0, 0)
+    assert (1, 1) not in qubit.options.readout_pins
+
+
+def test_assignment_refreshes_options_and_hash():
+    qubit = Transmon(Dict(name="q0"))
+    digest = qubit.content_hash()
+    qubit.gds_pos = (10, 10)
+    assert tuple(qubit.options.gds_pos) == (10, 10)
+    assert qubit.content_hash() != digest
+
+
+def test_in_place_update_by_calc_general_ops_refreshes_options():
+    cmpnt = AppendingPins(Dict(gds_pos=(1, 2)))
+    digest = cmpnt.content_hash()
+    assert list(cmpnt.options.readout_pins) == [(1, 2)]
+    cmpnt.calc_general_ops()
+    assert list(cmpnt.options.readout_pins) == [(1, 2), (1, 2)]
+    assert cmpnt.content_hash() != digest
+
+
+def test_parameters_cannot_change_in_place():
+    qubit = Transmon(Dict(name="q0", pad_options=[0, 1, 1, 1, 1, 1]))
+    qubit.outline = [(0, 0), (1, 1)]
+    with pytest.raises(TypeError):
+        qubit.readout_pins.append((1, 1))
+    with pytest.raises(TypeError):
+        qubit.outline[0] = (5, 5)
+    with pytest.raises(TypeError):
+        qubit.pad_options.append(4)
+    assert list(qubit.options.outline) == [(0, 0), (1, 1)] and list(qubit.options.pad_options) == [0, 1, 1, 1, 1, 1]
+    qubit.outline = qubit.outline + [(2, 2)]  # Assigning a new value still works
+    assert list(qubit.options.outline) == [(0, 0), (1, 1), (2, 2)]
+
+
+def test_drawing_keeps_list_parameters():
+    line = ChargeLine1(Dict(ChargeLine1.default_options))
+    path = list(line.path)
+    line.draw_gds()
+    line.draw_gds()
+    assert list(line.path) == path
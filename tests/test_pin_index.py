@@ -0,0 +1,61 @@
+##############################################################
+# Pin coordinate index lookups and updates
+##############################################################
+
+import pytest
+from base import pin_index
+
+
+@pytest.mark.parametrize("pin, point, hit", [
+    ((0.49, 0), (0.51, 0), True),  # Neighbouring quantization cells
+    ((0.49, 0), (1.49, 0), True),  # At the tolerance
+    ((0.49, 0), (1.5, 0), False),
+    ((0.5, 0), (-0.5, 0), True),
+    ((0.5, 0), (-0.51, 0), False),
+    ((0.5, 0.5), (1.5, -0.5), True),
+    ((0.5, 0.5), (1.5, -0.51), False),
+])
+def test_lookup_at_quantization_boundary(pin, point, hit):
+    index = pin_index.PinIndex(tolerance=1.0).sync({"q0": {"readout_pins": [pin]}})
+    assert index.lookup(point) == ([("q0", "readout_pins", 0)] if hit else [])
+
+
+def test_lookup_filters_and_orders():
+    ops = {"q1": {"control_pins": [(0, 0)]}, "q0": {"readout_pins": [(5, 5), (0, 0)]}, "c0": {"start_pos": (0, 0)}}
+    index = pin_index.PinIndex().sync(ops)
+    assert index.lookup((0, 0)) == [("q1", "control_pins", 0), ("q0", "readout_pins", 1), ("c0", "start_pos", None)]
+    assert index.find((0, 0), "readout_pins") == "q0"
+    assert index.find((0, 0), last=True) == "c0"
+    assert index.lookup((0, 0.001)) == [] and index.lookup("q0") == []
+
+
+def test_moved_component_is_indexed_again(design):
+    qubit = design.gds.qubits.q4
+    pin = tuple(qubit.readout_pins[0])
+    assert ("qubits", "q4", "readout_pins", 0) in design.gds.find_pins(pin)
+    qubit.gds_pos = (qubit.gds_pos[0] + 100, qubit.gds_pos[1])
+    moved = tuple(design.gds.qubits.q4.readout_pins[0])
+    assert moved == (pin[0] + 100, pin[1])
+    assert design.gds.find_pins(pin, "readout_pins") == []
+    assert design.gds.find_pins(moved, "readout_pins") == [("qubits", "q4", "readout_pins", 0)]
+
+
+def test_deleted_component_is_removed(design):
+    pin = tuple(design.gds.qubits.q0.readout_pins[0])
+    assert design.gds.find_pins(pin, "readout_pins") == [("qubits", "q0", "readout_pins", 0)]
+    ops = design.gds.qubits.options
+    del ops["q0"]
+    design.gds.qubits.inject_options(ops)
+    assert design.gds.find_pins(pin, "readout_pins") == []
+    index = design.gds.pin_index("qubits")
+    assert "q0" not in index.cmpnt_entries
+    assert all(hit[2] != "q0" for cell in index.cells.values() for hit in cell)
+
+
+def test_sync_reindexes_only_changed_components(design):
+    index = design.gds.pin_index("qubits")
+    entries = dict(index.cmpnt_entries)
+    design.gds.qubits.q4.gds_pos = (0, 0)
+    design.gds.pin_index("qubits")
+    changed = [name for name in entries if index.cmpnt_entries[name][0] is not entries[name][0]]
+    assert changed == ["q4"]
@@ -0,0 +1,88 @@
+##############################################################
+# Polygon sidecars and the classes generated from GDS files
+##############################################################
+
+import importlib, os, shutil, sys
+import gdspy
+import gdstk
+import numpy as np
+import pytest
+from addict import Dict
+from base import polygon_sidecar
+import gds_analysis
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+GDS = os.path.join(DATA, "smon_read_test.gds")
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "shapes.npz")
+    polygons = [([(0, 0), (1, 0), (1, 1)], 3), (np.array([(0.5, 0.25), (2, 0), (2, 2), (0, 2)]), 7)]
+    polygon_sidecar.save_polygons(path, polygons)
+    loaded = polygon_sidecar.load_polygons(path)
+    assert [layer for _, layer in loaded] == [3, 7]
+    for (points, _), (expected, _) in zip(loaded, polygons):
+        assert np.array_equal(points, np.asarray(expected, dtype=float))
+        assert not points.flags.writeable
+    assert polygon_sidecar.load_polygons(path) is loaded  # Decompressed once
+
+
+def test_rewritten_sidecar_is_reloaded(tmp_path):
+    path = str(tmp_path / "shapes.npz")
+    polygon_sidecar.save_polygons(path, [([(0, 0), (1, 0), (1, 1)], 1)])
+    first = polygon_sidecar.load_polygons(path)
+    mtime = os.path.getmtime(path)
+    np.savez_compressed(path, points=np.array([(0, 0), (2, 0), (2, 2)], dtype=float),
+                        offsets=np.array([0, 3]), layers=np.array([2]))  # Rewritten behind the cache
+    os.utime(path, (mtime + 1, mtime + 1))
+    second = polygon_sidecar.load_polygons(path)
+    assert second is not first and second[0][1] == 2
+    assert np.array_equal(second[0][0], [(0, 0), (2, 0), (2, 2)])
+
+
+def test_gds_polygons(tmp_path):
+    path = str(tmp_path / "shapes.npz")
+    count = polygon_sidecar.save_gds_polygons(GDS, path)
+    expected = [(p.points, p.layer) for cell in gdstk.read_gds(GDS).cells for p in cell.polygons]
+    loaded = polygon_sidecar.load_polygons(path)
+    assert count == len(expected) == len(loaded) > 0
+    for (points, layer), (expected_points, expected_layer) in zip(loaded, expected):
+        assert layer == expected_layer and np.array_equal(points, expected_points)
+
+
+def literal_polygons(gds_pos, rotation):
+    """
+    The drawing of the classes generated before the sidecars: the polygons as literals, translated to center them
+    on `gds_pos`, then rotated polygon by polygon.
+    """
+    cell = gdspy.Cell("literal", exclude_from_current=True)
+    for gds_cell in gdstk.read_gds(GDS).cells:
+        for polygon in gds_cell.polygons:
+            cell.add(gdspy.Polygon(polygon.points.tolist(), layer=polygon.layer))
+    (min_x, min_y), (max_x, max_y) = cell.get_bounding_box()
+    dx, dy = gds_pos[0] - (min_x + max_x) / 2, gds_pos[1] - (min_y + max_y) / 2
+    for polygon in cell.polygons:
+        polygon.translate(dx, dy)
+        polygon.rotate(rotation, center=gds_pos)
+    return cell
+
+
+@pytest.mark.parametrize("gds_pos, rotation", [((0, 0), 0), ((1200, -300), 0.7), ((-50, 80), np.pi / 2)])
+def test_generated_class_matches_literals(tmp_path, monkeypatch, gds_pos, rotation):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "sidecar_smon", raising=False)
+    shutil.copy(GDS, tmp_path / "sidecar_smon.gds")
+    gds_analysis.read_single_component(str(tmp_path / "sidecar_smon.gds"), "")
+    assert os.path.exists(tmp_path / "sidecar_smon.npz")
+    assert os.path.getsize(tmp_path / "sidecar_smon.py") < 4000  # Code only
+    module = importlib.import_module("sidecar_smon")
+    cmpnt = module.SidecarSmon(options=Dict(name="smon0", gds_pos=gds_pos, rotation=rotation))
+    cmpnt.draw_gds()
+    reference = literal_polygons(gds_pos, rotation)
+    assert len(cmpnt.cell.polygons) == len(reference.polygons)
+    for polygon, expected in zip(cmpnt.cell.polygons, reference.polygons):
+        assert polygon.layers == expected.layers
+        assert np.allclose(polygon.polygons[0], expected.polygons[0], rtol=0, atol=1e-9)
+    assert np.allclose(cmpnt.outline, [p for polygon in reference.polygons
+                                       for p in polygon.get_bounding_box().tolist()], rtol=0, atol=1e-9)
@@ -0,0 +1,55 @@
+##############################################################
+# draw_gds redraws only the components whose parameters changed
+##############################################################
+
+import pytest
+from base.library_base import LibraryBase
+from conftest import build_design, cell_snapshot as snapshot
+
+
+@pytest.fixture
+def draws(monkeypatch):
+    """
+    Names of the components drawn, in order.
+    """
+    calls = []
+    draw_pieces = LibraryBase.draw_pieces
+    monkeypatch.setattr(LibraryBase, "draw_pieces", lambda self, *args, **kwargs: calls.append(self.name) or
+                        draw_pieces(self, *args, **kwargs))
+    return calls
+
+
+def test_unchanged_design_is_not_redrawn(design, draws):
+    design.gds.draw_gds()
+    assert len(draws) > 0
+    draws.clear()
+    design.gds.draw_gds()
+    assert draws == []
+
+
+def test_only_edited_component_is_redrawn(design, draws):
+    design.gds.draw_gds()
+    draws.clear()
+    design.gds.qubits.q4.gds_pos = (123, 456)
+    design.gds.draw_gds()
+    assert draws == ["q4"]
+    fresh = build_design()
+    fresh.gds.qubits.q4.gds_pos = (123, 456)
+    fresh.gds.draw_gds()
+    assert snapshot(design.gds.cell_Dict) == snapshot(fresh.gds.cell_Dict)
+
+
+def test_deleted_component_is_not_drawn(design, draws):
+    design.gds.draw_gds()
+    ops = design.gds.qubits.options
+    del ops["q0"]
+    design.gds.qubits.inject_options(ops)
+    draws.clear()
+    design.gds.draw_gds()
+    assert draws == []
+    fresh = build_design()
+    fresh_ops = fresh.gds.qubits.options
+    del fresh_ops["q0"]
+    fresh.gds.qubits.inject_options(fresh_ops)
+    fresh.gds.draw_gds()
+    assert snapshot(design.gds.cell_Dict) == snapshot(fresh.gds.cell_Dict)
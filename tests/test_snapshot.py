@@ -0,0 +1,46 @@
+##############################################################
+# Binary design snapshots
+##############################################################
+
+import pytest
+from addict import Dict
+from api.design import Design
+from base import options_tree, snapshot
+
+
+def test_design_round_trip(design, tmp_path):
+    path = str(tmp_path / "design.edaq")
+    design.export_options(path)
+    assert snapshot.is_snapshot(path)
+    loaded = Design()
+    loaded.import_options(path)
+    assert loaded.options_tree == design.options_tree
+    assert loaded.content_hash() == design.content_hash()  # Also tells tuples from lists and ints from floats
+
+
+def test_values_keep_their_types(tmp_path):
+    options = Dict(point=(1, 2.5), points=[(0, 0), (1, 1)], mixed=[1, "a", None, True], nested=Dict(a=[[1, 2], [3, 4]]),
+                   number=3, real=3.0, empty=[])
+    path = str(tmp_path / "values.edaq")
+    snapshot.save(options, path)
+    loaded = options_tree.thaw(snapshot.load(path))
+    for key in ["point", "points", "mixed", "nested", "number", "real", "empty"]:
+        assert loaded[key] == options[key] and isinstance(loaded[key], type(options[key]))
+    assert type(loaded.point[0]) is int and type(loaded.real) is float
+
+
+def test_collections_are_decoded_lazily(design, tmp_path):
+    path = str(tmp_path / "design.edaq")
+    snapshot.save(design.options_tree, path)
+    tree = snapshot.load(path)
+    assert type(dict.__getitem__(tree.gds, "qubits")) is options_tree.Deferred
+    assert tree.gds.qubits == design.gds.qubits.options_tree
+    assert type(dict.__getitem__(tree.gds, "readout_lines")) is options_tree.Deferred
+
+
+def test_text_files_are_not_snapshots(design, tmp_path):
+    path = str(tmp_path / "design.txt")
+    design.export_options(path)
+    assert not snapshot.is_snapshot(path)
+    with pytest.raises(Exception):
+        snapshot.load(path)
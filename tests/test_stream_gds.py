@@ -0,0 +1,48 @@
+##############################################################
+# Streamed GDS output covers the same shapes as the in-memory output
+##############################################################
+
+import pytest
+from addict import Dict
+
+from conftest import assert_same_areas, build_design
+from library.qubits.transmon import Transmon
+
+
+def test_streamed_matches_flat_areas(tmp_path):
+    design = build_design(routing=True)
+    flat, streamed = str(tmp_path / "flat.gds"), str(tmp_path / "streamed.gds")
+    design.gds.save_gds(flat)
+    design.gds.save_gds(streamed, stream=True)
+    assert_same_areas(streamed, flat)
+
+
+def test_streamed_hierarchical_matches_flat_areas(tmp_path):
+    design = build_design(routing=True)
+    flat, streamed = str(tmp_path / "flat.gds"), str(tmp_path / "streamed.gds")
+    design.gds.save_gds(flat)
+    design.gds.save_gds(streamed, stream=True, hierarchical=True)
+    assert_same_areas(streamed, flat)
+
+
+def test_failed_stream_keeps_existing_file(tmp_path, monkeypatch):
+    design = build_design()
+    path = tmp_path / "chip.gds"
+    path.write_bytes(b"previous")
+
+    def fail(stream):
+        raise RuntimeError("drawing failed")
+
+    monkeypatch.setattr(design.gds.qubits, "write_stream", fail)
+    with pytest.raises(RuntimeError):
+        design.gds.save_gds(str(path), stream=True)
+    assert path.read_bytes() == b"previous"
+    assert [p.name for p in tmp_path.iterdir()] == ["chip.gds"]
+
+
+def test_streamed_component_matches_flat_areas(tmp_path):
+    qubit = Transmon(Dict(name="q0"))
+    flat, streamed = str(tmp_path / "flat.gds"), str(tmp_path / "streamed.gds")
+    qubit.save_gds(flat)
+    qubit.save_gds(streamed, stream=True)
+    assert_same_areas(streamed, flat)
@@ -0,0 +1,71 @@
+##############################################################
+# Affine transforms and the rotated qubits using them
+##############################################################
+
+import math
+import numpy as np
+import pytest
+from addict import Dict
+from base import transform
+from library.qubits.transmon_rotate import TransmonRotate
+from library.qubits.xmon_rotate import XmonRotate
+
+
+def assert_points(actual, expected, point_type):
+    assert len(actual) == len(expected)
+    for point, (x, y) in zip(actual, expected):
+        assert isinstance(point, point_type)  # Lists are stored as FrozenList
+        assert point[0] == pytest.approx(x, abs=1e-9) and point[1] == pytest.approx(y, abs=1e-9)
+
+
+def test_matrix_composition():
+    points = [(1, 0), (0, 2)]
+    turned = transform.transform_points(points, math.pi / 2, center=(1, 1), offset=(10, 0))
+    assert np.allclose(turned, [(12, 1), (10, 0)])
+    mirrored = transform.transform_points(points, mirror=True, center=(0, 1))
+    assert np.allclose(mirrored, [(1, 2), (0, 0)])
+
+
+def test_transform_nested_keeps_structure():
+    values = [{"a": (1, 0), "b": [[0, 1], "label"]}, (2, 0)]
+    result = transform.transform_nested(values, transform.matrix(math.pi))
+    assert type(result[0]["a"]) is tuple and type(result[0]["b"][0]) is list and result[0]["b"][1] == "label"
+    assert np.allclose([result[0]["a"], result[0]["b"][0], result[1]], [(-1, 0), (0, -1), (-2, 0)])
+    as_tuples = transform.transform_nested(values, transform.matrix(), point_type=tuple)
+    assert type(as_tuples[0]["b"][0]) is tuple
+
+
+def test_transmon_rotate_quarter_turn():
+    qubit = TransmonRotate(Dict(TransmonRotate.default_options, gds_pos=(100, 50), rotate=math.pi / 2))
+    # Unrotated: readout pin (100, 395), first control pin (-237.5, 165), outline from (-147.5, 285)
+    assert_points(qubit.readout_pins, [(-245, 50)], tuple)
+    assert_points(qubit.control_pins[:1], [(-15, -287.5)], tuple)
+    assert_points(qubit.outline, [(-135, -197.5), (-135, 297.5), (335, 297.5), (335, -197.5), (-135, -197.5)], tuple)
+
+
+def test_transmon_rotate_default_rotation():
+    qubit = TransmonRotate(Dict(TransmonRotate.default_options, gds_pos=(30, -40)))
+    unrotated = TransmonRotate(Dict(TransmonRotate.default_options, gds_pos=(30, -40), rotate=0))
+    angle = 7 * math.pi / 4
+
+    def rotate(point):
+        dx, dy = point[0] - 30, point[1] + 40
+        return (30 + math.cos(angle) * dx - math.sin(angle) * dy, -40 + math.sin(angle) * dx + math.cos(angle) * dy)
+
+    for name in ("readout_pins", "control_pins", "coupling_pins", "outline"):
+        assert_points(getattr(qubit, name), [rotate(p) for p in getattr(unrotated, name)], tuple)
+
+
+def test_xmon_rotate_pins_follow_rotation():
+    qubit = XmonRotate(Dict(XmonRotate.default_options, gds_pos=(10, 20), rotation=90))
+    # Claw reach 300 + 5 + 6 + 10 + 30 = 351 from the center
+    assert_points(qubit.coupling_pins, [(-341, 20), (361, 20), (10, -331), (10, 371)], tuple)
+    assert_points(qubit.readout_pins, [(-40, 70)], tuple)
+    assert_points(qubit.control_pins, [(10, 20)], tuple)
+    assert_points(qubit.outline, [(361, -331), (361, 371), (-341, 371), (-341, -331), (361, -331)], list)
+
+
+def test_xmon_rotate_unrotated():
+    qubit = XmonRotate(Dict(XmonRotate.default_options, gds_pos=(10, 20)))
+    assert_points(qubit.coupling_pins, [(10, 371), (10, -331), (-341, 20), (361, 20)], tuple)
+    assert_points(qubit.readout_pins, [(60, 70)], tuple)
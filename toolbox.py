@@ -1,6 +1,8 @@
-import copy, os, importlib, math
+import copy, itertools, os, importlib, math
 from addict import Dict
 import gdspy
+from base import gds_backend, polygon_sidecar, transform
+import numpy as np
 
 def get_module_Dict(dirpath, pre_path, exclusions: list = None):
     """
@@ -156,7 +158,7 @@ def save_svg(cell, width: float = 500, path: str = "./svg/temp/svg"):
         raise ValueError(f"The width of {cell.name} is 0, cannot generate svg!")
         return False
     # print("width = {}, cell_width = {}".format(width, cell_width))
-    cell.write_svg(path, scaling = width/cell_width)
+    gds_backend.write_svg(cell, path, scaling=width/cell_width)
     print(f"svg file saved at: {path}")
     return True
 
@@ -331,7 +333,7 @@ def export_options(data, path):
         Format data for exporting to txt file.
         """
         if isinstance(data, Dict):
-            data = dict(data)
+            data = dict(data.items())
             
         if isinstance(data, str):
             return "\"" + data + "\""
@@ -357,7 +359,7 @@ def export_options(data, path):
     supported_types = (Dict, str, int, float, bool, type(None), list, dict, tuple)
 
     # Check if the data type is supported
-    if type(data) not in supported_types:
+    if not isinstance(data, supported_types):
         raise ValueError(f"Unsupported data type: {type(data)}")
 
     # Export the data to the specified path
@@ -381,6 +383,77 @@ def import_options(path):
         print("Syntax error in file. Please check the file format.")
         return None
     
+def is_flat_on_layer(cell, layer, datatype):
+    """
+    Checks whether a gdspy cell has no references and all its shapes on one layer and datatype,
+    i.e. whether `cell.flatten(single_layer=layer, single_datatype=datatype)` would not change it.
+
+    Input:
+        cell: gdspy.Cell.
+        layer: int, the layer number.
+        datatype: int, the datatype number.
+
+    Output:
+        result: bool.
+    """
+    if cell.references:
+        return False
+    for shape in itertools.chain(cell.polygons, cell.paths):
+        if any(l != layer for l in shape.layers) or any(d != datatype for d in shape.datatypes):
+            return False
+    return all(label.layer == layer for label in cell.labels)
+
+def flatten_shapes(cell, layer, datatype):
+    """
+    Returns the shapes of a gdspy cell flattened onto one layer and datatype, like `cell.flatten`,
+    without modifying the cell. The coordinate arrays of the returned polygons are read-only.
+
+    Input:
+        cell: gdspy.Cell.
+        layer: int, the layer number.
+        datatype: int, the datatype number.
+
+    Output:
+        polygons: list of gdspy.PolygonSet.
+        paths: list of gdspy.FlexPath/RobustPath.
+        labels: list of gdspy.Label.
+    """
+    flat_cell = gdspy.Cell("flatten", exclude_from_current=True)
+    flat_cell.add(cell)
+    flat_cell.flatten(single_layer=layer, single_datatype=datatype)
+    make_read_only(flat_cell)
+    return flat_cell.polygons, flat_cell.paths, flat_cell.labels
+
+def make_read_only(cell):
+    """
+    Marks the coordinate arrays of the polygons of a gdspy cell as read-only, so that cells shared between
+    layouts cannot be modified in place by mistake (gdspy transformations create new arrays and are not affected).
+
+    Input:
+        cell: gdspy.Cell.
+
+    Output:
+        None
+    """
+    for polygon_set in cell.polygons:
+        make_read_only_polygons(polygon_set)
+    return
+
+def make_read_only_polygons(polygon_set):
+    """
+    Marks the coordinate arrays of a gdspy PolygonSet as read-only (see `make_read_only`).
+
+    Input:
+        polygon_set: gdspy.PolygonSet.
+
+    Output:
+        None
+    """
+    for points in polygon_set.polygons:
+        if isinstance(points, np.ndarray):
+            points.flags.writeable = False
+    return
+
 def get_file_name_from_path(path):
     # use os.path.splitext() to split file names and extensions
     file_name, file_extension = os.path.splitext(os.path.basename(path))
@@ -506,15 +579,13 @@ def find_itsct(segment1, segment2):
         return None
     
 def rotate_point(point, center, angle):
-    # Convert angles to radians
-    angle_rad = math.radians(angle)
-
-    # Calculate the coordinates of the rotated point
-    x = center[0] + (point[0] - center[0]) * math.cos(angle_rad) - (point[1] - center[1]) * math.sin(angle_rad)
-    y = center[1] + (point[0] - center[0]) * math.sin(angle_rad) + (point[1] - center[1]) * math.cos(angle_rad)
+    # Rotate a point, or an array of points at once, by an angle in degrees
+    points = transform.transform_points(point, math.radians(angle), center)
 
-    # Return the coordinates of the rotated point
-    return (x, y)
+    # Return the coordinates of the rotated point (the array of rotated points)
+    if points.ndim == 1:
+        return tuple(points.tolist())
+    return points
 
 def clear_file(file_path):
     if os.path.exists(file_path):
@@ -575,11 +646,7 @@ def import_list_from_txt(file_path):
         return []
     
 def generate_python_class_from_gds(filepath: str, location: str):
-    import gdstk
-    # Load the GDS file
     filename = os.path.basename(filepath)
-    gds_lib = gdstk.read_gds(filepath)
-    cells = gds_lib.cells
 
     # Generate class name from file name
     base_name = os.path.splitext(filename)[0]
@@ -587,10 +654,11 @@ def generate_python_class_from_gds(filepath: str, location: str):
 
     # Create class content
     class_definition = f"""
-import gdspy, copy
+import gdspy, copy, os
 from addict import Dict
 import math as mt
 from base.library_base import LibraryBase
+from base import polygon_sidecar, transform
 
 class {class_name}(LibraryBase):
     default_options = Dict(
@@ -608,20 +676,11 @@ class {class_name}(LibraryBase):
         return
 
     def _add_polygons_to_cell(self):
-        polygon_data = [
-"""
-
-    # Add polygons for each cell
-    for cell in cells:
-        for polygon in cell.polygons:
-            points = polygon.points.tolist()
-            layer = polygon.layer
-            class_definition += f"""
-            ({points}, {layer}),
+        # The polygons are stored in a binary sidecar next to this file, loaded on the first draw
+        polygon_data = polygon_sidecar.load_polygons(os.path.join(os.path.dirname(__file__), "{base_name}.npz"))
 """
 
     class_definition += """
-        ]
 
         for points in polygon_data:
             layer = points[-1]
@@ -646,9 +705,9 @@ class {class_name}(LibraryBase):
         return min_x, min_y, max_x, max_y
 
     def _transform_polygons(self, dx, dy, rotation, center):
-        for polygon in self.cell.polygons:
-            polygon.translate(dx, dy)
-            polygon.rotate(rotation, center=center)
+        # Translate, then rotate the vertices of all the polygons at once
+        affine = transform.matrix(rotation, center) @ transform.matrix(offset=(dx, dy))
+        transform.transform_polygon_sets(self.cell.polygons, affine)
 
     def calc_general_ops(self):
         self.lib = gdspy.GdsLibrary()
@@ -685,7 +744,8 @@ class {class_name}(LibraryBase):
     output_dir = os.path.join("./", location)
     os.makedirs(output_dir, exist_ok=True)
 
-    # Write the class to a file
+    # Write the polygons to a binary sidecar, then the class to a file
+    polygon_sidecar.save_gds_polygons(filepath, os.path.join(output_dir, f"{base_name}.npz"))
     output_filename = os.path.join(output_dir, f"{base_name}.py")
     with open(output_filename, "w") as py_file:
         py_file.write(class_definition)